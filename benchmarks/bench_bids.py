@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks preparing synthetic PPMI DICOM trees for BIDS conversion
+"""
+
+import os
+import shutil
+import tempfile
+
+import pytest
+
+from pypmi import bids
+
+
+@pytest.mark.skipif(not bids.bids_avail,
+                    reason='Preparing DICOMs requires pydicom')
+def bench_prepare_directory(measure, imaging):
+    # preparation moves files around so every round needs a fresh copy
+    def setup():
+        data_dir = os.path.join(tempfile.mkdtemp(), 'PPMI')
+        shutil.copytree(imaging, data_dir)
+        return (data_dir,), {}
+
+    measure(bids._prepare_directory, setup=setup)
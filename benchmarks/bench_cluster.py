@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks clustering of synthetic PPMI data
+"""
+
+import numpy as np
+
+from pypmi import cluster
+
+
+def bench_fereshtehnejad2017(measure, behavior):
+    measure(cluster.cluster_fereshtehnejad2017, behavior)
+
+
+def bench_fereshtehnejad2017_groupby(measure, behavior):
+    measure(cluster.cluster_fereshtehnejad2017, behavior, groupby='visit')
+
+
+def bench_faghri2018(measure, n_participants):
+    # features of ~10 visits per participant, with 20% missing
+    rs = np.random.RandomState(1234)
+    n_visits, n_features = n_participants * 10, 60
+    features = rs.randn(n_visits, n_features).astype('float32')
+    features[rs.rand(n_visits, n_features) < 0.2] = np.nan
+
+    measure(cluster._faghri_cluster, features, seed=1234)
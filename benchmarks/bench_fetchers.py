@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks downloading synthetic PPMI study data from a local stub server
+"""
+
+import tempfile
+
+from pypmi import fetchers
+
+
+def bench_download_data(measure, stub_server):
+    url, info = stub_server
+
+    def setup():
+        return (info, url), dict(path=tempfile.mkdtemp(), user='user',
+                                 password='password', overwrite=True,
+                                 verbose=False)
+
+    measure(fetchers._download_data, setup=setup)
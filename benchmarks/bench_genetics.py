@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks loading synthetic PPMI genotyping data
+"""
+
+import os
+
+import pytest
+
+from pypmi import genetics, loaders
+from conftest import evict
+
+cold_warm = pytest.mark.parametrize('cold', [True, False],
+                                    ids=['cold', 'warm'])
+
+
+def _setup(fname, cold):
+    if cold:
+        return lambda: evict(os.path.dirname(fname))
+
+
+@cold_warm
+@pytest.mark.parametrize('use_gene_list', [True, False],
+                         ids=['gene_list', 'all_snps'])
+def bench_load_genetics(measure, genotypes, use_gene_list, cold):
+    fname, gene_list = genotypes
+    measure(loaders.load_genetics, fname,
+            gene_list=gene_list if use_gene_list else None,
+            setup=_setup(fname, cold))
+
+
+@cold_warm
+def bench_compute_grs(measure, genotypes, cold):
+    fname, gene_list = genotypes
+    measure(loaders.compute_grs, fname, gene_list, setup=_setup(fname, cold))
+
+
+@cold_warm
+def bench_genotypestore(measure, genotypes, cold):
+    fname, _ = genotypes
+
+    def load():
+        return genetics.GenotypeStore.from_plink(fname).to_numpy()
+
+    measure(load, setup=_setup(fname, cold))
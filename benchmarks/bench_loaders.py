@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks loading synthetic PPMI study data into tidy data frames
+"""
+
+import pytest
+
+from pypmi import loaders
+from conftest import evict
+
+cold_warm = pytest.mark.parametrize('cold', [True, False],
+                                    ids=['cold', 'warm'])
+
+
+def _setup(path, cold):
+    if cold:
+        return lambda: evict(path)
+
+
+@cold_warm
+def bench_load_behavior(measure, studydata, cold):
+    measure(loaders.load_behavior, studydata, measures='all',
+            setup=_setup(studydata, cold))
+
+
+@cold_warm
+def bench_load_biospecimen(measure, studydata, cold):
+    measure(loaders.load_biospecimen, studydata, measures='all',
+            setup=_setup(studydata, cold))
+
+
+@cold_warm
+def bench_load_datscan(measure, studydata, cold):
+    measure(loaders.load_datscan, studydata, measures='all',
+            setup=_setup(studydata, cold))
+
+
+@cold_warm
+def bench_load_demographics(measure, studydata, cold):
+    measure(loaders.load_demographics, studydata,
+            setup=_setup(studydata, cold))
+
+
+@cold_warm
+def bench_load_dates(measure, studydata, cold):
+    measure(loaders._load_dates, studydata, setup=_setup(studydata, cold))
+
+
+@cold_warm
+def bench_load_all(measure, studydata, cold):
+    measure(loaders.load_all, studydata, setup=_setup(studydata, cold))
@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+"""
+Fixtures for benchmarking pypmi on synthetic data with ``pytest-benchmark``
+
+Usage (from the repository root)::
+
+    pytest -c benchmarks/pytest.ini benchmarks [--cohort-sizes 500,2000]
+
+Every run is saved to `.benchmarks/`, named by the commit it was run on. To
+catch regressions compare against a previous run, failing if any benchmark
+got slower, e.g.::
+
+    pytest -c benchmarks/pytest.ini benchmarks --benchmark-compare \\
+        --benchmark-compare-fail=median:10%
+
+Timings are reported for "cold" (files evicted from the page cache and
+pypmi's on-disk caches removed before every round) and "warm" runs; the peak
+memory (as traced by :mod:`tracemalloc`) of each benchmark is stored as
+`peak_mib` in the saved results.
+"""
+
+import gc
+import http.server
+import io
+import os
+import threading
+import tracemalloc
+import zipfile
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pypmi import cluster, fetchers, synthetic
+
+
+def pytest_addoption(parser):
+    parser.addoption('--cohort-sizes', default='500,2000,8000',
+                     help='Comma-separated numbers of participants in '
+                          'synthetic data to benchmark against')
+
+
+def pytest_generate_tests(metafunc):
+    if 'n_participants' in metafunc.fixturenames:
+        sizes = metafunc.config.getoption('--cohort-sizes').split(',')
+        metafunc.parametrize('n_participants', [int(n) for n in sizes],
+                             scope='session')
+
+
+def evict(path: str):
+    """
+    Evicts files in `path` from the page cache and removes pypmi's caches
+    """
+
+    gc.collect()
+    for root, _, files in os.walk(path):
+        for fname in files:
+            fname = os.path.join(root, fname)
+            if fname.endswith('.variants.pkl'):
+                os.remove(fname)
+            elif hasattr(os, 'posix_fadvise'):
+                fd = os.open(fname, os.O_RDONLY)
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+                os.close(fd)
+
+
+@pytest.fixture
+def measure(benchmark):
+    """
+    Returns function benchmarking `func(*args, **kwargs)`
+
+    Peak memory is traced in a separate (untimed) call. If `setup` is provided
+    it is called before every round and may return new (args, kwargs)
+    """
+
+    def _measure(func, *args, setup=None, rounds=3, **kwargs):
+        call_args, call_kwargs = args, kwargs
+        if setup is not None:
+            call_args, call_kwargs = setup() or (args, kwargs)
+        tracemalloc.start()
+        try:
+            func(*call_args, **call_kwargs)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        benchmark.extra_info['peak_mib'] = peak / 2 ** 20
+
+        if setup is None:
+            return benchmark(func, *args, **kwargs)
+        return benchmark.pedantic(func, args=args, kwargs=kwargs,
+                                  setup=setup, rounds=rounds, iterations=1)
+
+    return _measure
+
+
+@pytest.fixture(scope='session')
+def studydata(tmp_path_factory, n_participants):
+    path = str(tmp_path_factory.mktemp('studydata'))
+    synthetic.make_studydata(path, n_participants=n_participants, seed=1234)
+    return path
+
+
+@pytest.fixture(scope='session')
+def genotypes(tmp_path_factory, n_participants):
+    path = tmp_path_factory.mktemp('genetics')
+    return synthetic.make_genetics(str(path / 'ppmi'),
+                                   n_participants=n_participants,
+                                   n_snps=20000, seed=1234)
+
+
+@pytest.fixture(scope='session')
+def imaging(tmp_path_factory, n_participants):
+    # scans are far fewer than participants with clinical data
+    path = str(tmp_path_factory.mktemp('imaging'))
+    synthetic.make_imaging(path, n_participants=max(n_participants // 100, 1),
+                           seed=1234)
+    return path
+
+
+@pytest.fixture(scope='session')
+def behavior(n_participants):
+    rs = np.random.RandomState(1234)
+    n_visits = 4
+    data = pd.DataFrame(rs.randn(n_participants * n_visits,
+                                 len(cluster.FERESHTEHNEJAD_MEASURES)),
+                        columns=cluster.FERESHTEHNEJAD_MEASURES)
+    data.insert(0, 'visit', np.tile(['BL', 'V04', 'V06', 'V08'],
+                                    n_participants))
+    return data
+
+
+class _StubHandler(http.server.BaseHTTPRequestHandler):
+    """ Mimics LONI IDA login and download pages
+    """
+
+    payload = b''
+
+    def _respond(self, body: bytes, content_type: str = 'text/html'):
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        if self.path.startswith('/login.jsp'):
+            self._respond(b'<a href="studyData.jsp?loginKey=-1234">')
+        else:
+            self._respond(b'<a href="?userId=1&authKey=-5678">')
+
+    def do_GET(self):
+        self._respond(self.payload, 'application/x-zip-compressed')
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope='session')
+def stub_server(studydata):
+    """
+    Serves zipped `studydata` from a local stand-in for the LONI IDA server
+
+    Returns the download URL and the datasets (as expected by
+    :func:`pypmi.fetchers._download_data`) it serves
+    """
+
+    out = io.BytesIO()
+    info = {}
+    with zipfile.ZipFile(out, 'w', zipfile.ZIP_DEFLATED) as dest:
+        for n, fname in enumerate(sorted(os.listdir(studydata))):
+            if fname.endswith('.csv'):
+                dest.write(os.path.join(studydata, fname), fname)
+                info[fname] = dict(id=n, name=fname)
+    handler = type('Handler', (_StubHandler,), dict(payload=out.getvalue()))
+
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host = 'http://127.0.0.1:{}'.format(server.server_address[1])
+    ida_url, fetchers._IDA_URL = fetchers._IDA_URL, host
+    try:
+        yield host + '/download/study', info
+    finally:
+        fetchers._IDA_URL = ida_url
+        server.shutdown()
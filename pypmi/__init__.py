@@ -6,9 +6,9 @@ __all__ = [
     'available_behavior', 'available_biospecimen',
     'available_datscan', 'available_demographics',
     'load_behavior', 'load_biospecimen',
-    'load_datscan', 'load_demographics',
+    'load_datscan', 'load_demographics', 'load_all',
     'fetchable_studydata', 'fetchable_genetics',
-    'fetch_studydata', 'fetch_genetics'
+    'fetch_studydata', 'fetch_genetics', 'configure_data_sources'
 ]
 
 from ._version import get_versions
@@ -30,4 +30,5 @@ from .fetchers import (fetchable_studydata, fetch_studydata,
 from .loaders import (available_biospecimen, available_behavior,
                       available_datscan, available_demographics,
                       load_behavior, load_biospecimen,
-                      load_datscan, load_demographics)
+                      load_datscan, load_demographics, load_all)
+from .utils import configure_data_sources
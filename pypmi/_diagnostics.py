@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+"""
+Diagnostics (logging and counters) shared by the PPMI loaders
+
+Messages are logged with lazy %-formatting at DEBUG level, so nothing is
+rendered unless it is enabled, e.g. with::
+
+    >>> import logging
+    >>> logging.basicConfig(level=logging.DEBUG)  # doctest: +SKIP
+
+Counters are always kept and are cheap: they are keyed by
+'<loader>.<quantity>' (e.g., 'load_biospecimen.rows_in') and accumulate
+over calls until :func:`reset_counters` is called.
+"""
+
+import collections
+import logging
+
+counters = collections.Counter()
+
+
+def get_logger(name: str) -> logging.Logger:
+    """ Returns logger `name`, which does nothing unless configured
+    """
+
+    logger = logging.getLogger(name)
+    if not logger.handlers:
+        logger.addHandler(logging.NullHandler())
+
+    return logger
+
+
+def count(loader: str, **quantities):
+    """ Adds `quantities` (e.g., `rows_in=10`) to counters of `loader`
+    """
+
+    for name, value in quantities.items():
+        counters['{}.{}'.format(loader, name)] += int(value)
+
+
+def reset_counters():
+    """ Resets all counters to zero
+    """
+
+    counters.clear()
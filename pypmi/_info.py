@@ -388,7 +388,7 @@ DEMOGRAPHIC_INFO = {
             'input': 'ENROLLDT'
         },
         'divide': {
-            'input': np.timedelta64(1, 'Y')
+            'input': np.timedelta64(31556952, 's')  # average year
         }
     },
     'gender': {
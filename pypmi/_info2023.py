@@ -827,7 +827,7 @@ DEMOGRAPHIC_INFO = {
             'input': 'INFODT'
         },
         'divide': {
-            'input': np.timedelta64(1, 'Y')
+            'input': np.timedelta64(31556952, 's')  # average year
         }
     },
     'gender': {
@@ -2,17 +2,22 @@
 Functions for loading data downloaded from the PPMI database
 """
 
+import collections
 from functools import reduce
 import itertools
 import os
 import re
 from typing import List
+import warnings
 
 import numpy as np
 import pandas as pd
 
 from _info2021 import BEHAVIORAL_INFO, DEMOGRAPHIC_INFO, VISITS, GENOTYPES_INFO, PRODROMAL_INFO, PRODROMAL_BERG2015
-from _utils import _get_data_dir
+from utils import _get_data_file, _get_data_files
+from _diagnostics import count, get_logger
+
+logger = get_logger(__name__)
 
 
 def load_biospecimen(path: str = None,
@@ -46,13 +51,14 @@ def load_biospecimen(path: str = None,
                        TESTNAME='test', TESTVALUE='score',TYPE='type')
     dtype = dict(PATNO=int, CLINICAL_EVENT=VISITS, TESTNAME=str, TESTVALUE=str)
 
-    # check for file and get data directory path
-    fname = 'Current_Biospecimen_Analysis_Results.csv'
-    path = os.path.join(_get_data_dir(path=path, fnames=[fname]), fname)
+    # check for file and get its path
+    fname = _get_data_file('Current_Biospecimen_Analysis_Results.csv',
+                           path=path)
 
     # load data, make scores numeric, and clean up test names (no spaces!)
-    data = pd.read_csv(path, dtype=dtype, usecols=rename_cols.keys())
-    print(data)
+    data = pd.read_csv(fname, dtype=dtype, usecols=rename_cols.keys())
+    logger.debug('Read %d biospecimen entries from %s', len(data), fname)
+    count('load_biospecimen', rows_in=len(data))
     data = data.rename(columns=rename_cols)
     data['score'] = data['score'].replace(['Negative','Positive'],[0,1])
     data['score'] = pd.to_numeric(data['score'], errors='coerce')
@@ -64,7 +70,7 @@ def load_biospecimen(path: str = None,
                    'amprion-alpha-synuclein-saa_fmax_(rep1)','amprion-alpha-synuclein-saa_fmax_(rep2)','amprion-alpha-synuclein-saa_fmax_(rep3)']
     elif isinstance(measures, str) and measures == 'all':
         measures = data['test'].unique().tolist()
-    print(measures)
+    logger.debug('Keeping biospecimen measures %s', measures)
     data = data.query(f'test in {measures}')
 
     # convert to tidy dataframe
@@ -76,15 +82,15 @@ def load_biospecimen(path: str = None,
                .rename_axis(None, axis=1)
 
     # (try to) add visit date information
-    print(tidy)
-    tidy = _add_dates(tidy, path="/scratch/c.c21013066/data/ppmi/phenotypes2023",#os.path.dirname(path),
-                      fnames=['Lumbar_Puncture.csv'])
+    tidy = _add_dates(tidy, path=path, fnames=['Lumbar_Puncture.csv'])
     if 'amprion-alpha-synuclein-saa_qualitative_(rep1)' in tidy.columns:
         tidy = tidy.rename(columns={'amprion-alpha-synuclein-saa_qualitative_(rep1)':'SAA_positive',
                                    'amprion-alpha-synuclein-saa_fmax_(rep1)':'SAA_Fmax1',
                                    'amprion-alpha-synuclein-saa_fmax_(rep2)':'SAA_Fmax2',
                                    'amprion-alpha-synuclein-saa_fmax_(rep3)':'SAA_Fmax3'})
-    print(tidy)
+    logger.debug('Loaded %d biospecimen measures for %d visits',
+                 tidy.shape[1] - 3, len(tidy))
+    count('load_biospecimen', rows_out=len(tidy))
 
     return tidy.sort_values(['participant', 'visit']).reset_index(drop=True)
 
@@ -119,11 +125,10 @@ def load_SAA(path: str = None,
     dtype = dict(PATNO=int, CLINICAL_EVENT=VISITS)
 
     # check for file and get data directory path
-    fname = 'SAA_Internal_20231102.csv'
-    path = os.path.join(_get_data_dir(path=path, fnames=[fname]), fname)
+    fname = _get_data_file('SAA_Internal_20231102.csv', path=path)
 
     # load data, make scores numeric, and clean up test names (no spaces!)
-    data = pd.read_csv(path, usecols=rename_cols.keys())
+    data = pd.read_csv(fname, usecols=rename_cols.keys())
     data = data.rename(columns=rename_cols)
     data = data[data['test']=='Amprion-Alpha-synuclein-SAA']
     data['SAA_positive'] = data['SAA_positive'].replace(['Negative','Positive'],[0,1])
@@ -131,8 +136,7 @@ def load_SAA(path: str = None,
     data['test'] = data['test'].apply(lambda x: x.replace(' ', '_').lower())
 
     # (try to) add visit date information
-    idy = _add_dates(tidy, path="/scratch/c.c21013066/data/ppmi/phenotypes2021",#os.path.dirname(path),
-                      fnames=['Lumbar_Puncture.csv'])
+    idy = _add_dates(tidy, path=path, fnames=['Lumbar_Puncture.csv'])
     data['participant'] = data['participant'].astype(int)
 
     return data.sort_values(['participant', 'visit']).reset_index(drop=True)
@@ -156,11 +160,11 @@ def available_biospecimen(path: str = None) -> List[str]:
     pypmi.load_biospecimen
     """
 
-    # check for file and get data directory path
-    fname = 'Current_Biospecimen_Analysis_Results_12Jul2023.csv'
-    path = os.path.join(_get_data_dir(path=path, fnames=[fname]), fname)
+    # check for file and get its path
+    fname = _get_data_file('Current_Biospecimen_Analysis_Results_12Jul2023.csv',
+                           path=path)
 
-    data = pd.read_csv(path, usecols=['TESTNAME'])['TESTNAME'].unique()
+    data = pd.read_csv(fname, usecols=['TESTNAME'])['TESTNAME'].unique()
 
     return sorted(list(set([f.replace(' ', '_').lower() for f in data])))
 
@@ -194,12 +198,11 @@ def load_imaging(path: str = None,
     rename_cols = dict(PATNO='participant', CLINICAL_EVENT='visit')
     dtype = dict(PATNO=int, CLINICAL_EVENT=VISITS)
 
-    # check for file and get data directory path
-    fname = 'Grey_Matter_Volume.csv'
-    path = os.path.join(_get_data_dir(path=path, fnames=[fname]), fname)
+    # check for file and get its path
+    fname = _get_data_file('Grey_Matter_Volume.csv', path=path)
 
     # load data, make scores numeric, and clean up test names (no spaces!)
-    data = pd.read_csv(path, dtype=dtype)
+    data = pd.read_csv(fname, dtype=dtype)
     data = data.rename(columns=rename_cols)
     data = data.rename(columns={'MRIDATE':'date','GM_VALUE':'greymatter'})
 
@@ -253,20 +256,19 @@ def load_datscan(path: str = None,
     rename_cols = dict(PATNO='participant', EVENT_ID='visit', DATSCAN_DATE='date')
     dtype = dict(PATNO=int, EVENT_ID=VISITS, SCAN_DATE=str)
 
-    # check for file and get data directory path
-    fname = 'DaTScan_Analysis.csv'
-    path = os.path.join(_get_data_dir(path=path, fnames=[fname]), fname)
+    # check for file and get its path
+    fname = _get_data_file('DaTScan_Analysis.csv', path=path)
 
     # load data and coerce into standard format
-    raw = pd.read_csv(path)
-    print(raw.head())
-    raw = pd.read_csv(path, dtype=dtype)
+    raw = pd.read_csv(fname, dtype=dtype)
+    logger.debug('Read %d DaT scan entries from %s', len(raw), fname)
+    count('load_datscan', rows_in=len(raw))
     tidy = raw.rename(columns=rename_cols).dropna(subset=['visit'])
     tidy.columns = [f.lower() for f in tidy.columns]
     # keep only desired measures
     if measures is not None:
         if isinstance(measures, str) and measures == 'all':
-            measures = available_datscan(path=os.path.dirname(path))
+            measures = available_datscan(path=path)
         elif not isinstance(measures, list):
             measures = list(measures)
         for m in measures:
@@ -279,14 +281,141 @@ def load_datscan(path: str = None,
         tidy['date'] = pd.to_datetime(tidy['date'], format='%m/%Y',
                                       errors='coerce')
     else:
-        tidy = _add_dates(tidy, path=os.path.dirname(path))
+        tidy = _add_dates(tidy, path=path)
 
     return tidy.sort_values(['participant', 'visit']).reset_index(drop=True)
 
+
+# DaT scan source files (in order of precedence for duplicated visits)
+_DATSCAN_FILES = [
+    'DaTScan_Analysis.csv',
+    'DaTscan/inv_spect_sbr_sequestered_merge_20231026.csv'
+]
+_DATSCAN_VI_FILE = 'DaTscan/inv_spect_vi_sequestered_merge_20231026.csv'
+_DATSCAN_DTYPE = dict(PATNO=int, EVENT_ID=VISITS, DATSCAN_DATE=str,
+                      SCAN_DATE=str)
+
+
+# DaT scan sources (and their combination) read so far, each with the stamps
+# of the files it was read from; only the most recently used are kept
+_DATSCAN_CACHE = collections.OrderedDict()
+_DATSCAN_CACHE_SIZE = 4
+
+
+def _file_stamp(fname: str) -> tuple:
+    """
+    Returns filepath, modification time, and size of (resolved) file `fname`
+    """
+
+    stat = os.stat(fname)
+    return fname, stat.st_mtime_ns, stat.st_size
+
+
+def _datscan_stamp(fname: str, path: str = None) -> tuple:
+    """
+    Returns filepath, modification time, and size of DaT scan source `fname`
+    """
+
+    return _file_stamp(_get_data_file(fname, path=path))
+
+
+def _dates_stamp(path: str = None) -> tuple:
+    """
+    Returns stamps of the visit date files used by :func:`_add_dates`, or
+    None if they can't be found (and no dates would be added)
+    """
+
+    try:
+        files = _get_data_files(_DATE_FILES, path=path)
+    except FileNotFoundError:
+        return None
+    return tuple(_file_stamp(f) for f in files.values())
+
+
+def _cached(key: tuple, stamp: tuple, read) -> pd.DataFrame:
+    """
+    Returns data cached as `key` if it was read with `stamp`, else `read()`
+    A changed `stamp` replaces the cached data rather than adding to it, so
+    older versions of edited files are not kept in memory
+    """
+
+    entry = _DATSCAN_CACHE.get(key)
+    if entry is not None and entry[0] == stamp:
+        _DATSCAN_CACHE.move_to_end(key)
+        return entry[1]
+
+    data = read()
+    _DATSCAN_CACHE[key] = (stamp, data)
+    _DATSCAN_CACHE.move_to_end(key)
+    while len(_DATSCAN_CACHE) > _DATSCAN_CACHE_SIZE:
+        _DATSCAN_CACHE.popitem(last=False)
+
+    return data
+
+
+def _datscan_source(path: str,
+                    fname: str,
+                    usecols: tuple = None) -> pd.DataFrame:
+    """
+    Returns DaT scan source file `fname` in `path`, read once and cached
+    The cached data frame is shared between callers and must not be modified
+    in place; it is re-read if the file (or the visit date files, for sources
+    without dates) changes on disk
+    """
+
+    stamp = (_datscan_stamp(fname, path=path), _dates_stamp(path=path))
+    return _cached(('source', stamp[0][0], usecols), stamp,
+                   lambda: _read_datscan(path, stamp[0][0], usecols))
+
+
+def _read_datscan(path: str,
+                  fname: str,
+                  usecols: tuple = None) -> pd.DataFrame:
+    """
+    Reads DaT scan source file `fname` into standard format
+    """
+
+    rename_cols = dict(PATNO='participant', EVENT_ID='visit',
+                       DATSCAN_DATE='date')
+
+    raw = pd.read_csv(fname, dtype=_DATSCAN_DTYPE,
+                      usecols=None if usecols is None else list(usecols))
+    tidy = raw.rename(columns=rename_cols)
+    tidy.columns = [f.lower() for f in tidy.columns]
+    if 'visit' not in tidy.columns:
+        return tidy
+
+    tidy = tidy.dropna(subset=['visit'])
+    if 'date' in tidy.columns:
+        tidy['date'] = pd.to_datetime(tidy['date'], format='%m/%Y',
+                                      errors='coerce')
+    else:
+        tidy = _add_dates(tidy, path=path)
+
+    return tidy
+
+
+def _merge_datscan(path: str, fnames: List[str]) -> pd.DataFrame:
+    """
+    Combines DaT scan source files `fnames`, keeping one row per visit
+    """
+
+    # columns missing from a source are filled with NaN by concat
+    tidy = pd.concat([_read_datscan(path, fname) for fname in fnames],
+                     ignore_index=True, sort=False)
+    tidy = tidy[~tidy.duplicated(subset=['participant', 'visit'])]
+
+    return tidy.sort_values(['participant', 'visit'], kind='mergesort') \
+               .reset_index(drop=True)
+
+
 def load_datscan_all(path: str = None,
-                 measures: List[str] = None) -> pd.DataFrame:
+                     measures: List[str] = None) -> pd.DataFrame:
     """
     Loads DaT scan data into tidy dataframe
+    Combines the DaT scan analysis file with the sequestered SBR file, keeping
+    the first entry (in that order) of each participant and visit. Files are
+    only read once; subsequent calls re-use the combined data.
     Parameters
     ----------
     path : str, optional
@@ -306,41 +435,26 @@ def load_datscan_all(path: str = None,
     pypmi.available_datscan
     """
 
-    rename_cols = dict(PATNO='participant', EVENT_ID='visit', DATSCAN_DATE='date')
-    dtype = dict(PATNO=int, EVENT_ID=VISITS, SCAN_DATE=str)
+    # check for files and get their paths
+    stamps = tuple(_datscan_stamp(f, path=path) for f in _DATSCAN_FILES)
+    fnames = [stamp[0] for stamp in stamps]
+    tidy = _cached(('merged',) + tuple(fnames), stamps + (_dates_stamp(path),),
+                   lambda: _merge_datscan(path, fnames))
 
-    # check for file and get data directory path
-    fnames = ['DaTScan_Analysis.csv','DaTscan/inv_spect_sbr_sequestered_merge_20231026.csv']
-    tidies = []
-    for fname in fnames:
-        file = os.path.join(_get_data_dir(path=path, fnames=[fname]), fname)
-
-        # load data and coerce into standard format
-        raw = pd.read_csv(file, dtype=dtype)
-        tidy = raw.rename(columns=rename_cols).dropna(subset=['visit'])
-        tidy.columns = [f.lower() for f in tidy.columns]
-        # keep only desired measures
-        if measures is not None:
-            if isinstance(measures, str) and measures == 'all':
-                measures = available_datscan(path=os.path.dirname(path))
-            elif not isinstance(measures, list):
-                measures = list(measures)
-            for m in measures:
-                if m not in tidy.columns:
-                    raise ValueError('Specified measure {} is not valid. Please '
-                                     'see available datscan measures with `pypmi.'
-                                     'available_datscan()`.'.format(m))
-            tidy = tidy[['participant', 'visit','date'] + measures]
-        if 'date' in tidy.columns:
-            tidy['date'] = pd.to_datetime(tidy['date'], format='%m/%Y',
-                                          errors='coerce')
-        else:
-            tidy = _add_dates(tidy, path=os.path.dirname(path))
-        tidies.append(tidy)
-    tidies = pd.concat(tidies)
-    tidies = tidies.drop_duplicates()
-    return tidies.sort_values(['participant', 'visit']).reset_index(drop=True)
+    # keep only desired measures
+    if measures is not None:
+        if isinstance(measures, str) and measures == 'all':
+            measures = available_datscan(path=path)
+        elif not isinstance(measures, list):
+            measures = list(measures)
+        for m in measures:
+            if m not in tidy.columns:
+                raise ValueError('Specified measure {} is not valid. Please '
+                                 'see available datscan measures with `pypmi.'
+                                 'available_datscan()`.'.format(m))
+        return tidy[['participant', 'visit', 'date'] + measures]
 
+    return tidy.copy()
 
 
 def available_datscan(path: str = None) -> List[str]:
@@ -361,14 +475,13 @@ def available_datscan(path: str = None) -> List[str]:
     pypmi.load_datscan
     """
 
-    # check for file and get data directory path
-    fname = 'DaTScan_Analysis.csv'
-    path = os.path.join(_get_data_dir(path=path, fnames=[fname]), fname)
+    # check for file and get its path
+    fname = _get_data_file('DaTScan_Analysis.csv', path=path)
 
     # only need first line!
-    with open(path, 'r') as src:
+    with open(fname, 'r') as src:
         data = src.readline().strip().replace('"', '').split(',')[3:-3]
-    print(data)
+    logger.debug('DaT scan columns in %s: %s', fname, data)
 
     if 'DATSCAN_DATE' in data:
         data = data[1:]
@@ -416,16 +529,16 @@ def load_behavior(path: str = None,
     if len(beh_info) == 0:
         return pd.DataFrame(columns=['participant', 'visit', 'date'])
 
-    # check for files and get data directory path
+    # check for files and get their paths
     fnames = []
     for info in beh_info.values():
         fnames.extend(list(info.get('files', {}).keys()))
-    path = _get_data_dir(path=path, fnames=set(fnames))
+    files = _get_data_files(set(fnames), path=path)
 
     df = pd.DataFrame()
     # iterate through all keys in dictionary
     for key, info in beh_info.items():
-        print(key)
+        logger.debug('Scoring behavioral measure %s', key)
         cextra = info.get('extra', ['PATNO', 'EVENT_ID', 'INFODT','PAG_NAME'])
         capply = info.get('applymap', itertools.repeat(lambda x: x))
         copera = info.get('operation', itertools.repeat(np.sum))
@@ -434,7 +547,7 @@ def load_behavior(path: str = None,
         # go through relevant files and items for current key and grab scores
         for fname, items in info['files'].items():
             # read in file
-            data = pd.read_csv(os.path.join(path, fname),na_values=['UR']) # needed as for one participant in UPDRSIII file one value UR instead of numeric
+            data = pd.read_csv(files[fname],na_values=['UR']) # needed as for one participant in UPDRSIII file one value UR instead of numeric
             # iterate through items to be retrieved and apply operations
             for n, (it, ap, ope) in enumerate(zip(items, capply, copera)):
                 score = ope(data[it].applymap(ap), axis=1)
@@ -450,15 +563,16 @@ def load_behavior(path: str = None,
         curr_df = curr_df[cextra].astype('str').join(score).assign(test=key)
         # append resultant DataFrame to df
         df = df.append(curr_df, ignore_index=True, sort=True)
-    print(df[np.logical_and(df['test']=='tremor_NoMED',df['PATNO']=='3002')])
-    print(df[np.logical_and(df['test']=='updrs_iii_NoMED',df['PATNO']=='3002')])
-    print(df[np.logical_and(df['test']=='moca',df['PATNO']=='3002')])
+    count('load_behavior', rows_in=len(df))
     # rename post-treatment UDPRS III scores so there's no collision
     # pivot_table would average between the two by default. we don't want that!
     #df.loc[df['test'] == "updrs_iii", 'test'] = 'updrs_iii_a'
-    df.loc[np.logical_and(df['test'].str.contains('(_OFF)|(_ON)|(_NoMED)|(_A)'),df['score']<=0),'score'] = np.nan
+    invalid = np.logical_and(df['test'].str.contains('(_OFF)|(_ON)|(_NoMED)|(_A)'),df['score']<=0)
+    df.loc[invalid,'score'] = np.nan
+    logger.debug('Masked %d non-positive medication-state scores',
+                 invalid.sum())
+    count('load_behavior', scores_masked=invalid.sum())
 
-    print(df[np.logical_and(df['test']=='tremor_NoMED',df['PATNO']=='3002')])
     # clean up column names and convert to tidy dataframe
     df = df.rename(columns=rename_cols)
     tidy = pd.pivot_table(df, index=['participant', 'visit', 'date'],
@@ -477,6 +591,7 @@ def load_behavior(path: str = None,
     tidy['date'] = pd.to_datetime(tidy['date'], format='%m/%Y',
                                   errors='coerce')
     tidy[tidy.filter(regex='state_').columns] = tidy[tidy.filter(regex='state_').columns].replace([1,2],['OFF','ON'])
+    count('load_behavior', rows_out=len(tidy))
 
     return tidy.sort_values(['participant', 'visit']).reset_index(drop=True).set_index(['participant','visit'])
 
@@ -505,6 +620,129 @@ def available_behavior(path: str = None) -> List[str]:
     return measures
 
 
+# reductions that can be applied to whole arrays instead of row-by-row,
+# mapped to the NaN-skipping equivalent of applying them to each row (Series)
+_REDUCTIONS = {
+    np.sum: np.nansum, np.nansum: np.nansum,
+    np.mean: np.nanmean, np.nanmean: np.nanmean,
+    np.max: np.nanmax, np.nanmax: np.nanmax,
+    np.min: np.nanmin, np.nanmin: np.nanmin,
+}
+
+
+def _apply_step(curr_score, attr: str, inp, kwargs: dict):
+    """
+    Applies step `attr` of a measure specification to `curr_score`
+    Row-wise reductions and element-wise date parsing are vectorized; all
+    other steps call the pandas method `attr` directly
+    """
+
+    if attr == 'apply':
+        if (isinstance(curr_score, pd.DataFrame) and inp in _REDUCTIONS
+                and kwargs.get('axis') == 1
+                and all(pd.api.types.is_numeric_dtype(d)
+                        for d in curr_score.dtypes)):
+            # all-NaN rows are NaN (or 0, for sums), as with row-wise apply
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', RuntimeWarning)
+                score = _REDUCTIONS[inp](curr_score.values, axis=1)
+            return pd.Series(score, index=curr_score.index)
+        if isinstance(curr_score, pd.Series) and inp is pd.to_datetime:
+            try:
+                return pd.to_datetime(curr_score)
+            except (ValueError, TypeError):
+                pass
+
+    return getattr(curr_score, attr)(inp, **kwargs)
+
+
+def _compile_info(info: dict) -> dict:
+    """
+    Compiles measure specifications in `info` into steps grouped by file
+    Only the last file listed for each measure is used
+    Parameters
+    ----------
+    info : dict
+        Measure specifications (e.g., `DEMOGRAPHIC_INFO`)
+    Returns
+    -------
+    compiled : dict
+        Mapping of filename to list of (measure, items, steps) tuples, where
+        steps is a list of (method, input, kwargs) to apply to items in order
+    """
+
+    compiled = {}
+    for key, curr_key in info.items():
+        fname, items = list(curr_key['files'].items())[-1]
+        steps = [(attr, curr_key[attr].get('input', None),
+                  curr_key[attr].get('kwargs', {}))
+                 for attr in curr_key.keys() if attr != 'files']
+        compiled.setdefault(fname, []).append((key, items, steps))
+
+    return compiled
+
+
+def _load_info(files: dict,
+               info: dict,
+               keep: str = 'first',
+               rename: dict = None) -> pd.DataFrame:
+    """
+    Loads participant-level measures specified in `info`
+    Each file is read once (and only the columns required), all measures from
+    it are computed on the same frame, and the per-file results are assembled
+    with a single index-aligned concatenation
+    Parameters
+    ----------
+    files : dict
+        Mapping of the filenames in `info` to their filepaths
+    info : dict
+        Measure specifications (e.g., `DEMOGRAPHIC_INFO`)
+    keep : {'first', 'last'}, optional
+        Whether to keep the first entry (including missing values) or the last
+        non-missing entry for participants with multiple entries in a file.
+        Default: 'first'
+    rename : dict, optional
+        Columns to rename after reading files (e.g., {'patno': 'PATNO'})
+    Returns
+    -------
+    tidy : :obj:`pandas.DataFrame`
+        Data frame with 'participant' and measure columns
+    """
+
+    rename = rename if rename is not None else {}
+    scores = []
+    for fname, measures in _compile_info(info).items():
+        usecols = {'PATNO'} | set(rename)
+        for key, items, steps in measures:
+            usecols.update(np.atleast_1d(items))
+        data = pd.read_csv(files[fname], dtype=dict(PATNO=int),
+                           usecols=lambda c: c in usecols)
+        data = data.rename(columns=rename)
+
+        curr = {}
+        for key, items, steps in measures:
+            curr_score = data[items]
+            for attr, inp, kwargs in steps:
+                if hasattr(curr_score, attr):
+                    curr_score = _apply_step(curr_score, attr, inp, kwargs)
+            curr[key] = pd.Series(curr_score, name=key)
+        curr = pd.DataFrame(curr, index=data.index)
+        curr.index = data['PATNO'].astype(int).values
+
+        if keep == 'first':
+            curr = curr[~curr.index.duplicated(keep='first')]
+        else:
+            curr = curr.groupby(level=0).last()
+        scores.append(curr)
+
+    if len(scores) == 0:
+        return pd.DataFrame([], columns=['participant'])
+
+    tidy = pd.concat(scores, axis=1, join='outer')[list(info)]
+
+    return tidy.rename_axis('participant').reset_index()
+
+
 def load_demographics(path: str = None,
                       measures: List[str] = None) -> pd.DataFrame:
     """
@@ -528,9 +766,6 @@ def load_demographics(path: str = None,
     pypmi.available_demographics
     """
 
-    rename_cols = dict(PATNO='participant', EVENT_ID='visit')
-    dtype = dict(PATNO=int)
-
     # determine measures
     if measures is not None:
         if isinstance(measures, str) and measures == 'all':
@@ -541,32 +776,14 @@ def load_demographics(path: str = None,
     else:
         dem_info = DEMOGRAPHIC_INFO
 
-    # check for files and get data directory path
+    # check for files and get their paths
     fnames = []
     for info in dem_info.values():
         fnames.extend(list(info.get('files', {}).keys()))
-    path = _get_data_dir(path=path, fnames=set(fnames))
-
-    # empty data frame to hold information
-    tidy = pd.DataFrame([], columns=['PATNO'])
-
-    # iterate through demographic info to wrangle
-    for key, curr_key in dem_info.items():
-        for n, (fname, items) in enumerate(curr_key['files'].items()):
-            data = pd.read_csv(os.path.join(path, fname), dtype=dtype)
-            curr_score = data[items]
-            for attr in [f for f in curr_key.keys() if f not in ['files']]:
-                if hasattr(curr_score, attr):
-                    fnc = getattr(curr_score, attr)
-                    curr_score = fnc(curr_key[attr].get('input', None),
-                                     **curr_key[attr].get('kwargs', {}))
-            curr_score = pd.Series(curr_score, name=key)
-            temp_scores = data[['PATNO']].join(curr_score)
-        tidy = pd.merge(tidy, temp_scores, on='PATNO', how='outer')
+    files = _get_data_files(set(fnames), path=path)
 
-    # rename columns and remove duplicates (how are there duplicates???)
-    tidy = (tidy.rename(columns=rename_cols)
-                .drop_duplicates(subset=['participant']))
+    # read each file once and keep first entry for each participant
+    tidy = _load_info(files, dem_info, keep='first')
 
     return tidy.sort_values('participant').reset_index(drop=True)
 
@@ -592,6 +809,15 @@ def available_demographics(path: str = None) -> List[str]:
     return list(DEMOGRAPHIC_INFO.keys())
 
 
+# we use four files to try and capture as much "visit date" info:
+_DATE_FILES = [
+    'Inclusion_Exclusion.csv',
+    'Socio-Economics.csv',
+    'Vital_Signs.csv',
+    #'Signature_Form.csv',
+]
+
+
 def _load_dates(path: str = None,
                 fnames: List[str] = None) -> pd.DataFrame:
     """
@@ -618,24 +844,17 @@ def _load_dates(path: str = None,
     rename_cols = dict(PATNO='participant', EVENT_ID='visit', INFODT='date')
     dtype = dict(PATNO=int, EVENT_ID=VISITS)
 
-    # check for file and get data directory path
-    # we use four files to try and capture as much "visit date" info:
-    files = [
-        'Inclusion_Exclusion.csv',
-        'Socio-Economics.csv',
-        'Vital_Signs.csv',
-        #'Signature_Form.csv',
-    ]
-    # add additional files as needed by datatype and then get data path
+    # check for files and get their paths
+    files = list(_DATE_FILES)
+    # add additional files as needed by datatype and then get their paths
     if fnames is not None:
         files = fnames + files
-    path = _get_data_dir(path=path, fnames=files)
-    print(path)
+    files = _get_data_files(files, path=path)
+    logger.debug('Loading visit dates from %s', list(files.values()))
 
     # load data and coerce into standard format
-    raw = [pd.read_csv(os.path.join(path, f),
-                       dtype=dtype,
-                       usecols=rename_cols.keys()) for f in files]
+    raw = [pd.read_csv(f, dtype=dtype, usecols=rename_cols.keys())
+           for f in files.values()]
     tidy = (pd.concat(raw).rename(columns=rename_cols)
                           .get(list(rename_cols.values()))
                           .dropna()
@@ -706,9 +925,6 @@ def load_genotypes(path: str = None,
     pypmi.available_demographics
     """
 
-    rename_cols = dict(PATNO='participant', EVENT_ID='visit')
-    dtype = dict(PATNO=int)
-
     # determine measures
     if measures is not None:
         if isinstance(measures, str) and measures == 'all':
@@ -719,32 +935,14 @@ def load_genotypes(path: str = None,
     else:
         gen_info = GENOTYPES_INFO
 
-    # check for files and get data directory path
+    # check for files and get their paths
     fnames = []
     for info in gen_info.values():
         fnames.extend(list(info.get('files', {}).keys()))
-    path = _get_data_dir(path=path, fnames=set(fnames))
-
-    # empty data frame to hold information
-    tidy = pd.DataFrame([], columns=['PATNO'])
-
-    # iterate through demographic info to wrangle
-    for key, curr_key in gen_info.items():
-        for n, (fname, items) in enumerate(curr_key['files'].items()):
-            data = pd.read_csv(os.path.join(path, fname), dtype=dtype)
-            curr_score = data[items]
-            for attr in [f for f in curr_key.keys() if f not in ['files']]:
-                if hasattr(curr_score, attr):
-                    fnc = getattr(curr_score, attr)
-                    curr_score = fnc(curr_key[attr].get('input', None),
-                                     **curr_key[attr].get('kwargs', {}))
-            curr_score = pd.Series(curr_score, name=key)
-            temp_scores = data[['PATNO']].join(curr_score)
-        tidy = pd.merge(tidy, temp_scores, on='PATNO', how='outer')
+    files = _get_data_files(set(fnames), path=path)
 
-    # rename columns and remove duplicates (how are there duplicates???)
-    tidy = (tidy.rename(columns=rename_cols)
-                .drop_duplicates(subset=['participant']))
+    # read each file once and keep first entry for each participant
+    tidy = _load_info(files, gen_info, keep='first')
 
     return tidy.sort_values('participant').reset_index(drop=True)
 
@@ -792,9 +990,6 @@ def load_prodromal(path: str = None,
     pypmi.available_demographics
     """
 
-    rename_cols = dict(PATNO='participant', EVENT_ID='visit')
-    dtype = dict(PATNO=int)
-
     # determine measures
     if measures is not None:
         if isinstance(measures, str) and measures == 'all':
@@ -805,38 +1000,25 @@ def load_prodromal(path: str = None,
     else:
         gen_info = PRODROMAL_INFO
 
-    # check for files and get data directory path
+    # check for files and get their paths
     fnames = []
     for info in gen_info.values():
         fnames.extend(list(info.get('files', {}).keys()))
-    path = _get_data_dir(path=path, fnames=set(fnames))
-
-    # empty data frame to hold information
-    tidy = pd.DataFrame([], columns=['PATNO'])
+    files = _get_data_files(set(fnames), path=path)
 
-    # iterate through demographic info to wrangle
-    for key, curr_key in gen_info.items():
-        for n, (fname, items) in enumerate(curr_key['files'].items()):
-            data = pd.read_csv(os.path.join(path, fname), dtype=dtype)
-            curr_score = data[items]
-            for attr in [f for f in curr_key.keys() if f not in ['files']]:
-                if hasattr(curr_score, attr):
-                    fnc = getattr(curr_score, attr)
-                    curr_score = fnc(curr_key[attr].get('input', None),
-                                     **curr_key[attr].get('kwargs', {}))
-            curr_score = pd.Series(curr_score, name=key)
-            temp_scores = data[['PATNO']].join(curr_score)
-        tidy = pd.merge(tidy, temp_scores, on='PATNO', how='outer')
-
-    # rename columns and remove duplicates
-    tidy = (tidy.rename(columns=rename_cols).groupby('participant').last()).reset_index()
-               # .drop_duplicates(subset=['participant']))
-    more_dat = pd.read_csv(f'{path}/DaTscan/inv_spect_vi_sequestered_merge_20231026.csv',usecols=['PATNO','DATSCAN_VISINTRP']).rename(columns={'DATSCAN_VISINTRP':'dat_deficit_add','PATNO':'participant'})
+    # read each file once and keep last entry for each participant
+    tidy = _load_info(files, gen_info, keep='last')
+    more_dat = _datscan_source(path, _DATSCAN_VI_FILE,
+                               usecols=('PATNO', 'DATSCAN_VISINTRP'))
+    more_dat = more_dat.rename(columns={'datscan_visintrp': 'dat_deficit_add'})
     more_dat = more_dat.groupby('participant').last().reset_index()
     tidy = pd.merge(tidy,more_dat,on='participant',how='left')
-    print(tidy['dat_deficit'].isna().sum())
+    missing = tidy['dat_deficit'].isna().sum()
     tidy['dat_deficit'] = tidy['dat_deficit'].fillna(tidy['dat_deficit_add'])
-    print(tidy['dat_deficit'].isna().sum())
+    filled = missing - tidy['dat_deficit'].isna().sum()
+    logger.debug('Filled %d of %d missing dat_deficit from visual reads',
+                 filled, missing)
+    count('load_prodromal', rows_out=len(tidy), nas_filled=filled)
 
     return tidy.sort_values('participant').reset_index(drop=True)
 
@@ -863,9 +1045,6 @@ def load_prodromalBerg(path: str = None,
     pypmi.available_demographics
     """
 
-    rename_cols = dict(PATNO='participant')
-    dtype = dict(PATNO=int)
-
     # determine measures
     if measures is not None:
         if isinstance(measures, str) and measures == 'all':
@@ -876,39 +1055,19 @@ def load_prodromalBerg(path: str = None,
     else:
         gen_info = PRODROMAL_BERG2015
 
-    # check for files and get data directory path
+    # check for files and get their paths
     fnames = []
     for info in gen_info.values():
         fnames.extend(list(info.get('files', {}).keys()))
-    path = _get_data_dir(path=path, fnames=set(fnames))
-
-    # empty data frame to hold information
-    tidy = pd.DataFrame([], columns=['PATNO'])
-
-    # iterate through demographic info to wrangle
-    for key, curr_key in gen_info.items():
-        print(key)
-        for n, (fname, items) in enumerate(curr_key['files'].items()):
-            data = pd.read_csv(os.path.join(path, fname), dtype=dtype)
-            data = data.rename(columns={'patno':"PATNO"})
-            data['PATNO'] = data['PATNO'].astype(int)
-            curr_score = data[items]
-            for attr in [f for f in curr_key.keys() if f not in ['files']]:
-                if hasattr(curr_score, attr):
-                    fnc = getattr(curr_score, attr)
-                    curr_score = fnc(curr_key[attr].get('input', None),
-                                     **curr_key[attr].get('kwargs', {}))
-            curr_score = pd.Series(curr_score, name=key)
-            temp_scores = data[['PATNO']].join(curr_score)
-        tidy = pd.merge(tidy, temp_scores, on='PATNO', how='outer')
-
-    # rename columns and remove duplicates
-    # keep last entry per participant
-    tidy = (tidy.rename(columns=rename_cols).groupby('participant').last()).reset_index()
-                #.drop_duplicates(subset=['participant']))
+    files = _get_data_files(set(fnames), path=path)
+
+    # read each file once and keep last entry for each participant
+    tidy = _load_info(files, gen_info, keep='last', rename={'patno': 'PATNO'})
     
     # add datscan visual inspect new results
-    more_dat = pd.read_csv(f'{path}/DaTscan/inv_spect_vi_sequestered_merge_20231026.csv',usecols=['PATNO','DATSCAN_VISINTRP']).rename(columns={'DATSCAN_VISINTRP':'dat_deficit_add','PATNO':'participant'})
+    more_dat = _datscan_source(path, _DATSCAN_VI_FILE,
+                               usecols=('PATNO', 'DATSCAN_VISINTRP'))
+    more_dat = more_dat.rename(columns={'datscan_visintrp': 'dat_deficit_add'})
     more_dat = more_dat.groupby('participant').last().reset_index()
     tidy = pd.merge(tidy,more_dat,on='participant',how='left')
     tidy['dat_deficit'] = tidy['dat_deficit'].fillna(tidy['dat_deficit_add'])
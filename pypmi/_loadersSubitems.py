@@ -2,9 +2,7 @@
 Functions for loading data downloaded from the PPMI database
 """
 
-from functools import reduce
 import itertools
-import os
 import re
 from typing import List
 
@@ -12,8 +10,11 @@ import numpy as np
 import pandas as pd
 
 from _info2021 import BEHAVIORAL_INFO, DEMOGRAPHIC_INFO, VISITS, GENOTYPES_INFO
-from _utils import _get_data_dir
+from utils import _get_data_file, _get_data_files
 from _thresholds2021 import BEHAVIORAL_INFO as RECODE
+from _diagnostics import count, get_logger
+
+logger = get_logger(__name__)
 
 
 def load_biospecimen(path: str = None,
@@ -47,12 +48,12 @@ def load_biospecimen(path: str = None,
                        TESTNAME='test', TESTVALUE='score')
     dtype = dict(PATNO=int, CLINICAL_EVENT=VISITS, TESTNAME=str, TESTVALUE=str)
 
-    # check for file and get data directory path
-    fname = 'Current_Biospecimen_Analysis_Results.csv'
-    path = os.path.join(_get_data_dir(path=path, fnames=[fname]), fname)
+    # check for file and get its path
+    fname = _get_data_file('Current_Biospecimen_Analysis_Results.csv',
+                           path=path)
 
     # load data, make scores numeric, and clean up test names (no spaces!)
-    data = pd.read_csv(path, dtype=dtype, usecols=rename_cols.keys())
+    data = pd.read_csv(fname, dtype=dtype, usecols=rename_cols.keys())
     data = data.rename(columns=rename_cols)
     data['score'] = pd.to_numeric(data['score'], errors='coerce')
     data['test'] = data['test'].apply(lambda x: x.replace(' ', '_').lower())
@@ -73,7 +74,7 @@ def load_biospecimen(path: str = None,
                .rename_axis(None, axis=1)
 
     # (try to) add visit date information
-    tidy = _add_dates(tidy, path=os.path.dirname(path),
+    tidy = _add_dates(tidy, path=path,
                       fnames=['Lumbar_Puncture_Sample_Collection.csv'])
 
     return tidy.sort_values(['participant', 'visit']).reset_index(drop=True)
@@ -97,11 +98,11 @@ def available_biospecimen(path: str = None) -> List[str]:
     pypmi.load_biospecimen
     """
 
-    # check for file and get data directory path
-    fname = 'Current_Biospecimen_Analysis_Results.csv'
-    path = os.path.join(_get_data_dir(path=path, fnames=[fname]), fname)
+    # check for file and get its path
+    fname = _get_data_file('Current_Biospecimen_Analysis_Results.csv',
+                           path=path)
 
-    data = pd.read_csv(path, usecols=['TESTNAME'])['TESTNAME'].unique()
+    data = pd.read_csv(fname, usecols=['TESTNAME'])['TESTNAME'].unique()
 
     return sorted(list(set([f.replace(' ', '_').lower() for f in data])))
 
@@ -132,19 +133,18 @@ def load_datscan(path: str = None,
     rename_cols = dict(PATNO='participant', EVENT_ID='visit', SCAN_DATE='date')
     dtype = dict(PATNO=int, EVENT_ID=VISITS, SCAN_DATE=str)
 
-    # check for file and get data directory path
-    fname = 'DATScan_Analysis.csv'
-    path = os.path.join(_get_data_dir(path=path, fnames=[fname]), fname)
+    # check for file and get its path
+    fname = _get_data_file('DATScan_Analysis.csv', path=path)
 
     # load data and coerce into standard format
-    raw = pd.read_csv(path, dtype=dtype)
+    raw = pd.read_csv(fname, dtype=dtype)
     tidy = raw.rename(columns=rename_cols).dropna(subset=['visit'])
     tidy.columns = [f.lower() for f in tidy.columns]
 
     # keep only desired measures
     if measures is not None:
         if isinstance(measures, str) and measures == 'all':
-            measures = available_datscan(path=os.path.dirname(path))
+            measures = available_datscan(path=path)
         elif not isinstance(measures, list):
             measures = list(measures)
         for m in measures:
@@ -158,7 +158,7 @@ def load_datscan(path: str = None,
         tidy['date'] = pd.to_datetime(tidy['date'], format='%Y-%m-%d',
                                       errors='coerce')
     else:
-        tidy = _add_dates(tidy, path=os.path.dirname(path))
+        tidy = _add_dates(tidy, path=path)
 
     return tidy.sort_values(['participant', 'visit']).reset_index(drop=True)
 
@@ -181,12 +181,11 @@ def available_datscan(path: str = None) -> List[str]:
     pypmi.load_datscan
     """
 
-    # check for file and get data directory path
-    fname = 'DATScan_Analysis.csv'
-    path = os.path.join(_get_data_dir(path=path, fnames=[fname]), fname)
+    # check for file and get its path
+    fname = _get_data_file('DATScan_Analysis.csv', path=path)
 
     # only need first line!
-    with open(path, 'r') as src:
+    with open(fname, 'r') as src:
         data = src.readline().strip().replace('"', '').split(',')[2:]
 
     if 'SCAN_DATE' in data:
@@ -195,6 +194,28 @@ def available_datscan(path: str = None) -> List[str]:
     return sorted([f.lower() for f in data])
 
 
+def _item_range(measure: str, item: str) -> tuple:
+    """
+    Returns declared (min, max) of `item` of `measure` if it should be recoded
+    Raises ValueError if `measure` is marked for recoding in the thresholds
+    but the range of `item` is not declared there
+    """
+
+    spec = RECODE.get(measure, {})
+    if not spec.get('recode', False):
+        return None
+
+    bounds = spec.get('item_range')
+    if isinstance(bounds, dict):
+        bounds = bounds.get(item)
+    if bounds is None:
+        raise ValueError('Measure {} is marked for recoding but no range is '
+                         'declared for its item {} (see `item_range` in the '
+                         'behavioral thresholds).'.format(measure, item))
+
+    return bounds
+
+
 def load_behavior(path: str = None,
                   measures: List[str] = None, recode: bool = False) -> pd.DataFrame:
     """
@@ -210,7 +231,11 @@ def load_behavior(path: str = None,
         measures are retained; available behavioral measures can be viewed with
         :py:func:`pypmi.available_behavior`. Default: None
     recode :  bool, optional
-        reverse effect such that all scores indicate higher values with worse health
+        reverse effect such that all scores indicate higher values with worse health.
+        Raw item responses of measures marked for recoding in the thresholds
+        are reflected within the item range declared there (i.e., min + max -
+        response, before any `applymap`), so that they stay on the scale of
+        the item and don't depend on which rows are loaded
     Returns
     -------
     df : :obj:`pandas.DataFrame`
@@ -222,93 +247,85 @@ def load_behavior(path: str = None,
 
     rename_cols = dict(PATNO='participant', EVENT_ID='visit', INFODT='date')
 
-    # determine measures
-    if measures is not None:
-        if isinstance(measures, str) and measures == 'all':
-            beh_info = BEHAVIORAL_INFO
-        else:
-            beh_info = {d: v for d, v in BEHAVIORAL_INFO.items()
-                        if d in measures}
-        if 'education' in beh_info.keys():
-            del beh_info['education']
+    # determine measures (without modifying BEHAVIORAL_INFO)
+    if measures is not None and not (isinstance(measures, str)
+                                     and measures == 'all'):
+        beh_info = {d: v for d, v in BEHAVIORAL_INFO.items() if d in measures}
     else:
-        beh_info = BEHAVIORAL_INFO
-        del beh_info['education']
+        beh_info = dict(BEHAVIORAL_INFO)
+    beh_info.pop('education', None)
 
     if len(beh_info) == 0:
         return pd.DataFrame(columns=['participant', 'visit', 'date'])
 
-    # check for files and get data directory path
+    # check for files and get their paths
     fnames = []
     for info in beh_info.values():
         fnames.extend(list(info.get('files', {}).keys()))
-    print(set(fnames))
-    path = _get_data_dir(path=path, fnames=set(fnames))
-    
-    # iterate through all keys in dictionary
-    for i, (key, info) in zip(itertools.count(),beh_info.items()):
-        rec = RECODE[key]
-        cextra = info.get('extra', ['PATNO', 'EVENT_ID', 'INFODT'])
-        capply = info.get('applymap', itertools.repeat(lambda x: x))
-        copera = info.get('operation', itertools.repeat(np.sum))
-
-        temp_scores = []
-        # go through relevant files and items for current key and grab scores
+    files = _get_data_files(set(fnames), path=path)
+    logger.debug('Reading behavioral files %s', list(files.values()))
+
+    # plan which item columns to take from each file and how to transform
+    # them; items requested by multiple measures are taken (once) as
+    # specified by the first measure requesting them
+    plan = {}
+    for key, info in beh_info.items():
+        capply = info.get('applymap', itertools.repeat(None))
         for fname, items in info['files'].items():
-            # read in file
-            data = pd.read_csv(os.path.join(path, fname))
-            data['PATNO'] = data['PATNO'].astype(int)
-            data['EVENT_ID'] = data['EVENT_ID'].astype(VISITS)
-            data['INFODT'] = pd.to_datetime(data['INFODT'], format='%m/%Y',
-                                  errors='coerce')
-            # iterate through items to be retrieved and apply operations
-            for n, (it, ap, ope) in enumerate(zip(items, capply, copera)):
-                # if it is UPDRS3, we have to separate between version 3 and 3a (as sometimes on same day done and they differ although same identifiers)
-                #if fname == 'MDS_UPDRS_Part_III.csv':
-                #    scores = data[np.hstack([cextra,it,['PAG_NAME']])]
-                #    scores[it] = scores[it].applymap(ap)
-                #    scores = scores.set_index(cextra)
-                #    updrs3a = scores[scores['PAG_NAME'] == "NUPDRS3A"].add_suffix('_a').drop(columns='PAG_NAME_a')
-                #    scores = scores[scores['PAG_NAME'] == "NUPDRS3"].drop(columns="PAG_NAME")
-                #    scores = scores.merge(updrs3a,left_index=True,right_index=True,how='outer')
-                #else:
-                scores = data[np.hstack([cextra,it])]
-                scores[it] = scores[it].applymap(ap)
-                #scores = scores.set_index(cextra)
-                temp_scores.append(scores)
-                
-        # merge temp score DataFrames
-        curr_df = reduce(lambda df1, df2: pd.merge(df1, df2, on=cextra),
-                         temp_scores)
-        # combine individual scores for key with joinfunc and add to extra info
-        #joinfunc = info.get('joinfunc', np.sum)
-        #score = pd.Series(joinfunc(curr_df.drop(cextra, axis=1), axis=1)
-        #                  .astype('float'), name='score')
-        #curr_df = curr_df[cextra].astype('str').join(score).assign(test=key)
-        if recode:
-            if rec['recode']:
-                print('recode')
-                print(curr_df.head())
-                curr_df = curr_df.max(axis=0) - curr_df
-                print(curr_df.head())
-
-        # append resultant DataFrame to df
-        if i < 1:
-            df = curr_df.copy(deep=True)
-        else:
-            df = df.merge(curr_df, how="outer",on=cextra,suffixes=['','_DROP']).filter(regex='^(?!.*_DROP)')
+            for it, ap in zip(items, capply):
+                for col in np.atleast_1d(it):
+                    if not any(col in cols for cols in plan.values()):
+                        bounds = _item_range(key, col) if recode else None
+                        plan.setdefault(fname, {})[col] = (ap, bounds)
+
+    # read each file once, convert dtypes once, and key rows on (PATNO,
+    # EVENT_ID, INFODT); repeated keys within a file are aligned in order
+    keys = ['PATNO', 'EVENT_ID', 'INFODT']
+    frames = []
+    for fname, cols in plan.items():
+        data = pd.read_csv(files[fname],
+                           usecols=lambda c: c in keys or c in cols)
+        data = data.drop_duplicates(ignore_index=True)
+        data['PATNO'] = data['PATNO'].astype(int)
+        data['EVENT_ID'] = data['EVENT_ID'].astype(VISITS)
+        data['INFODT'] = pd.to_datetime(data['INFODT'], format='%m/%Y',
+                                        errors='coerce')
+        data['_n'] = data.groupby(keys, observed=True, dropna=False).cumcount()
+        for col, (ap, bounds) in cols.items():
+            if bounds is not None:
+                data[col] = bounds[0] + bounds[1] - data[col]
+            if ap is not None:
+                data[col] = data[col].map(ap)
+        frames.append((data, list(cols)))
+        count('load_behavior', rows_in=len(data))
+
+    # integer-code keys of all files at once, so that every row has a fixed
+    # output position, and gather item columns of all files in one step
+    allkeys = pd.concat([data[keys + ['_n']] for data, _ in frames],
+                        ignore_index=True)
+    codes, uniques = pd.MultiIndex.from_frame(allkeys).factorize()
+    uniques = uniques.to_frame(index=False, name=keys + ['_n'])
+    order = uniques.sort_values(keys + ['_n']).index.values
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    codes = rank[codes]
+
+    df = {k: uniques[k].values[order] for k in keys}
+    start = 0
+    for data, cols in frames:
+        rows = np.full(len(uniques), -1)
+        rows[codes[start:start + len(data)]] = np.arange(len(data))
+        start += len(data)
+        for col in cols:
+            df[col] = data[col].array.take(rows, allow_fill=True)
+    df = pd.DataFrame(df)
 
     # clean up column names and convert to tidy dataframe
     tidy = df.rename(columns=rename_cols)
-
-    # coerce data types to desired format
-    tidy['participant'] = tidy['participant'].astype(int)
     tidy['visit'] = tidy['visit'].astype(VISITS)
-    tidy['date'] = pd.to_datetime(tidy['date'], format='%m/%Y',
-                                  errors='coerce')
-    tidy = tidy.drop_duplicates().dropna(axis="rows",how="all")
-    
-    return tidy.sort_values(['participant', 'visit','date']).reset_index(drop=True)
+    count('load_behavior', rows_out=len(tidy))
+
+    return tidy
 
 
 def available_behavior(path: str = None) -> List[str]:
@@ -371,11 +388,11 @@ def load_demographics(path: str = None,
     else:
         dem_info = DEMOGRAPHIC_INFO
 
-    # check for files and get data directory path
+    # check for files and get their paths
     fnames = []
     for info in dem_info.values():
         fnames.extend(list(info.get('files', {}).keys()))
-    path = _get_data_dir(path=path, fnames=set(fnames))
+    files = _get_data_files(set(fnames), path=path)
 
     # empty data frame to hold information
     tidy = pd.DataFrame([], columns=['PATNO'])
@@ -383,7 +400,7 @@ def load_demographics(path: str = None,
     # iterate through demographic info to wrangle
     for key, curr_key in dem_info.items():
         for n, (fname, items) in enumerate(curr_key['files'].items()):
-            data = pd.read_csv(os.path.join(path, fname), dtype=dtype)
+            data = pd.read_csv(files[fname], dtype=dtype)
             curr_score = data[items]
             for attr in [f for f in curr_key.keys() if f not in ['files']]:
                 if hasattr(curr_score, attr):
@@ -448,7 +465,7 @@ def _load_dates(path: str = None,
     rename_cols = dict(PATNO='participant', EVENT_ID='visit', INFODT='date')
     dtype = dict(PATNO=int, EVENT_ID=VISITS)
 
-    # check for file and get data directory path
+    # check for files and get their paths
     # we use four files to try and capture as much "visit date" info:
     files = [
         'Inclusion_Exclusion.csv',
@@ -456,15 +473,14 @@ def _load_dates(path: str = None,
         'Socio-Economics.csv',
         'Vital_Signs.csv',
     ]
-    # add additional files as needed by datatype and then get data path
+    # add additional files as needed by datatype and then get their paths
     if fnames is not None:
         files = fnames + files
-    path = _get_data_dir(path=path, fnames=files)
+    files = _get_data_files(files, path=path)
 
     # load data and coerce into standard format
-    raw = [pd.read_csv(os.path.join(path, f),
-                       dtype=dtype,
-                       usecols=rename_cols.keys()) for f in files]
+    raw = [pd.read_csv(f, dtype=dtype, usecols=rename_cols.keys())
+           for f in files.values()]
     tidy = (pd.concat(raw).rename(columns=rename_cols)
                           .get(list(rename_cols.values()))
                           .dropna()
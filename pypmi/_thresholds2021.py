@@ -8,11 +8,14 @@ from pandas.api.types import CategoricalDtype as cdtype
 import datetime
 
 
+# measures with 'recode' also declare 'item_range', the (min, max) of their raw
+# item responses, either for all items or (as a dict) for each item
 BEHAVIORAL_INFO = {
     'benton': {
         'min': 0,
         'max': 15,
         'recode': True,
+        'item_range': (0, 1),
         'scale_level': 'ordinal'
     },
     'epworth': {
@@ -31,30 +34,66 @@ BEHAVIORAL_INFO = {
         'min': 0,
         'max': 36,
         'recode': True,
+        'item_range': (0, 12),
         'scale_level': 'ordinal'
     },
     'hvlt_recognition': {
         'min': -12,
         'max': 12,
         'recode': True,
+        'item_range': {
+            'HVLTREC': (0, 12),
+            'HVLTFPRL': (0, 6),
+            'HVLTFPUN': (0, 6)
+        },
         'scale_level': 'ordinal'
     },
     'hvlt_retention': {
         'min': 0,
         'max': 12,
         'recode': True,
+        'item_range': (0, 12),
         'scale_level': 'normal'
     },
     'lns': {
         'min': 0,
         'max': 30,
         'recode': True,
+        'item_range': (0, 1),
         'scale_level': 'ordinal'
     },
     'moca': {
         'min': 0,
         'max': 30,
         'recode': True,
+        'item_range': {
+            'MCAALTTM': (0, 1),
+            'MCACUBE': (0, 1),
+            'MCACLCKC': (0, 1),
+            'MCACLCKN': (0, 1),
+            'MCACLCKH': (0, 1),
+            'MCALION': (0, 1),
+            'MCARHINO': (0, 1),
+            'MCACAMEL': (0, 1),
+            'MCAFDS': (0, 1),
+            'MCABDS': (0, 1),
+            'MCAVIGIL': (0, 1),
+            'MCASER7': (0, 3),
+            'MCASNTNC': (0, 2),
+            'MCAVF': (0, 1),
+            'MCAABSTR': (0, 2),
+            'MCAREC1': (0, 1),
+            'MCAREC2': (0, 1),
+            'MCAREC3': (0, 1),
+            'MCAREC4': (0, 1),
+            'MCAREC5': (0, 1),
+            'MCADATE': (0, 1),
+            'MCAMONTH': (0, 1),
+            'MCAYR': (0, 1),
+            'MCADAY': (0, 1),
+            'MCAPLACE': (0, 1),
+            'MCACITY': (0, 1)
+        },
         'scale_level': 'ordinal'
     },
     'pigd': {
@@ -91,12 +130,14 @@ BEHAVIORAL_INFO = {
         'min': 0,
         'max': 100,
         'recode': True,
+        'item_range': (0, 100),
         'scale_level': 'ordinal'
     },
     'semantic_fluency': {
         'min': 0,
         'max': 200,
         'recode': True,
+        'item_range': (0, 200),
         'scale_level': 'ordinal'
     },
     'stai_state': {
@@ -115,6 +156,7 @@ BEHAVIORAL_INFO = {
         'min': 0,
         'max': 110,
         'recode': True,
+        'item_range': (0, 110),
         'scale_level': 'ordinal'
     },
     'systolic_bp_drop': {
@@ -193,12 +235,14 @@ BEHAVIORAL_INFO = {
         'min': 0,
         'max': 40,
         'recode': True,
+        'item_range': (0, 40),
         'scale_level': 'ordinal'
     },
     'upsit_percent': {
         'min': 0,
         'max': 100,
         'recode': True,
+        'item_range': (0, 100),
         'scale_level': 'normal'
     },
     'date': {
@@ -4,9 +4,13 @@ Code for preparing raw PPMI neuroimaging data to be converted to BIDS format
 with heudiconv.
 """
 
+from concurrent.futures import ThreadPoolExecutor
+import os
 from os import PathLike
 import pathlib
 from pkg_resources import resource_filename
+import re
+import shutil
 from typing import List, Union
 
 import pandas as pd
@@ -22,11 +26,141 @@ except ImportError:
 # get list of sessions that won't convert for whatever reason
 BAD_SCANS = resource_filename('pypmi', 'data/sessions.txt')
 HEURISTIC = resource_filename('pypmi', 'data/heuristic.py')
+# persistent record of converted scan series, relative to BIDS dataset
+LEDGER = pathlib.Path('.heudiconv') / 'converted_series.tsv'
+
+
+def _get_series_uid(scan_dir: Union[str, PathLike]) -> str:
+    """
+    Returns series instance UID of first DICOM found in `scan_dir`
+
+    Only the relevant header tag is read so this is fast even for very large
+    DICOM series
+
+    Parameters
+    ----------
+    scan_dir : str or pathlib.Path
+        Path to directory containing DICOMs from a single scan series
+
+    Returns
+    -------
+    uid : str
+        Series instance UID of scan series. If no DICOMs are found in
+        `scan_dir` None is returned instead
+    """
+
+    for img in pathlib.Path(scan_dir).glob('*dcm'):
+        img = dcm.read_file(str(img), stop_before_pixels=True,
+                            specific_tags=['SeriesInstanceUID'])
+        return str(img.SeriesInstanceUID)
+
+
+def _converted_series(out_dir: Union[str, PathLike]) -> pd.DataFrame:
+    """
+    Lists scan series that have already been converted into `out_dir`
+
+    Uses the DICOM information files that ``heudiconv`` stores in the hidden
+    `.heudiconv` sub-directory of every BIDS dataset it generates. As these
+    only describe the latest conversion of a session they are combined with
+    the ledger of all conversions kept by :func:`_update_ledger`
+
+    Parameters
+    ----------
+    out_dir : str or pathlib.Path
+        Path to previously generated BIDS-format PPMI dataset
+
+    Returns
+    -------
+    converted : pandas.DataFrame
+        Data frame with columns ['subject', 'session', 'date', 'series_uid'],
+        where 'date' is formatted as YYYY-MM to match the session grouping
+        used in :func:`_prepare_subject`
+    """
+
+    cols = ['subject', 'session', 'date', 'series_uid']
+    out_dir = pathlib.Path(out_dir).resolve()
+
+    converted = []
+    fnames = '.heudiconv/*/ses-*/info/dicominfo_ses-*.tsv'
+    for fn in out_dir.glob(fnames):
+        info = pd.read_csv(fn, sep='\t', usecols=['date', 'series_uid'],
+                           dtype=str)
+        converted.append(info.assign(subject=fn.parts[-4],
+                                     session=int(fn.parts[-3][4:])))
+
+    if len(converted) > 0:
+        converted = pd.concat(converted, ignore_index=True)
+        # heudiconv stores dates as YYYYMMDD; PPMI directories are YYYY-MM-DD
+        date = converted['date'].str.replace('-', '')
+        converted['date'] = date.str[:4] + '-' + date.str[4:6]
+        converted = [converted[cols]]
+
+    ledger = out_dir / LEDGER
+    if ledger.exists():
+        dtype = dict.fromkeys(cols, str)
+        dtype['session'] = int
+        converted.insert(0, pd.read_csv(ledger, sep='\t', dtype=dtype))
+
+    if len(converted) == 0:
+        return pd.DataFrame(columns=cols)
+
+    converted = pd.concat(converted, ignore_index=True)
+
+    return (converted[cols].drop_duplicates(['subject', 'series_uid'])
+                           .reset_index(drop=True))
+
+
+def _update_ledger(out_dir: Union[str, PathLike],
+                   bids_dir: Union[str, PathLike] = None) -> pd.DataFrame:
+    """
+    Records scan series converted into `out_dir` in its persistent ledger
+
+    ``heudiconv`` rewrites the DICOM information of a session whenever it is
+    converted, so the ledger (see :data:`LEDGER`) must be updated after every
+    conversion to keep track of all the series that have ever been converted
+
+    Parameters
+    ----------
+    out_dir : str or pathlib.Path
+        Path to BIDS-format PPMI dataset
+    bids_dir : str or pathlib.Path, optional
+        Path to BIDS dataset whose converted series should also be recorded in
+        the ledger of `out_dir` (i.e., the dataset of an incremental conversion
+        that was merged into `out_dir`). Default: None
+
+    Returns
+    -------
+    converted : pandas.DataFrame
+        All scan series converted into `out_dir`, as returned by
+        :func:`_converted_series`
+    """
+
+    out_dir = pathlib.Path(out_dir).resolve()
+
+    converted = _converted_series(out_dir)
+    if bids_dir is not None:
+        new = _converted_series(bids_dir)
+        if len(converted) == 0:
+            converted = new
+        elif len(new) > 0:
+            converted = pd.concat([converted, new], ignore_index=True)
+            converted = (converted.drop_duplicates(['subject', 'series_uid'])
+                                  .reset_index(drop=True))
+
+    ledger = out_dir / LEDGER
+    ledger.parent.mkdir(parents=True, exist_ok=True)
+    temp = ledger.with_name('.tmp_' + ledger.name)
+    converted.to_csv(temp, sep='\t', index=False)
+    temp.replace(ledger)
+
+    return converted
 
 
 def _prepare_subject(subj_dir: Union[str, PathLike],
                      timeout: Union[str, PathLike] = None,
-                     confirm_uids: bool = True) -> str:
+                     confirm_uids: bool = True,
+                     converted: pd.DataFrame = None,
+                     stage_dir: Union[str, PathLike] = None) -> str:
     """
     Reorganizes `subj_dir` to structure more compatible with ``heudiconv``
 
@@ -41,6 +175,15 @@ def _prepare_subject(subj_dir: Union[str, PathLike],
         Whether to check that DICOM study instance UIDs for provided subject
         are all consistent for a given session. Only applicable if `pydicom`
         is installed. Default: True
+    converted : pandas.DataFrame, optional
+        Scan series for this subject that have already been converted, as
+        returned by :func:`_converted_series`. If provided, sessions are
+        numbered to match the existing conversion and only series with unseen
+        series instance UIDs are moved to `stage_dir`. Default: None
+    stage_dir : str or pathlib.Path, optional
+        Directory where new (i.e., not yet converted) scans should be staged
+        as {subject}/{session}/{scan}. Only used if `converted` is provided.
+        Default: None
 
     Returns
     -------
@@ -60,17 +203,31 @@ def _prepare_subject(subj_dir: Union[str, PathLike],
     scans = [f for f in subj_dir.glob('*') if not f.name.isdigit()]
 
     # if subject was previously converted update number structure correctly
-    # FIXME: should we check to see if there's overlap (i.e., a new scan was
-    # added from the same session?); could pull study UID / date from dicoms?
     prev = len([f for f in subj_dir.glob('*') if f.name.isdigit()])
 
     # get all sessions for subject (session = same day)
     sessions = [v.name[:7] for v in subj_dir.rglob('????-??-??_??_??_??.?')]
     sessions = sorted(set(sessions))
 
+    # when we know what was already converted we can match new scans to the
+    # correct (existing) session and skip the series we've already seen
+    if converted is not None:
+        known = dict(zip(converted['date'], converted['session']))
+        seen = set(converted['series_uid'])
+        prev = max([prev] + list(known.values()))
+        numbers = {}
+        for ses in sessions:
+            if ses not in known:
+                prev += 1
+            numbers[ses] = known.get(ses, prev)
+        stage_dir = pathlib.Path(stage_dir) / subj_dir.name
+    else:
+        numbers = {ses: n for n, ses in enumerate(sessions, prev + 1)}
+        seen = set()
+
     # iterate through sessions and copy scans to uniform directory structure
     force = []
-    for n, ses in enumerate(sessions, prev + 1):
+    for ses, n in numbers.items():
         sids = set()
 
         # make session directory
@@ -88,13 +245,19 @@ def _prepare_subject(subj_dir: Union[str, PathLike],
                 dest = timeout / subj_dir.name / ses_dir.name
                 dest.mkdir(parents=True, exist_ok=True)
                 scan_type.rename(dest / scan_type.name)
-            # otherwise, move it to the appropriate scan directory
+            # otherwise, move it to the appropriate scan directory (or, if
+            # we're converting incrementally and it's new, stage it)
             else:
                 if confirm_uids:
                     for img in scan_type.glob('*dcm'):
                         img = dcm.read_file(str(img), stop_before_pixels=True)
                         sids.add(img[('0020', '000d')].value)
-                out = ses_dir / scan_type.name
+                dest = ses_dir
+                if converted is not None \
+                        and _get_series_uid(scan_type) not in seen:
+                    dest = stage_dir / ses_dir.name
+                    dest.mkdir(parents=True, exist_ok=True)
+                out = dest / scan_type.name
                 scan_type.rename(out)
 
             # if there are no more scans in the parent directory, remove it
@@ -114,7 +277,8 @@ def _prepare_subject(subj_dir: Union[str, PathLike],
 
 def _prepare_directory(data_dir: Union[str, PathLike],
                        ignore_bad: bool = True,
-                       confirm_uids: bool = True) -> List[str]:
+                       confirm_uids: bool = True,
+                       converted: pd.DataFrame = None) -> List[str]:
     """
     Reorganizes PPMI `data_dir` to a structure compatible with ``heudiconv``
 
@@ -147,12 +311,18 @@ def _prepare_directory(data_dir: Union[str, PathLike],
         Whether to check that DICOM study instance UIDs for provided subject
         are all consistent for a given session. Only applicable if `pydicom`
         is installed. Default: True
+    converted : pandas.DataFrame, optional
+        Scan series that have already been converted, as returned by
+        :func:`_converted_series`. If provided, only new scan series are
+        prepared for conversion; these are staged in the `incremental`
+        sub-directory of `data_dir`. Default: None
 
     Returns
     -------
     subjects : list
         List of subjects who are ready to be converted / reconstructed with
-        ``heudiconv``
+        ``heudiconv``. If `converted` is provided, only subjects with new scans
+        are returned
     coerce : list
         List of paths to data directories where subjects / sessions may have
         had inconsistent study instance UIDs that should be coerced
@@ -168,15 +338,27 @@ def _prepare_directory(data_dir: Union[str, PathLike],
     else:
         timeout = None
 
+    # location where new scans will be staged for incremental conversion
+    stage_dir = data_dir / 'incremental'
+    subj_converted = None
+
     subjects, coerce = [], []
     for subj_dir in sorted(data_dir.glob('*')):
-        if not subj_dir.is_dir() or subj_dir.name == 'bad':
+        if not subj_dir.is_dir() or subj_dir.name in ['bad', 'incremental',
+                                                      'incremental_bids']:
             continue
+        if converted is not None:
+            subj_converted = converted.query(f'subject == "{subj_dir.name}"')
         subj, force = _prepare_subject(subj_dir, timeout=timeout,
-                                       confirm_uids=confirm_uids)
+                                       confirm_uids=confirm_uids,
+                                       converted=subj_converted,
+                                       stage_dir=stage_dir)
         subjects.append(subj)
         coerce.extend(force)
 
+    if converted is not None:
+        subjects = sorted(f.name for f in stage_dir.glob('*') if f.is_dir())
+
     return subjects, coerce
 
 
@@ -209,27 +391,303 @@ def _force_consistent_uids(data_dir: Union[str, PathLike],
         dcm.write_file(str(fn), img)
 
 
-def _clean_directory(out_dir: Union[str, PathLike]):
+def _free_runs(stems: List[str], dest: pathlib.Path,
+               taken: set) -> List[str]:
+    """
+    Renumbers run entity of `stems` to the first run not yet used in `dest`
+
+    Parameters
+    ----------
+    stems : list of str
+        Filenames (without extensions) of images from a single run that differ
+        only in entities other than the run (e.g., echo)
+    dest : pathlib.Path
+        Directory where images will be moved
+    taken : set
+        Filenames (without extensions) that have already been claimed in
+        `dest`. Updated in place with the returned names
+
+    Returns
+    -------
+    stems : list of str
+        Renamed `stems`
+    """
+
+    def rename(stem, run, width):
+        return re.sub(r'_run-\d+', '_run-{:0{}d}'.format(run, width), stem)
+
+    def used(stem):
+        return stem in taken or any(dest.glob(stem + '.*'))
+
+    match = re.search(r'_run-(\d+)', stems[0])
+    if match is None:
+        if any(used(stem) for stem in stems):
+            raise FileExistsError('Cannot add images without run entity to '
+                                  '{} as they already exist: {}'
+                                  .format(dest, stems))
+        taken.update(stems)
+        return stems
+
+    run, width = int(match.group(1)), len(match.group(1))
+    while any(used(rename(stem, run, width)) for stem in stems):
+        run += 1
+    stems = [rename(stem, run, width) for stem in stems]
+    taken.update(stems)
+
+    return stems
+
+
+def _merge_converted(bids_dir: Union[str, PathLike],
+                     out_dir: Union[str, PathLike]) -> pd.DataFrame:
+    """
+    Moves images converted into `bids_dir` into existing BIDS dataset `out_dir`
+
+    ``heudiconv`` numbers runs from one every time it converts a session, so
+    when new scans of an already converted session are added to `out_dir`
+    their runs are renumbered to follow the existing ones. The sessions' scans
+    files and the participants file of `out_dir` are updated accordingly;
+    other dataset-level files are only copied if they do not exist yet.
+
+    Parameters
+    ----------
+    bids_dir : str or pathlib.Path
+        Path to BIDS dataset with newly converted images
+    out_dir : str or pathlib.Path
+        Path to BIDS dataset where images should be added
+
+    Returns
+    -------
+    moved : pandas.DataFrame
+        Data frame with columns ['source', 'filename'] mapping images from
+        `bids_dir` to their new location in `out_dir`
+    """
+
+    bids_dir = pathlib.Path(bids_dir).resolve()
+    out_dir = pathlib.Path(out_dir).resolve()
+
+    moved = []
+    for ses_dir in sorted(bids_dir.glob('sub-*/ses-*')):
+        dest_ses = out_dir / ses_dir.relative_to(bids_dir)
+        renamed = {}
+        for mod_dir in sorted(d for d in ses_dir.glob('*') if d.is_dir()):
+            dest = dest_ses / mod_dir.name
+            dest.mkdir(parents=True, exist_ok=True)
+            # group files by image (i.e., name sans extension) and run
+            stems = {}
+            for fn in sorted(mod_dir.glob('*')):
+                stem = fn.name.split('.')[0]
+                key = re.sub(r'_echo-\d+', '', stem)
+                stems.setdefault(key, {}).setdefault(stem, []).append(fn)
+            taken = set()
+            for group in stems.values():
+                new = _free_runs(list(group), dest, taken)
+                for stem, new_stem in zip(group, new):
+                    for fn in group[stem]:
+                        target = dest / (new_stem + fn.name[len(stem):])
+                        shutil.move(str(fn), str(target))
+                        moved.append((fn, target))
+                        renamed[fn.relative_to(ses_dir).as_posix()] = \
+                            target.relative_to(dest_ses).as_posix()
+
+        # add new scans to (existing) scans file of session
+        for fn in ses_dir.glob('*_scans.tsv'):
+            scans = pd.read_csv(fn, sep='\t', dtype=str, keep_default_na=False)
+            scans['filename'] = scans['filename'].replace(renamed)
+            dest = dest_ses / fn.name
+            if dest.exists():
+                scans = pd.concat([pd.read_csv(dest, sep='\t', dtype=str,
+                                               keep_default_na=False),
+                                   scans], ignore_index=True)
+            scans.to_csv(dest, sep='\t', index=False)
+            fn.unlink()
+
+    # copy remaining files, updating participants file
+    for root, dirs, files in os.walk(str(bids_dir)):
+        dirs[:] = [d for d in dirs if d != '.heudiconv']
+        for fn in files:
+            src = pathlib.Path(root) / fn
+            dest = out_dir / src.relative_to(bids_dir)
+            if fn == 'participants.tsv' and dest.exists():
+                participants = pd.concat([
+                    pd.read_csv(dest, sep='\t', dtype=str,
+                                keep_default_na=False),
+                    pd.read_csv(src, sep='\t', dtype=str,
+                                keep_default_na=False)
+                ], ignore_index=True)
+                participants.drop_duplicates('participant_id') \
+                            .to_csv(dest, sep='\t', index=False)
+            elif not dest.exists():
+                dest.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copy2(str(src), str(dest))
+
+    return pd.DataFrame(moved, columns=['source', 'filename'])
+
+
+def _sidecar(filename: pathlib.Path) -> pathlib.Path:
+    """ Returns path to JSON sidecar of NIfTI `filename` (None if not NIfTI)
+    """
+
+    for ext in ('.nii', '.nii.gz'):
+        if filename.name.endswith(ext) and len(filename.name) > len(ext):
+            return filename.with_name(filename.name[:-len(ext)] + '.json')
+
+
+def _find_cleanup(out_dir: Union[str, PathLike]) -> pd.DataFrame:
+    """
+    Finds files in BIDS dataset `out_dir` that require post-processing
+
+    The dataset is crawled once and only NIfTI headers are read, so this is
+    cheap even for very large datasets. The `.heudiconv` sub-directory is not
+    touched. JSON sidecars of NIfTI images that are to be removed are not
+    listed, as they are removed alongside their image.
+
+    Parameters
+    ----------
+    out_dir : str or pathlib.Path
+        Path to BIDS-format PPMI dataset
+
+    Returns
+    -------
+    candidates : pandas.DataFrame
+        Data frame with columns ['filename', 'action'], where action is one of
+        'merge' (T1w images split into multiple volumes) or 'remove' (2D
+        images left over from multi-echo conversions and stray temporary files)
+    """
+
+    candidates = []
+    for root, dirs, files in os.walk(str(out_dir)):
+        dirs[:] = [d for d in dirs if d != '.heudiconv']
+        for fn in sorted(files):
+            path = pathlib.Path(root) / fn
+            if '_heudiconv' in fn or fn.startswith('.tmp_'):
+                candidates.append((path, 'remove'))
+            elif fn.endswith(('.nii', '.nii.gz')):
+                shape = nib.load(str(path)).shape
+                if len([f for f in shape if f > 1]) < 3:
+                    candidates.append((path, 'remove'))
+                elif (fn.endswith(('_T1w.nii', '_T1w.nii.gz'))
+                      and len(shape) == 4 and shape[-1] > 1):
+                    candidates.append((path, 'merge'))
+
+    # sidecars go with their images (see `_remove_file`)
+    sidecars = {_sidecar(path) for path, action in candidates
+                if action == 'remove'}
+    candidates = [(path, action) for path, action in candidates
+                  if path not in sidecars]
+
+    return pd.DataFrame(candidates, columns=['filename', 'action'])
+
+
+def _remove_file(filename: Union[str, PathLike]) -> pathlib.Path:
+    """
+    Removes `filename` and, if it is a NIfTI image, its JSON sidecar
+
+    Parameters
+    ----------
+    filename : str or pathlib.Path
+        Path to file to be removed
+
+    Returns
+    -------
+    filename : pathlib.Path
+        Path to removed file
+    """
+
+    filename = pathlib.Path(filename)
+    # don't check before removing: other workers may be removing them, too
+    for fn in (filename, _sidecar(filename)):
+        try:
+            if fn is not None:
+                fn.unlink()
+        except FileNotFoundError:
+            pass
+
+    return filename
+
+
+def _drop_scans(filenames: List[pathlib.Path]):
+    """
+    Drops removed images `filenames` from the scans files of their sessions
+
+    Parameters
+    ----------
+    filenames : list of pathlib.Path
+        Paths to images that were removed from a BIDS dataset
+    """
+
+    # scans files live in the directory above the (modality) image directory
+    removed = {}
+    for fn in filenames:
+        ses_dir = fn.parent.parent
+        removed.setdefault(ses_dir, set()).add(
+            fn.relative_to(ses_dir).as_posix())
+
+    for ses_dir, fnames in removed.items():
+        for tsv in ses_dir.glob('*_scans.tsv'):
+            scans = pd.read_csv(tsv, sep='\t', dtype=str,
+                                keep_default_na=False)
+            keep = ~scans['filename'].isin(fnames)
+            if not keep.all():
+                scans[keep].to_csv(tsv, sep='\t', index=False)
+
+
+def _clean_directory(out_dir: Union[str, PathLike],
+                     n_jobs: int = None,
+                     dry_run: bool = False) -> pd.DataFrame:
     """
     Does some final post-processing on the converted data
 
     Includes merging T1w images that were, for some inexplicable reason, split
-    into two volumes
+    into two volumes, removing 2D images left over from multi-echo sequences
+    (and their entries in the sessions' scans files), and removing stray
+    temporary files generated by ``heudiconv``. Candidate files are identified
+    in a single pass over `out_dir` and then processed in parallel; every
+    modified image is written exactly once, atomically.
 
     Parameters
     ----------
     out_dir : str or pathlib.Path
         Path to output directory where BIDS-format PPMI dataset should be
         generated
+    n_jobs : int, optional
+        Number of files to process in parallel. If not specified, defaults to
+        the number of processors on the machine. Default: None
+    dry_run : bool, optional
+        Whether to only report what would be done without modifying any files.
+        Default: False
+
+    Returns
+    -------
+    report : pandas.DataFrame
+        Data frame with columns ['filename', 'action'] describing the
+        post-processing that was (or, if `dry_run`, would be) performed
     """
 
-    return out_dir
+    report = _find_cleanup(pathlib.Path(out_dir).resolve())
+    if dry_run:
+        return report
+
+    actions = dict(merge=_merge_3d_t1w, remove=_remove_file)
+    with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+        list(executor.map(lambda f, a: actions[a](f),
+                          report['filename'], report['action']))
+
+    removed = report.query('action == "remove"')['filename']
+    _drop_scans([fn for fn in removed if '.nii' in fn.name])
+
+    return report
 
 
 def _merge_3d_t1w(filename: Union[str, PathLike]) -> pathlib.Path:
     """
     Merges T1w images that have been split into two volumes
 
+    Volumes are concatenated along the third (slice) dimension. As image data
+    are stored in Fortran order this is simply a reshape of the data array
+    (which is read via its array proxy, memory-mapped whenever possible) so no
+    intermediate copies of the image are made. The merged image is written to
+    a temporary file before replacing `filename`.
+
     Parameters
     ----------
     filename : str or pathlib.Path
@@ -238,7 +696,8 @@ def _merge_3d_t1w(filename: Union[str, PathLike]) -> pathlib.Path:
     Returns
     -------
     filename : pathlib.Path
-        Path to merged T1w image
+        Path to merged T1w image. If `filename` did not need to be merged None
+        is returned instead
     """
 
     import numpy as np
@@ -248,13 +707,14 @@ def _merge_3d_t1w(filename: Union[str, PathLike]) -> pathlib.Path:
     if not (len(img.shape) == 4 and img.shape[-1] > 1):
         return
 
-    # split data along fourth dimension and then concatenate along third
-    imdata = img.get_data()
-    cat = [d.squeeze() for d in np.split(imdata, imdata.shape[-1], axis=-1)]
-    imdata = np.concatenate(cat, axis=-1)
+    # stacking volumes along third dimension == Fortran-order reshape
+    x, y, z, t = img.shape
+    imdata = np.reshape(np.asanyarray(img.dataobj), (x, y, z * t), order='F')
 
     new_img = img.__class__(imdata, img.affine, img.header)
-    nib.save(new_img, filename)
+    temp = filename.with_name('.tmp_' + filename.name)
+    nib.save(new_img, str(temp))
+    temp.replace(filename)
 
     return filename
 
@@ -264,7 +724,8 @@ def convert_ppmi(raw_dir: Union[str, PathLike],
                  ignore_bad: bool = True,
                  coerce_study_uids: bool = False,
                  overwrite: bool = False,
-                 heudiconv_tag: str = '0.5.4') -> pathlib.Path:
+                 heudiconv_tag: str = '0.5.4',
+                 incremental: bool = False) -> pathlib.Path:
     """
     Converts PPMI DICOMs in `raw_dir` to BIDS dataset at `out_dir`
 
@@ -292,6 +753,12 @@ def convert_ppmi(raw_dir: Union[str, PathLike],
         name clash in the specified `out_dir`. Default: False
     heudiconv_tag : str, optional
         Tag of heudiconv docker image to use for conversion. Default: 0.5.4
+    incremental : bool, optional
+        Whether to only convert scans in `raw_dir` that are not already present
+        in `out_dir`. Scans are matched to previous conversions by subject,
+        scan date, and DICOM series instance UID, so that new scans from an
+        existing session are assigned the correct session number. Default:
+        False
 
     Returns
     -------
@@ -346,6 +813,15 @@ def convert_ppmi(raw_dir: Union[str, PathLike],
 
     Once re-organization is done the resulting directory is processed with
     ``heudiconv`` and the converted BIDS dataset is stored in `out_dir`.
+
+    If `incremental` is set, only the scans that have not yet been converted
+    (as determined from the ledger of converted series stored in `out_dir`)
+    are processed. These are temporarily staged in a sub-directory of
+    `raw_dir`, converted into a separate BIDS dataset, and then added to
+    `out_dir` (renumbering runs of new scans from existing sessions so they
+    don't clash with the scans that were already converted). Finally, they are
+    moved into the {subject}/{session}/{scan} hierarchy, making it cheap to
+    update the BIDS dataset when new subjects or sessions are downloaded.
     """
 
     if not bids_avail:
@@ -360,8 +836,22 @@ def convert_ppmi(raw_dir: Union[str, PathLike],
     # generate this, if it doesn't already exist
     out_dir.mkdir(exist_ok=True)
 
+    # record what's been converted before heudiconv rewrites its own records
+    converted = _update_ledger(out_dir) if incremental else None
     subjects, coerce = _prepare_directory(raw_dir, ignore_bad=ignore_bad,
-                                          confirm_uids=coerce_study_uids)
+                                          confirm_uids=coerce_study_uids,
+                                          converted=converted)
+
+    # only convert staged sessions when we're doing things incrementally; they
+    # are converted into a fresh dataset so heudiconv doesn't reuse (or clash
+    # with) what it did for these sessions before
+    if incremental:
+        data_dir = raw_dir / 'incremental'
+        bids_dir = raw_dir / 'incremental_bids'
+        sessions = sorted(set(int(f.name) for f in data_dir.glob('*/*')))
+        bids_dir.mkdir(exist_ok=True)
+    else:
+        data_dir, bids_dir, sessions = raw_dir, out_dir, range(1, 6)
 
     # force consistent study UID if desired
     if coerce_study_uids:
@@ -373,7 +863,7 @@ def convert_ppmi(raw_dir: Union[str, PathLike],
     img = client.images.pull('nipy/heudiconv', tag=heudiconv_tag)
 
     # run heudiconv over all potential sessions
-    for session in range(1, 6):
+    for session in sessions:
         ses_logs = ''
         cli = client.containers.run(
             image=img,
@@ -389,8 +879,8 @@ def convert_ppmi(raw_dir: Union[str, PathLike],
                 '--overwrite' if overwrite else ''
             ]),
             detach=True,
-            volumes={str(raw_dir): {'bind': '/data', 'mode': 'ro'},
-                     str(out_dir): {'bind': '/out', 'mode': 'rw'},
+            volumes={str(data_dir): {'bind': '/data', 'mode': 'ro'},
+                     str(bids_dir): {'bind': '/out', 'mode': 'rw'},
                      HEURISTIC: {'bind': '/heuristic.py', 'mode': 'ro'}}
         )
 
@@ -403,6 +893,20 @@ def convert_ppmi(raw_dir: Union[str, PathLike],
         with log_file.open(mode='w', encoding='utf-8') as dest:
             dest.write(ses_logs)
 
-    out_dir = _clean_directory(out_dir)
+    # add newly converted scans to the dataset and move staged scans back into
+    # the standard directory structure
+    if incremental:
+        _merge_converted(bids_dir, out_dir)
+        _update_ledger(out_dir, bids_dir)
+        shutil.rmtree(str(bids_dir))
+        for scan in data_dir.glob('*/*/*'):
+            dest = raw_dir / scan.relative_to(data_dir)
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            scan.rename(dest)
+        shutil.rmtree(str(data_dir))
+    else:
+        _update_ledger(out_dir)
+
+    _clean_directory(out_dir)
 
     return out_dir
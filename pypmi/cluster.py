@@ -3,12 +3,105 @@
 Various functions for working with PPMI data
 """
 
+from typing import List, Union
+
 import numpy as np
 import pandas as pd
 import scipy.stats as sstats
 
+from .loaders import (load_behavior, load_biospecimen, load_datscan,
+                      load_demographics)
+
+
+# measures used in [CL1]_ grouped by domain and then by composite score
+FERESHTEHNEJAD_DOMAINS = {
+    'motor': [
+        ['updrs_ii', 'updrs_iii', 'pigd']
+    ],
+    'cognition': [
+        ['benton'],
+        ['symbol_digit'],
+        ['lns', 'semantic_fluency'],
+        ['hvlt_recall', 'hvlt_recognition', 'hvlt_retention']
+    ],
+    'rbd': [
+        ['rbd']
+    ],
+    'dysautonomia': [
+        ['scopa_aut']
+    ]
+}
+FERESHTEHNEJAD_MEASURES = [
+    m for dom in FERESHTEHNEJAD_DOMAINS.values() for group in dom
+    for m in group
+]
+
+
+def _fereshtehnejad_weights() -> np.ndarray:
+    """
+    Returns (M, 4) matrix averaging z-scored measures into domain scores
+
+    Domain scores are the average of composite scores in the domain, which
+    are themselves the average of (z-scored) measures in the composite
+    """
+
+    weights = np.zeros((len(FERESHTEHNEJAD_MEASURES),
+                        len(FERESHTEHNEJAD_DOMAINS)))
+    for n, dom in enumerate(FERESHTEHNEJAD_DOMAINS.values()):
+        for group in dom:
+            for m in group:
+                idx = FERESHTEHNEJAD_MEASURES.index(m)
+                weights[idx, n] = 1 / (len(dom) * len(group))
+
+    return weights
+
 
-def cluster_fereshtehnejad2017(data: pd.DataFrame) -> np.ndarray:
+def _fereshtehnejad_labels(zscores: np.ndarray) -> np.ndarray:
+    """
+    Assigns subtype labels based on z-scored measures `zscores`
+
+    Parameters
+    ----------
+    zscores : (..., M) numpy.ndarray
+        Z-scored measures, in the order of `FERESHTEHNEJAD_MEASURES`
+
+    Returns
+    -------
+    labels : (...) numpy.ndarray
+        Subtype labels
+    """
+
+    # motor, cognition, rbd, and dysautonomia domain scores; missing measures
+    # only propagate to their own domain (0 * NaN is still NaN)
+    weights = _fereshtehnejad_weights()
+    missing = np.isnan(zscores)
+    domains = np.where(missing, 0, zscores) @ weights
+    domains[(missing @ (weights > 0)) > 0] = np.nan
+
+    # load in raw behavioral scores and generate cutoffs
+    threshold = sstats.norm.ppf(0.75)
+    # reverse threshold for cog: higher cog measures = better
+    nonmotor = np.stack([domains[..., 1] > -threshold,
+                         domains[..., 2] < threshold,
+                         domains[..., 3] < threshold], axis=-1)
+    motor = domains[..., 0] < threshold
+
+    # mild: ALL scores are below 75th %ile
+    mild = np.logical_and(motor, nonmotor.all(axis=-1))
+
+    # severe: motor and 1+ non_motor > 75%ile or all non-motor > 75th %ile
+    severe = np.logical_or(
+        np.logical_and(~motor, ~nonmotor.all(axis=-1)),
+        ~nonmotor.any(axis=-1)
+    )
+
+    # intermediate: neither mild nor severe
+    return np.where(mild, 1, np.where(severe, 3, 2))
+
+
+def cluster_fereshtehnejad2017(data: Union[pd.DataFrame, np.ndarray],
+                               groupby: Union[str, List[str]] = None
+                               ) -> np.ndarray:
     """
     Clusters subjects in `data` according to criteria defined in [CL1]_
 
@@ -18,9 +111,16 @@ def cluster_fereshtehnejad2017(data: pd.DataFrame) -> np.ndarray:
 
     Parameters
     ----------
-    data : pd.DataFrame
+    data : pd.DataFrame or (..., S, M) numpy.ndarray
         Clinical-behavioral data for PPMI subjects as obtained from e.g.,
-        :func:`pypmi.load_behavior()`
+        :func:`pypmi.load_behavior()`. If an array is provided, the last two
+        dimensions must be subjects and measures (in the order given by
+        `pypmi.cluster.FERESHTEHNEJAD_MEASURES`); any leading dimensions
+        (e.g., bootstrap resamples) are labelled independently, in one pass
+    groupby : str or list, optional
+        Column(s) of `data` (e.g., 'visit') defining groups of subjects that
+        should be labelled independently, in one pass. Only used if `data` is
+        a data frame. Default: None
 
     Returns
     -------
@@ -36,68 +136,358 @@ def cluster_fereshtehnejad2017(data: pd.DataFrame) -> np.ndarray:
        and longitudinal progression. Brain, 140, 1959-1976.
     """
 
-    mot_measures = [
-        ['updrs_ii', 'updrs_iii', 'pigd']
-    ]
-    cog_measures = [
-        ['benton'],
-        ['symbol_digit'],
-        ['lns', 'semantic_fluency'],
-        ['hvlt_recall', 'hvlt_recognition', 'hvlt_retention']
-    ]
-    rbd_measures = [
-        ['rbd']
-    ]
-    dys_measures = [
-        ['scopa_aut']
-    ]
+    if isinstance(data, pd.DataFrame) and groupby is not None:
+        # z-score within groups; measures with any missing data in a group
+        # are missing for all subjects (as with scipy.stats.zscore)
+        values = data[FERESHTEHNEJAD_MEASURES].astype(float)
+        grouped = values.groupby([data[g] for g in np.atleast_1d(groupby)],
+                                 observed=True, sort=False)
+        missing = values.isna().groupby(grouped.ngroup()).transform('any')
+        zscores = ((values - grouped.transform('mean'))
+                   / grouped.transform('std')).mask(missing)
+        return _fereshtehnejad_labels(zscores.values)
 
-    def zavg(data, measures):
-        data = [sstats.zscore(data[m], ddof=1).mean(axis=1) for m in measures]
-        return np.mean(data, axis=0)
+    if isinstance(data, pd.DataFrame):
+        data = data[FERESHTEHNEJAD_MEASURES].values
 
-    # load in raw behavioral scores and generate cutoffs
-    threshold = sstats.norm.ppf(0.75)
-    nonmotor = [
-        # reverse threshold for cog: higher cog measures = better
-        zavg(data, cog_measures) > -threshold,
-        zavg(data, rbd_measures) < threshold,
-        zavg(data, dys_measures) < threshold
-    ]
-    motor = zavg(data, mot_measures) < threshold
+    # z-score over subjects (in-place, to avoid extra copies)
+    zscores = np.array(data, dtype=float)
+    zscores -= zscores.mean(axis=-2, keepdims=True)
+    zscores /= zscores.std(axis=-2, ddof=1, keepdims=True)
 
-    # mild: ALL scores are below 75th %ile
-    mild = np.all([motor] + nonmotor, axis=0)
+    return _fereshtehnejad_labels(zscores)
 
-    # severe: motor and 1+ non_motor > 75%ile or all non-motor > 75th %ile
-    severe = np.logical_or(
-        np.logical_and(~motor, np.any([~f for f in nonmotor], axis=0)),
-        np.all([~f for f in nonmotor], axis=0)
-    )
 
-    # intermediate: neither mild nor severe
-    intermediate = np.logical_not(np.logical_or(mild, severe))
+class FereshtehnejadSubtyper:
+    """
+    Subtypes subjects as in [CL1]_ relative to a fixed reference cohort
+
+    Unlike :func:`cluster_fereshtehnejad2017`, which z-scores measures against
+    whatever subjects are provided, measures are z-scored against the means
+    and standard deviations of a reference cohort (e.g., baseline PD
+    subjects) estimated once by :meth:`FereshtehnejadSubtyper.fit`. Labels of
+    subjects thus do not change as new subjects are added and new batches can
+    be labelled independently.
+
+    Attributes
+    ----------
+    mean_ : (M,) numpy.ndarray
+        Mean of measures in reference cohort
+    std_ : (M,) numpy.ndarray
+        Standard deviation of measures in reference cohort
+    """
+
+    def fit(self, data: Union[pd.DataFrame, np.ndarray]
+            ) -> 'FereshtehnejadSubtyper':
+        """
+        Estimates means and standard deviations of measures from `data`
+
+        Parameters
+        ----------
+        data : pd.DataFrame or (S, M) numpy.ndarray
+            Clinical-behavioral data for reference cohort as obtained from
+            e.g., :func:`pypmi.load_behavior()`. If an array is provided,
+            measures must be in the order given by
+            `pypmi.cluster.FERESHTEHNEJAD_MEASURES`. Missing values are ignored
+
+        Returns
+        -------
+        self
+        """
+
+        if isinstance(data, pd.DataFrame):
+            data = data[FERESHTEHNEJAD_MEASURES].values
+        data = np.asarray(data, dtype=float)
+
+        self.mean_ = np.nanmean(data, axis=0)
+        self.std_ = np.nanstd(data, axis=0, ddof=1)
+
+        return self
+
+    def transform(self, data: Union[pd.DataFrame, np.ndarray]) -> np.ndarray:
+        """
+        Assigns subtype labels to subjects in `data`
+
+        Parameters
+        ----------
+        data : pd.DataFrame or (..., M) numpy.ndarray
+            Clinical-behavioral data for PPMI subjects as obtained from e.g.,
+            :func:`pypmi.load_behavior()`. If an array is provided, measures
+            must be in the order given by
+            `pypmi.cluster.FERESHTEHNEJAD_MEASURES`
 
-    feresh_labels = np.sum([mild * 1, intermediate * 2, severe * 3], axis=0)
+        Returns
+        -------
+        labels : numpy.ndarray
+            Cluster labels for subjects in `data` where 1 indicates mild
+            motor-predominant, 2 indicates intermediate, and 3 indiciates
+            diffuse malignant subtype. Subjects missing any measure in a
+            domain are treated as above the 75th percentile in that domain
+        """
 
-    return feresh_labels
+        if not hasattr(self, 'mean_'):
+            raise ValueError('FereshtehnejadSubtyper has not been fitted. '
+                             'Call fit() with a reference cohort first.')
 
+        if isinstance(data, pd.DataFrame):
+            data = data[FERESHTEHNEJAD_MEASURES].values
 
-def cluster_faghri2018(path: str = None) -> pd.DataFrame:
+        zscores = np.array(data, dtype=float)
+        zscores -= self.mean_
+        zscores /= self.std_
+
+        return _fereshtehnejad_labels(zscores)
+
+    def fit_transform(self, data: Union[pd.DataFrame, np.ndarray]
+                      ) -> np.ndarray:
+        """
+        Fits reference cohort `data` and assigns subtype labels to it
+
+        Parameters
+        ----------
+        data : pd.DataFrame or (S, M) numpy.ndarray
+            Clinical-behavioral data for reference cohort
+
+        Returns
+        -------
+        labels : numpy.ndarray
+            Cluster labels for subjects in `data`
+        """
+
+        return self.fit(data).transform(data)
+
+
+def _faghri_features(path: str = None,
+                     diagnosis: List[str] = None) -> pd.DataFrame:
+    """
+    Assembles feature matrix for :func:`cluster_faghri2018`
+
+    Parameters
+    ----------
+    path : str, optional
+        Filepath to directory containing PPMI data files. Default: None
+    diagnosis : list, optional
+        Diagnoses of subjects to retain. Default: ['pd']
+
+    Returns
+    -------
+    features : pd.DataFrame
+        Numeric (float32) features indexed by participant and visit
+    """
+
+    if diagnosis is None:
+        diagnosis = ['pd']
+
+    key = ['participant', 'visit']
+
+    # visit-level measures, collapsing repeat assessments within a visit
+    visits = []
+    for frame in (load_behavior(path), load_biospecimen(path),
+                  load_datscan(path)):
+        frame = frame.set_index(key).select_dtypes('number')
+        if not frame.index.is_unique:
+            frame = frame.groupby(level=key, observed=True).mean()
+        visits.append(frame)
+
+    # participant-level measures, with categories expanded to indicators
+    demo = load_demographics(path).set_index('participant')
+    demo = demo[demo['diagnosis'].isin(diagnosis)]
+    demo = demo.drop(columns=['diagnosis', 'status', 'site'], errors='ignore')
+    demo = pd.get_dummies(demo.select_dtypes(exclude='datetime'))
+
+    features = pd.concat(visits, axis=1, join='outer')
+    features = features.join(demo, on='participant', how='inner')
+
+    return features.astype('float32')
+
+
+def _kmeans_plusplus(data: np.ndarray,
+                     n_clusters: int,
+                     rs: np.random.RandomState) -> np.ndarray:
+    """
+    Selects initial cluster centers from `data` via greedy k-means++
+
+    Of several candidates sampled for every center, the one that most reduces
+    the distances of `data` to their closest center is kept, which makes it
+    much less likely that two centers start within the same cluster
+    """
+
+    n_trials = 2 + int(np.log(n_clusters))
+
+    centers = data[[rs.randint(len(data))]]
+    dist = ((data - centers[0]) ** 2).sum(axis=1)
+    for _ in range(1, n_clusters):
+        idx = rs.choice(len(data), size=n_trials, p=dist / dist.sum())
+        trials = np.minimum(dist, ((data[:, None] - data[idx]) ** 2).sum(-1).T)
+        best = trials.sum(axis=1).argmin()
+        centers = np.vstack([centers, data[idx[best]]])
+        dist = trials[best]
+
+    return centers
+
+
+def _nearest(data: np.ndarray, centers: np.ndarray) -> np.ndarray:
+    """ Returns index of closest row of `centers` for each row of `data`
+    """
+
+    # ||x - c||^2 = ||x||^2 - 2x.c + ||c||^2; first term is constant per row
+    return np.argmin((centers ** 2).sum(axis=1) - 2 * data @ centers.T,
+                     axis=1)
+
+
+def _minibatch_kmeans(data: np.ndarray,
+                      n_clusters: int = 3,
+                      batch_size: int = 1024,
+                      max_iter: int = 100,
+                      tol: float = 1e-4,
+                      seed: int = None) -> np.ndarray:
+    """
+    Clusters rows of `data` with mini-batch k-means
+
+    Parameters
+    ----------
+    data : (N, F) numpy.ndarray
+        Data to be clustered
+    n_clusters : int, optional
+        Number of clusters. Default: 3
+    batch_size : int, optional
+        Number of rows used for each update of cluster centers, and number of
+        rows assigned to clusters at once. Default: 1024
+    max_iter : int, optional
+        Maximum number of mini-batches. Default: 100
+    tol : float, optional
+        Stop once no cluster center moves by more than this. Default: 1e-4
+    seed : int, optional
+        Random seed. Default: None
+
+    Returns
+    -------
+    labels : (N,) numpy.ndarray
+        Cluster labels (0-indexed) for rows of `data`
+    """
+
+    rs = np.random.RandomState(seed)
+    size = min(len(data), batch_size)
+
+    sample = data[rs.choice(len(data), min(len(data), 3 * size),
+                            replace=False)]
+    centers = _kmeans_plusplus(sample, n_clusters, rs).astype('float64')
+    counts = np.zeros(n_clusters)
+    sums = np.zeros_like(centers)
+
+    for _ in range(max_iter):
+        batch = data[rs.randint(len(data), size=size)]
+        labels = _nearest(batch, centers)
+
+        # move centers toward the mean of their assigned rows, with a learning
+        # rate that decays with the number of rows assigned to them so far
+        sums.fill(0)
+        np.add.at(sums, labels, batch)
+        n = np.bincount(labels, minlength=n_clusters)
+        counts += n
+        update = n > 0
+        shift = ((sums[update] - n[update, None] * centers[update])
+                 / counts[update, None])
+        centers[update] += shift
+        if np.abs(shift).max(initial=0) < tol:
+            break
+
+    # assign all rows, one batch at a time
+    labels = np.empty(len(data), dtype=int)
+    for start in range(0, len(data), batch_size):
+        stop = start + batch_size
+        labels[start:stop] = _nearest(data[start:stop], centers)
+
+    return labels
+
+
+def _faghri_cluster(features: np.ndarray,
+                    n_clusters: int = 3,
+                    n_components: int = 10,
+                    batch_size: int = 1024,
+                    seed: int = 1234) -> np.ndarray:
+    """
+    Reduces and clusters `features` as in :func:`cluster_faghri2018`
+
+    Parameters
+    ----------
+    features : (N, F) numpy.ndarray
+        Features, where missing values are NaN
+    n_clusters, n_components, batch_size, seed : int, optional
+        See :func:`cluster_faghri2018`
+
+    Returns
+    -------
+    labels : (N,) numpy.ndarray
+        Cluster labels (1-indexed) for rows of `features`
+    """
+
+    # z-score (in-place) and impute missing values with the mean
+    data = np.array(features, dtype='float32')
+    data -= np.nanmean(data, axis=0)
+    std = np.nanstd(data, axis=0, ddof=1)
+    data /= np.where(std > 0, std, 1)
+    data[np.isnan(data)] = 0
+
+    # principal components from the (F, F) covariance matrix, with signs fixed
+    # so the largest loading of each component is positive
+    evals, evecs = np.linalg.eigh(data.T @ data / (len(data) - 1))
+    evecs = evecs[:, ::-1][:, :min(n_components, data.shape[1])]
+    evecs *= np.sign(evecs[np.abs(evecs).argmax(axis=0),
+                           range(evecs.shape[1])])
+    scores = data @ evecs
+
+    labels = _minibatch_kmeans(scores, n_clusters=n_clusters,
+                               batch_size=batch_size, seed=seed)
+
+    # order clusters by their mean score on the first component
+    order = np.argsort(np.argsort(
+        [scores[labels == n, 0].mean() if np.any(labels == n) else np.inf
+         for n in range(n_clusters)]
+    ))
+
+    return order[labels] + 1
+
+
+def cluster_faghri2018(path: str = None,
+                       n_clusters: int = 3,
+                       n_components: int = 10,
+                       batch_size: int = 1024,
+                       seed: int = 1234) -> pd.DataFrame:
     """
     Generates cluster assignments for subjects as in [CL2]_
 
+    Behavioral, biospecimen, DaT scan, and demographic data for all visits of
+    PD subjects are joined into a single feature matrix, z-scored (with
+    missing values imputed as the mean), reduced to its first `n_components`
+    principal components, and clustered with mini-batch k-means. Since
+    clustering only ever operates on batches of `batch_size` visits it scales
+    to the full longitudinal cohort.
+
+    Note that [CL2]_ used non-negative matrix factorization and a Gaussian
+    mixture model; the scalable equivalents used here will not reproduce their
+    cluster assignments exactly.
+
     Parameters
     ----------
     path : str, optional
         Filepath to directory containing PPMI data files. If not specified this
         function will, in order, look (1) for an environmental variable
         $PPMI_PATH and (2) in the current directory. Default: None
+    n_clusters : int, optional
+        Number of clusters. Default: 3
+    n_components : int, optional
+        Number of principal components retained for clustering. Default: 10
+    batch_size : int, optional
+        Number of visits per mini-batch. Default: 1024
+    seed : int, optional
+        Random seed, for reproducible cluster assignments. Default: 1234
 
     Returns
     -------
-    labels : numpy.ndarray
-        Cluster labels for subjects
+    labels : pd.DataFrame
+        Cluster labels (1 to `n_clusters`, ordered by the first principal
+        component) for every visit of every PD subject
 
     References
     ----------
@@ -107,4 +497,13 @@ def cluster_faghri2018(path: str = None) -> pd.DataFrame:
        learning. bioRxiv, 338913.
     """
 
-    raise NotImplementedError
+    features = _faghri_features(path)
+    # drop features missing for most visits (e.g., rarely-assessed tests)
+    features = features.loc[:, features.notna().mean() >= 0.5]
+
+    labels = _faghri_cluster(features.values, n_clusters=n_clusters,
+                             n_components=n_components,
+                             batch_size=batch_size, seed=seed)
+    labels = pd.DataFrame(dict(cluster=labels), index=features.index)
+
+    return labels.reset_index()
@@ -186,6 +186,53 @@ T2W_PDT2_SERIES = [
 ]
 
 
+def _normalize(description):
+    """ Lower-cases and collapses whitespace in series `description`
+    """
+    return ' '.join(str(description).lower().split())
+
+
+def _make_lookup():
+    """
+    Compiles lists of series descriptions above into a single lookup table
+
+    Returns
+    -------
+    lookup : dict
+        Where keys are normalized series descriptions and values are scan types
+        (i.e., 't1w', 't2w', 'pd', 'pdt2', 'flair', 'bold', 'dti', or
+        't2w_pdt2' for series that are mixed T2w / PD-T2w)
+    """
+
+    lookup = {}
+    for key, series in [('t1w', T1W_SERIES),
+                        ('t2w', T2W_SERIES),
+                        ('pd', PD_SERIES),
+                        ('pdt2', PDT2_SERIES),
+                        ('flair', FLAIR_SERIES),
+                        ('bold', BOLD_SERIES),
+                        ('dti', DTI_SERIES),
+                        ('t2w_pdt2', T2W_PDT2_SERIES)]:
+        for description in series:
+            lookup.setdefault(_normalize(description), key)
+
+    return lookup
+
+
+def _t1w_acq(description):
+    """ Determines "acq" tag for T1w series `description`
+    """
+    if description in ['mprage_grappa', 'sag_mprage_grappa']:
+        return 't1w'
+    elif 'adni' in description:
+        return 't1w_adni'
+    return 't1w_grappa'
+
+
+SERIES_LOOKUP = _make_lookup()
+T1W_ACQ = {_normalize(f): _t1w_acq(_normalize(f)) for f in T1W_SERIES}
+
+
 def create_key(template, outtype=('nii.gz',), annotation_classes=None):
     if template is None or not template:
         raise ValueError('Template must be a valid format string')
@@ -216,38 +263,29 @@ def infotodict(seqinfo):
     bold = create_key('{bids_subject_session_dir}/func/{bids_subject_session_prefix}_task-rest_run-{item:02d}_bold')  # noqa
     dti = create_key('{bids_subject_session_dir}/dwi/{bids_subject_session_prefix}_run-{item:02d}_dwi')  # noqa
 
-    info = {t1w: [], t1w_grappa: [], t1w_adni: [],
-            t2w: [], pd: [], pdt2: [], flair: [], bold: [], dti: []}
-    revlookup = {}
+    keys = dict(t1w=t1w, t1w_grappa=t1w_grappa, t1w_adni=t1w_adni, t2w=t2w,
+                pd=pd, pdt2=pdt2, flair=flair, bold=bold, dti=dti)
+    info = {key: [] for key in keys.values()}
+    revlookup, unrecognized = {}, []
 
     for s in seqinfo:
-        revlookup[s.series_id] = s.series_description
-
-        # the straightforward scan series
-        if s.series_description in T1W_SERIES:
-            info[t1w].append(s.series_id)
-        elif s.series_description in T2W_SERIES:
-            info[t2w].append(s.series_id)
-        elif s.series_description in PD_SERIES:
-            info[pd].append(s.series_id)
-        elif s.series_description in PDT2_SERIES:
-            info[pdt2].append(s.series_id)
-        elif s.series_description in FLAIR_SERIES:
-            info[flair].append(s.series_id)
-        elif s.series_description in BOLD_SERIES:
-            info[bold].append(s.series_id)
-        elif s.series_description in DTI_SERIES:
-            info[dti].append(s.series_id)
+        description = _normalize(s.series_description)
+        scan = SERIES_LOOKUP.get(description)
+        revlookup[s.series_id] = description
+
         # the less straightforward (mixed) series
-        elif s.series_description in T2W_PDT2_SERIES:
-            if s.dim3 < 40:
-                info[t2w].append(s.series_id)
-            else:
-                info[pdt2].append(s.series_id)
-        # if we don't match _anything_ then we want to know!
+        if scan == 't2w_pdt2':
+            scan = 't2w' if s.dim3 < 40 else 'pdt2'
+
+        if scan is not None:
+            info[keys[scan]].append(s.series_id)
         else:
-            lgr.warning('Skipping unrecognized series description: {}'
-                        .format(s.series_description))
+            unrecognized.append(s.series_description)
+
+    # if we don't match _anything_ then we want to know!
+    if len(unrecognized) > 0:
+        lgr.warning('Skipping %d series with unrecognized series description: '
+                    '%s', len(unrecognized), ', '.join(sorted(unrecognized)))
 
     # if we have multiple t1w runs we want to add an "acq" tag to some of them
     if len(info[t1w]) > 1:
@@ -256,13 +294,7 @@ def infotodict(seqinfo):
         info[t1w] = []
 
         for series_id in all_t1w:
-            series_description = revlookup[series_id].lower()
-            if series_description in ['mprage_grappa', 'sag_mprage_grappa']:
-                info[t1w].append(series_id)
-            elif 'adni' in series_description:
-                info[t1w_adni].append(series_id)
-            else:
-                info[t1w_grappa].append(series_id)
+            info[keys[T1W_ACQ[revlookup[series_id]]]].append(series_id)
 
     return info
 
@@ -278,6 +310,7 @@ def custom_callable(*args):
     (cf. all the lists above with different series descriptions).
     """
 
+    from collections import defaultdict
     import glob
     import re
     import pydicom as dcm
@@ -331,12 +364,20 @@ def custom_callable(*args):
     # usually, at least two remaining files will exist
     # the main reason this happens with PPMI data is dual-echo sequences
     # look in the json files for EchoTime and generate a key based on that
-    echonums = [load_json(json).get('EchoTime') for (_, json) in bids_pairs]
-    if all([f is None for f in echonums]):
+    echotimes = [load_json(json).get('EchoTime') for (_, json) in bids_pairs]
+    if all([f is None for f in echotimes]):
         return
-    echonums = np.argsort(echonums) + 1
+    echonums = np.argsort(echotimes) + 1
+
+    # read the echo time from each dicom header (only!) once and group files
+    # by echo time so we don't have to re-read them for every output file
+    echo_dicoms = defaultdict(list)
+    for f in item_dicoms:
+        img = dcm.read_file(f, force=True, stop_before_pixels=True,
+                            specific_tags=['EchoTime'])
+        echo_dicoms[float(img.EchoTime) / 1000].append(f)
 
-    for echo, (nifti, json) in zip(echonums, bids_pairs):
+    for echo, echotime, (nifti, json) in zip(echonums, echotimes, bids_pairs):
         # create new prefix with echo specifier
         # this isn't *technically* BIDS compliant, yet, but we're making due...
         split = re.search(r'run-(\d+)_', prefix).end()
@@ -351,9 +392,8 @@ def custom_callable(*args):
         safe_movefile(json, scaninfo, overwrite=False)
 
         # embed metadata from relevant dicoms (i.e., with same echo number)
-        dicoms = [f for f in item_dicoms if
-                  isclose(float(dcm.read_file(f, force=True).EchoTime) / 1000,
-                          load_json(scaninfo).get('EchoTime'))]
+        dicoms = [f for te, files in echo_dicoms.items()
+                  if isclose(te, echotime) for f in files]
         prov_file = prefix + '_prov.ttl' if opts.with_prov else None
         embed_metadata_from_dicoms(opts.bids, dicoms,
                                    outname, new_prefix + '.json',
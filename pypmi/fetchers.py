@@ -20,6 +20,8 @@ with open(resource_filename('pypmi', 'data/studydata.json'), 'r') as src:
     _STUDYDATA = json.load(src)
 with open(resource_filename('pypmi', 'data/genetics.json'), 'r') as src:
     _GENETICS = json.load(src)
+# LONI IDA server handling authentication for data downloads
+_IDA_URL = 'https://ida.loni.usc.edu'
 
 
 def _get_download_params(url,
@@ -50,10 +52,10 @@ def _get_download_params(url,
     # supplied URL; currently only 'genetic' and 'study' are accepted...
     if 'genetic' in url:
         subPage = 'GENETIC_DATA'
-        study_url = "https://ida.loni.usc.edu/pages/access/geneticData.jsp"
+        study_url = _IDA_URL + '/pages/access/geneticData.jsp'
     elif 'study' in url:
         subPage = 'STUDY_DATA'
-        study_url = "https://ida.loni.usc.edu/pages/access/studyData.jsp"
+        study_url = _IDA_URL + '/pages/access/studyData.jsp'
     else:
         raise ValueError('Cannot parse provided URL {} to authenticate user '
                          'and password from PPMI database. Please make sure '
@@ -61,7 +63,7 @@ def _get_download_params(url,
 
     # make request to main login page; the returned content has the loginKey
     # embedded within so we have to search for and extract it
-    login_url = "https://ida.loni.usc.edu/login.jsp?project=PPMI&page=HOME"
+    login_url = _IDA_URL + '/login.jsp?project=PPMI&page=HOME'
     data = dict(userEmail=user, userPassword=password)
     params = dict(project='PPMI', page='HOME')
     with requests.post(login_url, data=data, params=params) as main:
@@ -0,0 +1,367 @@
+# -*- coding: utf-8 -*-
+"""
+Compact, PLINK-compatible storage for PPMI genotyping data
+"""
+
+import os
+from typing import List, Union
+
+import numpy as np
+import pandas as pd
+
+# magic bytes for SNP-major PLINK .bed files
+_BED_MAGIC = np.array([0x6c, 0x1b, 0x01], dtype='uint8')
+# PLINK 2-bit codes (00: hom. a0, 01: missing, 10: het., 11: hom. a1) to
+# count of a1 alleles (as in :func:`pandas_plink.read_plink`); -1 is missing
+_CODE_TO_GENO = np.array([0, -1, 1, 2], dtype='int8')
+_GENO_TO_CODE = np.array([0, 2, 3, 1], dtype='uint8')  # indexed by geno % 4
+# lookup table decoding every possible byte into four genotypes
+_DECODE = _CODE_TO_GENO[(np.arange(256)[:, None] >> np.arange(0, 8, 2)) & 3]
+# variant information kept from (and written to) PLINK .bim files, besides the
+# SNP name; used with PLINK's missing value codes when it is not known
+_VARIANT_COLS = ['chrom', 'cm', 'pos', 'a0', 'a1']
+_VARIANT_MISSING = dict(chrom='0', cm=0.0, pos=0, a0='0', a1='0')
+
+
+class GenotypeStore:
+    """
+    Genotypes stored 2-bit packed in the PLINK .bed (SNP-major) layout
+
+    Each genotype uses two bits (a quarter of a byte) so even PPMI-wide
+    genotyping panels can be kept in memory. When loaded with
+    :meth:`GenotypeStore.from_plink` the packed genotypes are memory-mapped
+    directly from the .bed file, so they are not read until they are needed
+    and can be shared (via the page cache) between processes.
+
+    Parameters
+    ----------
+    packed : (G, ceil(N / 4)) array_like
+        Packed genotypes (uint8) where `G` is SNPs and `N` is participants
+    participants : (N,) array_like
+        Participant IDs
+    snps : (G,) array_like
+        SNP names
+    variants : (G, 5) pandas.DataFrame, optional
+        Variant information for `snps` (in order) with columns 'chrom', 'cm',
+        'pos', 'a0', and 'a1', as in PLINK .bim files. Genotypes are counts of
+        the 'a1' allele. If not specified PLINK's missing value codes are used.
+        Default: None
+
+    Attributes
+    ----------
+    variants : (G, 5) pandas.DataFrame
+        Variant information, indexed by SNP name
+    """
+
+    def __init__(self, packed: np.ndarray,
+                 participants: List[str],
+                 snps: List[str],
+                 variants: pd.DataFrame = None):
+        self.packed = packed
+        self.participants = pd.Index(participants, name='participant')
+        self.snps = pd.Index(snps, name='snp')
+
+        nbytes = (len(self.participants) + 3) // 4
+        if self.packed.shape != (len(self.snps), nbytes):
+            raise ValueError('Shape of provided packed genotypes {} does not '
+                             'match number of SNPs ({}) and participants ({}).'
+                             .format(self.packed.shape, len(self.snps),
+                                     len(self.participants)))
+
+        if variants is None:
+            variants = pd.DataFrame(_VARIANT_MISSING, index=self.snps,
+                                    columns=_VARIANT_COLS)
+        elif len(variants) != len(self.snps):
+            raise ValueError('Number of provided variants ({}) does not match '
+                             'number of SNPs ({}).'
+                             .format(len(variants), len(self.snps)))
+        self.variants = variants[_VARIANT_COLS].set_axis(self.snps, axis=0)
+
+    def __repr__(self):
+        return '{}(participants={}, snps={})'.format(
+            self.__class__.__name__, *self.shape)
+
+    @property
+    def shape(self) -> tuple:
+        """ Number of participants and SNPs in store
+        """
+        return len(self.participants), len(self.snps)
+
+    @property
+    def nbytes(self) -> int:
+        """ Number of bytes used by packed genotypes
+        """
+        return self.packed.nbytes
+
+    @classmethod
+    def from_plink(cls, fname: str, mmap: bool = True) -> 'GenotypeStore':
+        """
+        Loads genotypes from PLINK fileset `fname`
+
+        Parameters
+        ----------
+        fname : str
+            Filepath to genotyping PLINK files (without extension)
+        mmap : bool, optional
+            Whether to memory-map the .bed file instead of reading it into
+            memory. Default: True
+
+        Returns
+        -------
+        store : GenotypeStore
+            Genotypes from `fname`, with participants identified by family ID
+            and SNPs by the SNP names in the .bim file
+        """
+
+        fam = pd.read_csv(fname + '.fam', sep=r'\s+', header=None,
+                          usecols=[0], dtype=str)[0]
+        bim = pd.read_csv(fname + '.bim', sep=r'\s+', header=None,
+                          names=['chrom', 'snp', 'cm', 'pos', 'a0', 'a1'],
+                          usecols=range(6), dtype=str)
+        bim = bim.astype(dict(cm=float, pos=int))
+
+        nbytes = (len(fam) + 3) // 4
+        magic = np.fromfile(fname + '.bed', dtype='uint8', count=3)
+        if not np.array_equal(magic, _BED_MAGIC):
+            raise ValueError('Provided file {}.bed is not a SNP-major PLINK '
+                             '.bed file.'.format(fname))
+        if mmap:
+            packed = np.memmap(fname + '.bed', dtype='uint8', mode='r',
+                               offset=3, shape=(len(bim), nbytes))
+        else:
+            packed = np.fromfile(fname + '.bed', dtype='uint8', offset=3)
+            packed = packed.reshape(len(bim), nbytes)
+
+        return cls(packed, fam.values, bim['snp'].values, bim)
+
+    @classmethod
+    def from_array(cls, geno: np.ndarray,
+                   participants: List[str],
+                   snps: List[str],
+                   variants: pd.DataFrame = None) -> 'GenotypeStore':
+        """
+        Packs genotypes in `geno`
+
+        Parameters
+        ----------
+        geno : (N, G) array_like
+            Genotypes (i.e., counts of the a1 allele) where `N` is participants
+            and `G` is SNPs. Missing values can be coded as NaN or -1
+        participants : (N,) array_like
+            Participant IDs
+        snps : (G,) array_like
+            SNP names
+        variants : (G, 5) pandas.DataFrame, optional
+            Variant information for `snps`; see :class:`GenotypeStore`.
+            Default: None
+
+        Returns
+        -------
+        store : GenotypeStore
+            Packed genotypes
+
+        Raises
+        ------
+        ValueError
+            If `geno` contains values other than 0, 1, 2, and missing values
+        """
+
+        return cls(_pack(np.asarray(geno).T), participants, snps, variants)
+
+    def subset(self, participants: List[str] = None,
+               snps: Union[List[str], slice] = None) -> 'GenotypeStore':
+        """
+        Selects `participants` and `snps` from store
+
+        Selecting only SNPs requires no decoding (and, for slices, no
+        copying); selecting participants requires the genotypes of the
+        selected SNPs to be re-packed
+
+        Parameters
+        ----------
+        participants : list, optional
+            Participant IDs to select. Default: all participants
+        snps : list or slice, optional
+            SNP names (or slice of SNP positions) to select. Default: all SNPs
+
+        Returns
+        -------
+        store : GenotypeStore
+            Selected genotypes
+        """
+
+        packed, snp_names, variants = self.packed, self.snps, self.variants
+        if snps is not None:
+            rows = snps if isinstance(snps, slice) else self._locate(snps)
+            packed, snp_names = packed[rows], snp_names[rows]
+            variants = variants.iloc[rows]
+        if participants is None:
+            return self.__class__(packed, self.participants, snp_names,
+                                  variants)
+
+        cols = self.participants.get_indexer(participants)
+        if np.any(cols < 0):
+            raise KeyError('Provided participants are not present in store: '
+                           '{}'.format(np.asarray(participants)[cols < 0]))
+        geno = _unpack(packed, len(self.participants))[:, cols]
+
+        return self.__class__(_pack(geno), self.participants[cols], snp_names,
+                              variants)
+
+    def to_numpy(self, snps: Union[List[str], slice] = None) -> np.ndarray:
+        """
+        Unpacks genotypes
+
+        Parameters
+        ----------
+        snps : list or slice, optional
+            SNP names (or slice of SNP positions) to unpack. Default: all SNPs
+
+        Returns
+        -------
+        geno : (N, G) numpy.ndarray
+            Genotypes as int8 array, where missing values are coded as -1. This
+            is a (Fortran-ordered) transposed view so that SNPs are contiguous
+        """
+
+        packed = self.packed
+        if snps is not None:
+            packed = packed[snps if isinstance(snps, slice)
+                            else self._locate(snps)]
+
+        return _unpack(packed, len(self.participants)).T
+
+    def to_pandas(self, snps: Union[List[str], slice] = None,
+                  compact: bool = False) -> pd.DataFrame:
+        """
+        Unpacks genotypes into data frame
+
+        Parameters
+        ----------
+        snps : list or slice, optional
+            SNP names (or slice of SNP positions) to unpack. Default: all SNPs
+        compact : bool, optional
+            Whether to return genotypes as int8 (with missing values coded as
+            -1) instead of float (with missing values coded as NaN). Default:
+            False
+
+        Returns
+        -------
+        data : (N, G) :obj:`pandas.DataFrame`
+            Wide-format genetics data where `N` is participants and `G` is SNPs
+        """
+
+        columns = self.snps
+        if snps is not None:
+            columns = columns[snps if isinstance(snps, slice)
+                              else self._locate(snps)]
+
+        data = pd.DataFrame(self.to_numpy(snps), index=self.participants,
+                            columns=columns)
+        if not compact:
+            data = data.where(data >= 0).astype(float)
+
+        return data
+
+    def to_plink(self, fname: str):
+        """
+        Saves genotypes to PLINK fileset `fname`
+
+        The .bim file holds the SNP names and :attr:`variants`. Only
+        participant IDs are stored in the .fam file; all other fields are set
+        to PLINK's missing value codes.
+
+        Parameters
+        ----------
+        fname : str
+            Filepath to genotyping PLINK files (without extension)
+        """
+
+        with open(fname + '.bed', 'wb') as dest:
+            dest.write(_BED_MAGIC.tobytes())
+            dest.write(np.ascontiguousarray(self.packed).tobytes())
+
+        fam = pd.DataFrame(dict(fid=self.participants, iid=self.participants,
+                                father=0, mother=0, gender=0, trait=-9))
+        fam.to_csv(fname + '.fam', sep=' ', header=False, index=False)
+        bim = self.variants.reset_index()
+        bim = bim[['chrom', 'snp', 'cm', 'pos', 'a0', 'a1']]
+        bim.to_csv(fname + '.bim', sep='\t', header=False, index=False)
+
+        # make sure variant index for fileset (if any) is regenerated
+        if os.path.isfile(fname + '.variants.pkl'):
+            os.remove(fname + '.variants.pkl')
+
+    def _locate(self, snps: List[str]) -> np.ndarray:
+        """ Returns positions of `snps` in store, raising KeyError if missing
+        """
+
+        rows = self.snps.get_indexer(snps)
+        if np.any(rows < 0):
+            raise KeyError('Provided SNPs are not present in store: {}'
+                           .format(np.asarray(snps)[rows < 0]))
+
+        return rows
+
+
+def _pack(geno: np.ndarray) -> np.ndarray:
+    """
+    Packs (G, N) genotypes `geno` into PLINK .bed layout
+
+    Parameters
+    ----------
+    geno : (G, N) array_like
+        Genotypes where `G` is SNPs and `N` is participants. Missing values can
+        be coded as NaN or -1
+
+    Returns
+    -------
+    packed : (G, ceil(N / 4)) numpy.ndarray
+        Packed genotypes
+
+    Raises
+    ------
+    ValueError
+        If `geno` contains values other than 0, 1, 2, and missing values
+    """
+
+    geno = np.asarray(geno)
+    if geno.dtype.kind == 'f':
+        geno = np.where(np.isnan(geno), -1, geno)
+    invalid = ~np.isin(geno, [-1, 0, 1, 2])
+    if np.any(invalid):
+        raise ValueError('Provided genotypes must be counts of the a1 allele '
+                         '(0, 1, or 2) or missing (NaN or -1). Found invalid '
+                         'values: {}'.format(np.unique(geno[invalid])))
+    codes = _GENO_TO_CODE[geno.astype('int8') % 4]
+
+    # pad participants to a multiple of four with missing values (code 01)
+    n_snps, n_part = codes.shape
+    pad = -n_part % 4
+    if pad:
+        codes = np.pad(codes, ((0, 0), (0, pad)), constant_values=1)
+    codes = codes.reshape(n_snps, -1, 4)
+
+    return (codes[..., 0] | codes[..., 1] << 2
+            | codes[..., 2] << 4 | codes[..., 3] << 6).astype('uint8')
+
+
+def _unpack(packed: np.ndarray, n_part: int) -> np.ndarray:
+    """
+    Unpacks PLINK .bed layout `packed` into (G, N) int8 genotypes
+
+    Parameters
+    ----------
+    packed : (G, ceil(N / 4)) array_like
+        Packed genotypes where `G` is SNPs and `N` is participants
+    n_part : int
+        Number of participants (`N`)
+
+    Returns
+    -------
+    geno : (G, N) numpy.ndarray
+        Genotypes as int8 array, where missing values are coded as -1
+    """
+
+    packed = np.asarray(packed)
+    return _DECODE[packed].reshape(len(packed), -1)[:, :n_part]
@@ -40,6 +40,10 @@ EXTRAS_REQUIRE = {
         'pydicom>=1.3.0',
     ],
     'tests': TESTS_REQUIRE,
+    'benchmarks': [
+        'pytest>=7',
+        'pytest-benchmark',
+    ],
 }
 
 EXTRAS_REQUIRE['all'] = list(
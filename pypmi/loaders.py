@@ -3,19 +3,22 @@
 Functions for loading data downloaded from the PPMI database
 """
 
+from concurrent.futures import ThreadPoolExecutor
+import contextlib
 from functools import reduce
 import itertools
 import os
-import re
-from typing import List
+from typing import Dict, List
 
 import numpy as np
 import pandas as pd
 
 from ._info import BEHAVIORAL_INFO, DEMOGRAPHIC_INFO, VISITS
-from .utils import _get_data_dir
+from .profiling import stage, staged
+from .utils import _get_data_file, _get_data_files
 
 
+@staged
 def load_biospecimen(path: str = None,
                      measures: List[str] = None) -> pd.DataFrame:
     """
@@ -50,12 +53,12 @@ def load_biospecimen(path: str = None,
                        TESTNAME='test', TESTVALUE='score')
     dtype = dict(PATNO=int, CLINICAL_EVENT=VISITS, TESTNAME=str, TESTVALUE=str)
 
-    # check for file and get data directory path
-    fname = 'Current_Biospecimen_Analysis_Results.csv'
-    path = os.path.join(_get_data_dir(path=path, fnames=[fname]), fname)
+    # check for file and get its path
+    fname = _get_data_file('Current_Biospecimen_Analysis_Results.csv',
+                           path=path)
 
     # load data, make scores numeric, and clean up test names (no spaces!)
-    data = pd.read_csv(path, dtype=dtype, usecols=rename_cols.keys())
+    data = _read_csv(fname, dtype=dtype, usecols=rename_cols.keys())
     data = data.rename(columns=rename_cols)
     data['score'] = pd.to_numeric(data['score'], errors='coerce')
     data['test'] = data['test'].apply(lambda x: x.replace(' ', '_').lower())
@@ -68,15 +71,18 @@ def load_biospecimen(path: str = None,
     data = data.query(f'test in {measures}')
 
     # convert to tidy dataframe
-    tidy = data.groupby(['participant', 'visit', 'test']) \
-               .agg({'score': np.nanmean}) \
-               .unstack(level='test') \
-               .get('score') \
-               .reset_index() \
-               .rename_axis(None, axis=1)
+    with stage('unstack') as st:
+        # only observed visits (`visit` is categorical); mean skips NaN
+        tidy = data.groupby(['participant', 'visit', 'test'], observed=True) \
+                   .agg({'score': 'mean'}) \
+                   .unstack(level='test') \
+                   .get('score') \
+                   .reset_index() \
+                   .rename_axis(None, axis=1)
+        st.record(tidy)
 
     # (try to) add visit date information
-    tidy = _add_dates(tidy, path=os.path.dirname(path),
+    tidy = _add_dates(tidy, path=path,
                       fnames=['Lumbar_Puncture_Sample_Collection.csv'])
 
     return tidy.sort_values(['participant', 'visit']).reset_index(drop=True)
@@ -103,15 +109,16 @@ def available_biospecimen(path: str = None) -> List[str]:
     pypmi.load_biospecimen
     """
 
-    # check for file and get data directory path
-    fname = 'Current_Biospecimen_Analysis_Results.csv'
-    path = os.path.join(_get_data_dir(path=path, fnames=[fname]), fname)
+    # check for file and get its path
+    fname = _get_data_file('Current_Biospecimen_Analysis_Results.csv',
+                           path=path)
 
-    data = pd.read_csv(path, usecols=['TESTNAME'])['TESTNAME'].unique()
+    data = pd.read_csv(fname, usecols=['TESTNAME'])['TESTNAME'].unique()
 
     return sorted(list(set([f.replace(' ', '_').lower() for f in data])))
 
 
+@staged
 def load_datscan(path: str = None,
                  measures: List[str] = None) -> pd.DataFrame:
     """
@@ -141,19 +148,18 @@ def load_datscan(path: str = None,
     rename_cols = dict(PATNO='participant', EVENT_ID='visit', SCAN_DATE='date')
     dtype = dict(PATNO=int, EVENT_ID=VISITS, SCAN_DATE=str)
 
-    # check for file and get data directory path
-    fname = 'DATScan_Analysis.csv'
-    path = os.path.join(_get_data_dir(path=path, fnames=[fname]), fname)
+    # check for file and get its path
+    fname = _get_data_file('DATScan_Analysis.csv', path=path)
 
     # load data and coerce into standard format
-    raw = pd.read_csv(path, dtype=dtype)
+    raw = _read_csv(fname, dtype=dtype)
     tidy = raw.rename(columns=rename_cols).dropna(subset=['visit'])
     tidy.columns = [f.lower() for f in tidy.columns]
 
     # keep only desired measures
     if measures is not None:
         if isinstance(measures, str) and measures == 'all':
-            measures = available_datscan(path=os.path.dirname(path))
+            measures = available_datscan(path=path)
         elif not isinstance(measures, list):
             measures = list(measures)
         for m in measures:
@@ -164,10 +170,11 @@ def load_datscan(path: str = None,
         tidy = tidy[['participant', 'visit'] + measures]
 
     if 'date' in tidy.columns:
-        tidy['date'] = pd.to_datetime(tidy['date'], format='%Y-%m-%d',
-                                      errors='coerce')
+        with stage('to_datetime'):
+            tidy['date'] = pd.to_datetime(tidy['date'], format='%Y-%m-%d',
+                                          errors='coerce')
     else:
-        tidy = _add_dates(tidy, path=os.path.dirname(path))
+        tidy = _add_dates(tidy, path=path)
 
     return tidy.sort_values(['participant', 'visit']).reset_index(drop=True)
 
@@ -193,12 +200,11 @@ def available_datscan(path: str = None) -> List[str]:
     pypmi.load_datscan
     """
 
-    # check for file and get data directory path
-    fname = 'DATScan_Analysis.csv'
-    path = os.path.join(_get_data_dir(path=path, fnames=[fname]), fname)
+    # check for file and get its path
+    fname = _get_data_file('DATScan_Analysis.csv', path=path)
 
     # only need first line!
-    with open(path, 'r') as src:
+    with open(fname, 'r') as src:
         data = src.readline().strip().replace('"', '').split(',')[2:]
 
     if 'SCAN_DATE' in data:
@@ -207,6 +213,7 @@ def available_datscan(path: str = None) -> List[str]:
     return sorted([f.lower() for f in data])
 
 
+@staged
 def load_behavior(path: str = None,
                   measures: List[str] = None) -> pd.DataFrame:
     """
@@ -250,13 +257,13 @@ def load_behavior(path: str = None,
     if len(beh_info) == 0:
         return pd.DataFrame(columns=['participant', 'visit', 'date'])
 
-    # check for files and get data directory path
+    # check for files and get their paths
     fnames = []
     for info in beh_info.values():
         fnames.extend(list(info.get('files', {}).keys()))
-    path = _get_data_dir(path=path, fnames=set(fnames))
+    files = _get_data_files(set(fnames), path=path)
 
-    df = pd.DataFrame()
+    frames = []
     # iterate through all keys in dictionary
     for key, info in beh_info.items():
         cextra = info.get('extra', ['PATNO', 'EVENT_ID', 'INFODT', 'PAG_NAME'])
@@ -267,22 +274,28 @@ def load_behavior(path: str = None,
         # go through relevant files and items for current key and grab scores
         for fname, items in info['files'].items():
             # read in file
-            data = pd.read_csv(os.path.join(path, fname))
+            data = _read_csv(files[fname])
             # iterate through items to be retrieved and apply operations
             for n, (it, ap, ope) in enumerate(zip(items, capply, copera)):
-                score = ope(data[it].applymap(ap), axis=1)
+                with stage('applymap', measure=key, file=fname) as st:
+                    score = ope(data[it].applymap(ap), axis=1)
+                    st.record(score)
                 temp_scores.append(data[cextra].join(pd.Series(score, name=n)))
 
         # merge temp score DataFrames
-        curr_df = reduce(lambda df1, df2: pd.merge(df1, df2, on=cextra),
-                         temp_scores)
+        with stage('merge', measure=key) as st:
+            curr_df = reduce(lambda df1, df2: pd.merge(df1, df2, on=cextra),
+                             temp_scores)
+            st.record(curr_df)
         # combine individual scores for key with joinfunc and add to extra info
         joinfunc = info.get('joinfunc', np.sum)
         score = pd.Series(joinfunc(curr_df.drop(cextra, axis=1), axis=1)
                           .astype('float'), name='score')
         curr_df = curr_df[cextra].astype('str').join(score).assign(test=key)
-        # append resultant DataFrame to df
-        df = df.append(curr_df, ignore_index=True, sort=True)
+        frames.append(curr_df)
+
+    # combine resultant DataFrames of all keys
+    df = pd.concat(frames, ignore_index=True, sort=True)
 
     # rename post-treatment UDPRS III scores so there's no collision
     # pivot_table would average between the two by default. we don't want that!
@@ -290,9 +303,11 @@ def load_behavior(path: str = None,
 
     # clean up column names and convert to tidy dataframe
     df = df.rename(columns=rename_cols)
-    tidy = pd.pivot_table(df, index=['participant', 'visit', 'date'],
-                          columns='test', values='score').reset_index()
-    tidy = tidy.rename_axis(None, axis=1)
+    with stage('pivot_table') as st:
+        tidy = pd.pivot_table(df, index=['participant', 'visit', 'date'],
+                              columns='test', values='score').reset_index()
+        tidy = tidy.rename_axis(None, axis=1)
+        st.record(tidy)
 
     # get adjusted MOCA scores (add 'education' variable)
     if 'moca' in tidy.columns:
@@ -303,8 +318,9 @@ def load_behavior(path: str = None,
     # coerce data types to desired format
     tidy['participant'] = tidy['participant'].astype(int)
     tidy['visit'] = tidy['visit'].astype(VISITS)
-    tidy['date'] = pd.to_datetime(tidy['date'], format='%m/%Y',
-                                  errors='coerce')
+    with stage('to_datetime'):
+        tidy['date'] = pd.to_datetime(tidy['date'], format='%m/%Y',
+                                      errors='coerce')
 
     return tidy.sort_values(['participant', 'visit']).reset_index(drop=True)
 
@@ -336,6 +352,7 @@ def available_behavior(path: str = None) -> List[str]:
     return measures
 
 
+@staged
 def load_demographics(path: str = None,
                       measures: List[str] = None) -> pd.DataFrame:
     """
@@ -375,11 +392,11 @@ def load_demographics(path: str = None,
     else:
         dem_info = DEMOGRAPHIC_INFO
 
-    # check for files and get data directory path
+    # check for files and get their paths
     fnames = []
     for info in dem_info.values():
         fnames.extend(list(info.get('files', {}).keys()))
-    path = _get_data_dir(path=path, fnames=set(fnames))
+    files = _get_data_files(set(fnames), path=path)
 
     # empty data frame to hold information
     tidy = pd.DataFrame([], columns=['PATNO'])
@@ -387,7 +404,7 @@ def load_demographics(path: str = None,
     # iterate through demographic info to wrangle
     for key, curr_key in dem_info.items():
         for n, (fname, items) in enumerate(curr_key['files'].items()):
-            data = pd.read_csv(os.path.join(path, fname), dtype=dtype)
+            data = _read_csv(files[fname], dtype=dtype)
             curr_score = data[items]
             for attr in [f for f in curr_key.keys() if f not in ['files']]:
                 if hasattr(curr_score, attr):
@@ -396,7 +413,9 @@ def load_demographics(path: str = None,
                                      **curr_key[attr].get('kwargs', {}))
             curr_score = pd.Series(curr_score, name=key)
             temp_scores = data[['PATNO']].join(curr_score)
-        tidy = pd.merge(tidy, temp_scores, on='PATNO', how='outer')
+        with stage('merge', measure=key) as st:
+            tidy = pd.merge(tidy, temp_scores, on='PATNO', how='outer')
+            st.record(tidy)
 
     # rename columns and remove duplicates (how are there duplicates???)
     tidy = (tidy.rename(columns=rename_cols)
@@ -429,6 +448,135 @@ def available_demographics(path: str = None) -> List[str]:
     return list(DEMOGRAPHIC_INFO.keys())
 
 
+@staged
+def load_all(path: str = None,
+             measures: Dict[str, List[str]] = None) -> pd.DataFrame:
+    """
+    Loads behavioral, biospecimen, DaT scan, and demographic data into one
+    wide dataframe
+
+    Files shared between data types (e.g., the files used to determine visit
+    dates) are only read once, and all data types are aligned on a shared,
+    integer-coded (participant, visit) index so that each column is only
+    copied once into the output
+
+    Parameters
+    ----------
+    path : str, optional
+        Filepath to directory containing PPMI data files. If not specified this
+        function will, in order, look (1) for an environmental variable
+        $PPMI_PATH and (2) in the current directory. Default: None
+    measures : dict, optional
+        Which data types to load and which measures to keep for each, where
+        keys are data types (i.e., 'behavior', 'biospecimen', 'datscan', and
+        'demographics') and values are lists of measures (or None to use the
+        defaults of the corresponding loader). If not specified all data types
+        are loaded with their default measures. Default: None
+
+    Returns
+    -------
+    data : :obj:`pandas.DataFrame`
+        Wide data frame with one row per participant and visit. Visit dates
+        from data types other than behavior are suffixed with the data type
+        (e.g., 'date_datscan'); demographics are repeated across visits. If
+        a data type has multiple entries for one visit only the first is kept
+
+    See Also
+    --------
+    pypmi.load_behavior, pypmi.load_biospecimen, pypmi.load_datscan,
+    pypmi.load_demographics
+    """
+
+    loaders = dict(behavior=load_behavior, biospecimen=load_biospecimen,
+                   datscan=load_datscan, demographics=load_demographics)
+    if measures is None:
+        measures = dict.fromkeys(loaders)
+    for dtype in measures:
+        if dtype not in loaders:
+            raise ValueError('Specified data type {} is not valid. Must be '
+                             'one of {}.'.format(dtype, list(loaders)))
+
+    with _shared_reads():
+        frames = {dtype: loaders[dtype](path=path, measures=meas)
+                  for dtype, meas in measures.items()}
+    demographics = frames.pop('demographics', None)
+
+    # shared (participant, visit) index; rows of each data type are mapped to
+    # their position in it once and every column is gathered in one take
+    key = ['participant', 'visit']
+    keys = pd.concat([frame[key] for frame in frames.values()])
+    index = pd.MultiIndex.from_frame(keys.drop_duplicates().sort_values(key))
+
+    data = dict(participant=index.get_level_values('participant'),
+                visit=index.get_level_values('visit'))
+    for dtype, frame in frames.items():
+        frame = frame.drop_duplicates(subset=key)
+        rows = np.full(len(index), -1)
+        rows[index.get_indexer(pd.MultiIndex.from_frame(frame[key]))] = \
+            np.arange(len(frame))
+        for col in frame.columns.drop(key):
+            name = col if col not in data else '{}_{}'.format(col, dtype)
+            data[name] = frame[col].array.take(rows, allow_fill=True)
+
+    if demographics is not None:
+        demographics = demographics.drop_duplicates(subset=['participant'])
+        rows = pd.Index(demographics['participant']) \
+                 .get_indexer(data['participant'])
+        for col in demographics.columns.drop('participant'):
+            name = col if col not in data else '{}_demographics'.format(col)
+            data[name] = demographics[col].array.take(rows, allow_fill=True)
+
+    return pd.DataFrame(data)
+
+
+# frames read by loaders while reads are shared (i.e., within `load_all()`)
+_SHARED_READS = None
+
+
+@contextlib.contextmanager
+def _shared_reads():
+    """ Shares files read by :func:`_read_csv` between loaders in context
+    """
+
+    global _SHARED_READS
+    _SHARED_READS = {}
+    try:
+        yield
+    finally:
+        _SHARED_READS = None
+
+
+def _read_csv(fname: str, **kwargs) -> pd.DataFrame:
+    """
+    Reads `fname` with :func:`pandas.read_csv`
+
+    Within :func:`_shared_reads` each file is only read once for a given set
+    of `kwargs`; the returned frame is then shared and must not be modified
+    in place
+    """
+
+    if _SHARED_READS is None:
+        return _parse_csv(fname, **kwargs)
+
+    key = (os.path.abspath(fname), repr(sorted(kwargs.items())))
+    if key not in _SHARED_READS:
+        _SHARED_READS[key] = _parse_csv(fname, **kwargs)
+
+    return _SHARED_READS[key]
+
+
+def _parse_csv(fname: str, **kwargs) -> pd.DataFrame:
+    """ Reads `fname` with :func:`pandas.read_csv` as profiled stage
+    """
+
+    with stage('read_csv', file=os.path.basename(fname)) as st:
+        data = pd.read_csv(fname, **kwargs)
+        st.record(data, fname)
+
+    return data
+
+
+@staged
 def _load_dates(path: str = None,
                 fnames: List[str] = None) -> pd.DataFrame:
     """
@@ -465,21 +613,22 @@ def _load_dates(path: str = None,
         'Socio-Economics.csv',
         'Vital_Signs.csv',
     ]
-    # add additional files as needed by datatype and then get data path
+    # add additional files as needed by datatype and then get their paths
     if fnames is not None:
         files = fnames + files
-    path = _get_data_dir(path=path, fnames=files)
+    files = _get_data_files(files, path=path)
 
     # load data and coerce into standard format
-    raw = [pd.read_csv(os.path.join(path, f),
-                       dtype=dtype,
-                       usecols=rename_cols.keys()) for f in files]
+    raw = [_read_csv(f, dtype=dtype, usecols=rename_cols.keys())
+           for f in files.values()]
     tidy = (pd.concat(raw).rename(columns=rename_cols)
                           .get(list(rename_cols.values()))
                           .dropna()
                           .drop_duplicates(subset=['participant', 'visit']))
-    tidy['date'] = pd.to_datetime(tidy['date'], format='%m/%Y',
-                                  errors='coerce')
+    with stage('to_datetime') as st:
+        tidy['date'] = pd.to_datetime(tidy['date'], format='%m/%Y',
+                                      errors='coerce')
+        st.record(tidy)
 
     return tidy.sort_values(['participant', 'visit']).reset_index(drop=True)
 
@@ -514,22 +663,228 @@ def _add_dates(df: pd.DataFrame,
     """
 
     try:
-        tidy = pd.merge(df, _load_dates(path=path, fnames=fnames),
-                        on=['participant', 'visit'], how='left')
+        dates = _load_dates(path=path, fnames=fnames)
+        with stage('merge_dates') as st:
+            tidy = pd.merge(df, dates, on=['participant', 'visit'],
+                            how='left')
+            st.record(tidy)
         # reorder columns so that 'participant', 'visit', and 'date' are first
         cols = ['participant', 'visit', 'date']
         tidy = tidy[cols + np.setdiff1d(tidy.columns, cols).tolist()]
     except FileNotFoundError:
-        pass
+        tidy = df
 
     return tidy
 
 
+def _load_variant_index(fname: str,
+                        bim: pd.DataFrame = None) -> pd.DataFrame:
+    """
+    Loads index mapping SNP rs# to variants in PLINK fileset `fname`
+
+    The index is generated once and cached to `{fname}.variants.pkl` (if the
+    directory is writeable); it is regenerated if the .bim file is modified
+
+    Parameters
+    ----------
+    fname : str
+        Filepath to genotyping PLINK files
+    bim : pandas.DataFrame, optional
+        Variant information for `fname`, as returned by
+        :func:`pandas_plink.read_plink`. Only used if the index needs to be
+        (re-)generated; if not provided it will be loaded. Default: None
+
+    Returns
+    -------
+    index : pandas.DataFrame
+        Index of variants in `fname` with rs# that is sorted by rs# and has
+        columns ['i', 'a0', 'a1', 'chrom', 'pos'], where 'i' is the row offset
+        of the variant in `fname`
+    """
+
+    cache = fname + '.variants.pkl'
+    bim_mtime = os.path.getmtime(fname + '.bim')
+    if os.path.isfile(cache) and os.path.getmtime(cache) >= bim_mtime:
+        return pd.read_pickle(cache)
+
+    if bim is None:
+        bim = pd.read_csv(fname + '.bim', sep=r'\s+', header=None,
+                          names=['chrom', 'snp', 'cm', 'pos', 'a0', 'a1'],
+                          dtype=dict(chrom=str, snp=str, a0=str, a1=str))
+        bim['i'] = np.arange(len(bim))
+
+    # extract rs# from (sometimes ugly) SNP names
+    rsid = bim['snp'].str.extract(r'[-_]*(rs[0-9]+)[-_]*', expand=False)
+    index = (bim.assign(rsid=rsid)
+                .dropna(subset=['rsid'])
+                .set_index('rsid')
+                .get(['i', 'a0', 'a1', 'chrom', 'pos'])
+                .sort_index(kind='stable'))
+
+    try:
+        index.to_pickle(cache)
+    except OSError:
+        pass
+
+    return index
+
+
+@staged
+def _select_variants(fname: str,
+                     bim: pd.DataFrame,
+                     gene_list: str) -> (pd.DataFrame, np.ndarray):
+    """
+    Finds variants in PLINK fileset `fname` that are listed in `gene_list`
+
+    Parameters
+    ----------
+    fname : str
+        Filepath to genotyping PLINK files
+    bim : pandas.DataFrame
+        Variant information for `fname`, as returned by
+        :func:`pandas_plink.read_plink`
+    gene_list : str
+        Path to pandas-compatible csv with at least 'snp', 'target', and
+        'odds_ratio' columns denoting rs#, target (effect) allele, and odds
+        ratio of target allele in population.
+
+    Returns
+    -------
+    variants : pandas.DataFrame
+        Selected variants, ordered as in `fname`, with the rs# of the SNPs as
+        'snp', the row offset of the variant in `fname` as 'i', and all
+        columns from `gene_list`
+    flip : numpy.ndarray
+        Boolean mask indicating which of `variants` are reverse-coded
+    """
+
+    # load gene list
+    gene_info = pd.read_csv(gene_list).drop_duplicates(subset=['snp'])
+
+    # look up where SNPs match desired gene list & subset data, using
+    # just the rs# of SNPs in place of the ugly bim.snp names
+    index = _load_variant_index(fname, bim)
+    snps = index.index.intersection(gene_info.snp.dropna())
+    variants = (index.loc[snps].rename_axis('snp')
+                               .reset_index()
+                               .sort_values('i'))
+
+    # get allele info for making sense of the data
+    variants = pd.merge(variants, gene_info, on='snp')
+
+    # if a0/a1 alleles don't match target, confusion ensues
+    # drop the non-matched ones and then grab SNPs that need to be reversed
+    variants = variants[(variants.a0 == variants.target)
+                        | (variants.a1 == variants.target)]
+    flip = (variants.a1 != variants.target).values
+
+    return variants.reset_index(drop=True), flip
+
+
+def _stream_genotypes(gen,
+                      chunksize: int = None,
+                      flip: np.ndarray = None) -> np.ndarray:
+    """
+    Computes dask genotype array `gen` block-by-block into an int8 array
+
+    Parameters
+    ----------
+    gen : (G, N) dask.array.Array
+        Genotype array where `G` is variants and `N` is participants, as
+        returned by :func:`pandas_plink.read_plink`
+    chunksize : int, optional
+        Number of variants to compute at once. If not specified the variant
+        chunks of `gen` are used. Default: None
+    flip : (G,) array_like, optional
+        Boolean mask indicating which variants are reverse-coded (i.e., where
+        genotypes should be recoded as 2 - genotype). Default: None
+
+    Returns
+    -------
+    geno : (N, G) numpy.ndarray
+        Genotypes as int8 array, where missing values are coded as -1. This is
+        a (Fortran-ordered) transposed view so that SNPs are contiguous
+    """
+
+    if chunksize is None:
+        stops = np.cumsum(gen.chunks[0])
+    else:
+        stops = np.arange(chunksize, gen.shape[0] + chunksize, chunksize)
+
+    geno = np.empty(gen.shape, dtype='int8')
+    start = 0
+    for stop in stops:
+        block = gen[start:stop].compute()
+        # flipping is done in-place; missing values (NaN) are left alone
+        if flip is not None:
+            rows = np.flatnonzero(flip[start:stop])
+            block[rows] = 2 - block[rows]
+        geno[start:stop] = np.where(np.isnan(block), -1, block)
+        start = stop
+
+    return geno.T
+
+
+def _collapse_duplicates(geno: np.ndarray,
+                         snps: np.ndarray) -> (np.ndarray, np.ndarray):
+    """
+    Combines columns of `geno` that represent the same SNP
+
+    Duplicated SNPs should have identical genotypes. If they do not, their
+    (non-missing) genotypes are averaged and rounded.
+
+    Parameters
+    ----------
+    geno : (N, G) numpy.ndarray
+        Genotypes as int8 array, where missing values are coded as -1
+    snps : (G,) array_like
+        SNP name for each column of `geno`
+
+    Returns
+    -------
+    geno : (N, S) numpy.ndarray
+        Genotypes for `S` unique SNPs. If there were no duplicates in `snps`
+        then this is the provided `geno`
+    snps : (S,) numpy.ndarray
+        Unique SNP names for each column of `geno`
+    """
+
+    snps = np.asarray(snps)
+    order = np.argsort(snps, kind='stable')
+    unique, starts, counts = np.unique(snps[order], return_index=True,
+                                       return_counts=True)
+    if len(unique) == len(snps):
+        return geno, snps
+
+    # keep first of every SNP and then reduce over the duplicated ones only
+    out = geno[:, order[starts]]
+    dups = np.flatnonzero(counts > 1)
+    cols = order[np.repeat(counts > 1, counts)]
+    bounds = np.cumsum(np.r_[0, counts[dups]])[:-1]
+
+    sub = geno[:, cols]
+    valid = sub >= 0
+    total = np.add.reduceat(np.where(valid, sub, 0), bounds, axis=1)
+    count = np.add.reduceat(valid, bounds, axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.rint(total / count)
+    out[:, dups] = np.where(count > 0, mean, -1)
+
+    return out, unique
+
+
+@staged
 def load_genetics(fname: str,
-                  gene_list: str = None) -> (pd.DataFrame, pd.DataFrame):
+                  gene_list: str = None,
+                  compact: bool = False,
+                  chunksize: int = None) -> (pd.DataFrame, pd.DataFrame):
     """
     Loads PPMI genotyping data stored at `fname`
 
+    Only the variants of interest are read from disk (block-by-block) and they
+    are stored as int8 while loading, so memory usage scales with the number
+    of SNPs selected by `gene_list` rather than the size of `fname`
+
     Parameters
     ----------
     fname : str
@@ -538,6 +893,12 @@ def load_genetics(fname: str,
         Path to pandas-compatible csv with at least 'snp', 'target', and
         'odds_ratio' columns denoting rs#, target (effect) allele, and odds
         ratio of target allele in population.
+    compact : bool, optional
+        Whether to return `data` as int8 (with missing values coded as -1)
+        instead of float (with missing values coded as NaN). Default: False
+    chunksize : int, optional
+        Number of variants to load into memory at once. If not specified the
+        chunks used by :func:`pandas_plink.read_plink` are used. Default: None
 
     Returns
     -------
@@ -555,58 +916,132 @@ def load_genetics(fname: str,
                           '`pandas_plink` module. Please install that and try '
                           'again.')
 
-    # make helper function for extracting SNP rs# from PLINK files
-    def extract(x):
-        try:
-            return re.findall('[-_]*(rs[0-9]+)[-_]*', x)[0]
-        except IndexError:
-            return None
-
     # load PLINK data
     bim, fam, gen = read_plink(fname, verbose=False)
-    participant_id = pd.Series(fam.fid.get_values(), name='participant')
+    participant_id = pd.Series(fam.fid.values, name='participant')
     cols = ['snp', 'a0', 'a1']
 
     if gene_list is not None:
-        # load gene list
-        gene_info = pd.read_csv(gene_list).drop_duplicates(subset=['snp'])
+        bim, flip = _select_variants(fname, bim, gene_list)
+        info = bim[['snp', 'odds_ratio', 'study']]
+        gen = gen[bim['i'].values]
+    else:
+        info = bim[cols]
+        flip = None
+
+    # load (and flip reverse-coded) SNPs and combine duplicated SNPs
+    with stage('stream_genotypes') as st:
+        geno = _stream_genotypes(gen, chunksize=chunksize, flip=flip)
+        st.record(geno)
+    with stage('collapse_duplicates'):
+        geno, snps = _collapse_duplicates(geno, bim.snp.values)
+
+    # retain only relevant SNPs in allele & participants with data, sorted
+    # (columns are looked up in all of `snps`, as `geno` is not subset)
+    snps = pd.Index(snps)
+    info = info[info.snp.isin(snps[geno.max(axis=0) >= 0])]
+    info = info.drop_duplicates(subset=['snp']).reset_index(drop=True)
+    keep = np.flatnonzero(geno.max(axis=1) >= 0)
+    keep = keep[np.argsort(participant_id.values[keep], kind='stable')]
+    cols = snps.get_indexer(info.snp)
+    data = pd.DataFrame(geno[np.ix_(keep, cols)],
+                        index=participant_id.iloc[keep], columns=info.snp)
 
-        # check where SNPs match desired gene list & subset data
-        inds = bim.snp.apply(extract).isin(gene_info.snp.dropna()).get_values()
-        bim, gen = bim[inds], gen[inds]
+    if not compact:
+        data = data.where(data >= 0).astype(float)
 
-        # clean up ugly bim.snp names with just rs# of SNPs
-        bim.loc[:, 'snp'] = bim.snp.map({f: extract(f) for f in bim.snp})
+    return data, info
 
-        # get allele info for making sense of the data
-        cols += ['target', 'odds_ratio', 'study']
-        info = pd.merge(bim, gene_info, on='snp')[cols]
 
-        # if a0/a1 alleles don't match target, confusion ensues
-        # drop the non-matched ones and then grab SNPs that need to be reversed
-        info = info[~((info.a0 != info.target) & (info.a1 != info.target))]
-        flip = info[info.a1 != info.target].snp
-        info = info[['snp', 'odds_ratio', 'study']]
-    else:
-        # placeholders so below code doesn't fail
-        info = bim[cols]
-        flip = pd.Series([], name='snp')
-
-    # make wide-format participant x SNP dataframe
-    data = pd.DataFrame(gen.compute().T, index=participant_id, columns=bim.snp)
-    # if multiple columns represent same snp, combine them
-    # THEY SHOULD ALL BE THE SAME -- if they aren't, that's bad...
-    data = (data.dropna(axis=1, how='all')
-                .groupby(level=0, axis=1)
-                .mean()
-                .dropna(axis=0, how='all')
-                .sort_index())
-    # flip reverse-coded SNPs
-    data[flip] = data[flip].applymap(lambda x: {0: 2, 1: 1, 2: 0}.get(x))
-
-    # retain only relevant SNPs in allele
-    info = info[info.snp.isin(data.columns)]
-    info = info.drop_duplicates(subset=['snp']).reset_index(drop=True)
+@staged
+def compute_grs(fname: str,
+                gene_list: str,
+                missing: str = 'mean',
+                chunksize: int = 1024,
+                n_jobs: int = None) -> pd.Series:
+    """
+    Computes genetic risk score for participants in PLINK fileset `fname`
+
+    The risk score is the sum of target (effect) allele dosages weighted by
+    the log odds ratio of each SNP in `gene_list`. Genotypes are read and
+    accumulated in blocks of `chunksize` SNPs (in parallel), so the full
+    participant x SNP genotype matrix is never held in memory.
+
+    Parameters
+    ----------
+    fname : str
+        Filepath to genotyping PLINK files
+    gene_list : str
+        Path to pandas-compatible csv with at least 'snp', 'target', and
+        'odds_ratio' columns denoting rs#, target (effect) allele, and odds
+        ratio of target allele in population.
+    missing : {'mean', 'zero', 'rescale'}, optional
+        How to handle missing genotypes. 'mean' imputes the mean dosage of the
+        SNP across participants, 'zero' treats them as zero dosage, and
+        'rescale' ignores them and scales the score of each participant by
+        the total number of SNPs over the number of non-missing SNPs.
+        Participants with no non-missing genotypes are assigned NaN.
+        Default: 'mean'
+    chunksize : int, optional
+        Number of SNPs to load into memory at once (per thread). Default: 1024
+    n_jobs : int, optional
+        Number of threads used to process blocks of SNPs in parallel. If not
+        specified, defaults to the number of processors on the machine.
+        Default: None
+
+    Returns
+    -------
+    grs : (N,) :obj:`pandas.Series`
+        Genetic risk score for `N` participants
+    """
+
+    try:
+        from pandas_plink import read_plink
+    except ImportError:
+        raise ImportError('Loading genotyping data requires installing the '
+                          '`pandas_plink` module. Please install that and try '
+                          'again.')
+
+    if missing not in ['mean', 'zero', 'rescale']:
+        raise ValueError('Provided value for `missing` {} is invalid. Must be '
+                         'one of [\'mean\', \'zero\', \'rescale\'].'
+                         .format(missing))
+
+    bim, fam, gen = read_plink(fname, verbose=False)
+
+    # duplicated SNPs should only count towards the score once
+    bim, flip = _select_variants(fname, bim, gene_list)
+    keep = ~bim.snp.duplicated().values
+    bim, flip = bim[keep], flip[keep]
+    rows = bim['i'].values
+    weights = np.log(bim['odds_ratio'].values.astype(float))
+
+    def accumulate(start):
+        stop = start + chunksize
+        block = gen[rows[start:stop]].compute(scheduler='synchronous')
+        block[flip[start:stop]] = 2 - block[flip[start:stop]]
+        observed = ~np.isnan(block)
+        if missing == 'mean':
+            with np.errstate(invalid='ignore'):
+                fill = np.nanmean(block, axis=1, keepdims=True)
+            block = np.where(observed, block, np.nan_to_num(fill))
+        else:
+            block = np.nan_to_num(block)
+        return weights[start:stop] @ block, observed.sum(axis=0)
+
+    score = np.zeros(gen.shape[1])
+    count = np.zeros(gen.shape[1], dtype=int)
+    with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+        for s, c in executor.map(accumulate, range(0, len(rows), chunksize)):
+            score += s
+            count += c
+
+    if missing == 'rescale':
+        with np.errstate(invalid='ignore', divide='ignore'):
+            score *= len(rows) / count
+    score[count == 0] = np.nan
+
+    grs = pd.Series(score, index=pd.Index(fam.fid.values, name='participant'),
+                    name='grs')
 
-    # return sorted data and info
-    return data[info.snp], info
+    return grs.sort_index()
@@ -0,0 +1,319 @@
+# -*- coding: utf-8 -*-
+"""
+Opt-in, stage-level profiling of the PPMI data loaders
+
+Loaders mark their stages (e.g., reading a file, scoring a measure, pivoting)
+with :func:`stage`. Nothing is recorded unless profiling is switched on,
+either for a block of code::
+
+    >>> from pypmi import profiling
+    >>> with profiling.profile(memory=True) as prof:  # doctest: +SKIP
+    ...     pypmi.load_behavior()
+    >>> prof.to_frame()  # doctest: +SKIP
+    >>> prof.to_chrome_trace('load_behavior.json')  # doctest: +SKIP
+
+or for a whole session by setting the environmental variable $PYPMI_PROFILE
+to the filepath where a Chrome trace (viewable in chrome://tracing or
+https://ui.perfetto.dev) should be written on exit. When profiling is off
+:func:`stage` returns a shared no-op context, so instrumented code pays one
+global lookup per stage.
+"""
+
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+# profile that events are currently recorded to (if any)
+_ACTIVE = None
+
+
+class _Disabled:
+    """ No-op stand-in for :class:`_Stage` used while profiling is off
+    """
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def update(self, **kwargs):
+        pass
+
+    def record(self, data, fname: str = None):
+        pass
+
+
+_DISABLED = _Disabled()
+
+
+class _Stage:
+    """ Times one stage and records it as an event of `profile` on exit
+    """
+
+    __slots__ = ('profile', 'name', 'args', 'start', 'peak', 'depth')
+
+    def __init__(self, profile: 'Profile', name: str, args: dict):
+        self.profile, self.name, self.args = profile, name, args
+        self.peak = 0
+
+    def __enter__(self):
+        self.profile._push(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        stop = time.perf_counter()
+        self.profile._pop(self, stop)
+        return False
+
+    def update(self, **kwargs):
+        """ Adds `kwargs` to the information recorded for this stage
+        """
+        self.args.update(kwargs)
+
+    def record(self, data, fname: str = None):
+        """
+        Records number of rows and bytes of `data` (and on-disk size of
+        `fname`, if provided) for this stage
+        """
+
+        if isinstance(data, pd.DataFrame):
+            nbytes = int(data.memory_usage(index=True).sum())
+        elif isinstance(data, pd.Series):
+            nbytes = int(data.memory_usage(index=True))
+        else:
+            nbytes = int(np.asarray(data).nbytes)
+        self.args.update(rows=len(data), bytes=nbytes)
+        if fname is not None:
+            self.args['file_bytes'] = os.path.getsize(fname)
+
+
+class Profile:
+    """
+    Records timing, size, and (optionally) peak memory of loader stages
+
+    Parameters
+    ----------
+    memory : bool, optional
+        Whether to trace peak memory of each stage with :mod:`tracemalloc`.
+        This slows down the profiled code considerably. Default: False
+    callback : callable, optional
+        Called with every event (see :attr:`events`) as soon as its stage
+        finishes, e.g. to forward events to a logger. Default: None
+
+    Attributes
+    ----------
+    events : list of dict
+        One event per finished stage with keys 'name', 'start' and 'duration'
+        (in seconds, relative to the start of profiling), 'thread', 'depth'
+        (of nesting within other stages), and 'args'. 'args' holds what the
+        stage was annotated with (e.g., 'measure' or 'file'), 'rows' and
+        'bytes' of the data it produced, and 'peak_mib' if `memory` is set
+    """
+
+    def __init__(self, memory: bool = False, callback: Callable = None):
+        self.memory = memory
+        self.callback = callback
+        self.events = []
+        self._origin = time.perf_counter()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._previous = None
+        self._tracing = False
+
+    def __repr__(self):
+        return '{}(events={})'.format(self.__class__.__name__,
+                                      len(self.events))
+
+    def __enter__(self):
+        global _ACTIVE
+        self._previous, _ACTIVE = _ACTIVE, self
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._tracing = True
+        return self
+
+    def __exit__(self, *exc):
+        global _ACTIVE
+        _ACTIVE, self._previous = self._previous, None
+        if self._tracing:
+            tracemalloc.stop()
+            self._tracing = False
+        return False
+
+    def _push(self, stage: _Stage):
+        stack = self._local.__dict__.setdefault('stack', [])
+        stage.depth = len(stack)
+        if self.memory:
+            # hand the peak so far to the enclosing stage before resetting it
+            if stack:
+                stack[-1].peak = max(stack[-1].peak,
+                                     tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        stack.append(stage)
+
+    def _pop(self, stage: _Stage, stop: float):
+        stack = self._local.stack
+        stack.pop()
+        if self.memory:
+            stage.peak = max(stage.peak, tracemalloc.get_traced_memory()[1])
+            stage.args['peak_mib'] = stage.peak / 2 ** 20
+            if stack:
+                stack[-1].peak = max(stack[-1].peak, stage.peak)
+
+        event = dict(name=stage.name,
+                     start=stage.start - self._origin,
+                     duration=stop - stage.start,
+                     thread=threading.get_ident(),
+                     depth=stage.depth,
+                     args=stage.args)
+        with self._lock:
+            self.events.append(event)
+        if self.callback is not None:
+            self.callback(event)
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Returns recorded events as data frame, one row per event
+
+        Returns
+        -------
+        events : :obj:`pandas.DataFrame`
+            Events with columns ['name', 'start', 'duration', 'thread',
+            'depth'] followed by one column per key of the event 'args',
+            ordered by start time
+        """
+
+        cols = ['name', 'start', 'duration', 'thread', 'depth']
+        if len(self.events) == 0:
+            return pd.DataFrame(columns=cols)
+        events = pd.DataFrame([{k: ev[k] for k in cols} for ev in self.events])
+        args = pd.DataFrame([ev['args'] for ev in self.events],
+                            index=events.index)
+
+        return (events.join(args.drop(columns=cols, errors='ignore'))
+                      .sort_values('start', kind='mergesort')
+                      .reset_index(drop=True))
+
+    def to_chrome_trace(self, fname: str = None) -> dict:
+        """
+        Converts recorded events to the Chrome trace event format
+
+        Parameters
+        ----------
+        fname : str, optional
+            If provided, trace is also written to this file as JSON.
+            Default: None
+
+        Returns
+        -------
+        trace : dict
+            Trace with one complete ('X') event per recorded event
+        """
+
+        pid = os.getpid()
+        trace = dict(displayTimeUnit='ms', traceEvents=[
+            dict(name=ev['name'], cat='pypmi', ph='X', pid=pid,
+                 tid=ev['thread'], ts=ev['start'] * 1e6,
+                 dur=ev['duration'] * 1e6,
+                 args={k: v if isinstance(v, (int, float, str)) else str(v)
+                       for k, v in ev['args'].items()})
+            for ev in self.events
+        ])
+
+        if fname is not None:
+            with open(fname, 'w') as dest:
+                json.dump(trace, dest)
+
+        return trace
+
+
+def profile(memory: bool = False, callback: Callable = None) -> Profile:
+    """
+    Returns context manager that profiles loader stages run within it
+
+    Parameters
+    ----------
+    memory : bool, optional
+        Whether to trace peak memory of each stage. Default: False
+    callback : callable, optional
+        Called with every event as soon as its stage finishes. Default: None
+
+    Returns
+    -------
+    prof : :class:`Profile`
+        Profile recording events while in context
+    """
+
+    return Profile(memory=memory, callback=callback)
+
+
+def stage(name: str, **args):
+    """
+    Marks stage `name` of a loader, annotated with `args`
+
+    If profiling is off this returns a shared no-op context
+
+    Parameters
+    ----------
+    name : str
+        Name of stage (e.g., 'read_csv')
+    **args
+        Information to record for stage (e.g., `measure='moca'`)
+
+    Returns
+    -------
+    stage : context manager
+        Context timing the stage; its `update()` and `record()` methods add
+        information to the recorded event
+    """
+
+    if _ACTIVE is None:
+        return _DISABLED
+
+    return _Stage(_ACTIVE, name, args)
+
+
+def staged(func: Callable) -> Callable:
+    """ Decorates `func` so that every call is marked as a stage
+    """
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if _ACTIVE is None:
+            return func(*args, **kwargs)
+        with _Stage(_ACTIVE, func.__name__, {}):
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+def _profile_from_env():
+    """ Profiles whole session if $PYPMI_PROFILE is set
+    """
+
+    fname = os.environ.get('PYPMI_PROFILE')
+    if not fname:
+        return
+    prof = Profile(memory=os.environ.get('PYPMI_PROFILE_MEMORY', '') == '1')
+    prof.__enter__()
+
+    def _write():
+        prof.__exit__(None, None, None)
+        prof.to_chrome_trace(fname)
+
+    atexit.register(_write)
+
+
+_profile_from_env()
@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+"""
+Participant-indexed storage of PPMI data for fast per-participant lookups
+"""
+
+from functools import reduce
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+from .loaders import (load_behavior, load_biospecimen, load_datscan,
+                      load_demographics)
+
+
+class ParticipantStore:
+    """
+    Longitudinal (visit-level) and participant-level PPMI data, indexed by
+    participant
+
+    Visit-level data are sorted by participant and visit once, on
+    construction, and the row offsets of each participant are recorded so
+    that retrieving the longitudinal record of a participant is a dictionary
+    lookup and a slice rather than a scan of the whole table.
+
+    Parameters
+    ----------
+    visits : pd.DataFrame
+        Visit-level data with 'participant' and 'visit' columns
+    participants : pd.DataFrame, optional
+        Participant-level data (e.g., demographics) with 'participant' column.
+        Default: None
+    """
+
+    def __init__(self, visits: pd.DataFrame,
+                 participants: pd.DataFrame = None):
+        key = ['participant', 'visit']
+        self.visits = visits.sort_values(key, kind='mergesort') \
+                            .set_index(key)
+        if participants is None:
+            participants = pd.DataFrame(columns=['participant'])
+        self.participants = participants.set_index('participant') \
+                                        .sort_index()
+
+        # row offsets (start, stop) of each participant in sorted visits
+        codes = self.visits.index.get_level_values('participant')
+        ids, start = np.unique(codes, return_index=True)
+        stop = np.append(start[1:], len(codes))
+        self._offsets = dict(zip(ids.tolist(), zip(start, stop)))
+
+    def __repr__(self):
+        return '{}(participants={}, visits={})'.format(
+            self.__class__.__name__, len(self), len(self.visits))
+
+    def __len__(self):
+        return len(set(self._offsets) | set(self.participants.index))
+
+    def __contains__(self, participant):
+        return (participant in self._offsets
+                or participant in self.participants.index)
+
+    def __getitem__(self, participant) -> pd.DataFrame:
+        return self.get(participant)
+
+    @classmethod
+    def from_frames(cls, frames: Dict[str, pd.DataFrame],
+                    participants: pd.DataFrame = None) -> 'ParticipantStore':
+        """
+        Combines visit-level `frames` into a store
+
+        Parameters
+        ----------
+        frames : dict
+            Visit-level data frames with 'participant' and 'visit' columns,
+            where keys are source names (e.g., 'behavior'). Columns other than
+            'participant' and 'visit' present in multiple frames (e.g., 'date')
+            are suffixed with the name of their source, except in the first
+            frame
+        participants : pd.DataFrame, optional
+            Participant-level data with 'participant' column. Default: None
+
+        Returns
+        -------
+        store : ParticipantStore
+        """
+
+        key = ['participant', 'visit']
+        seen, renamed = set(key), []
+        for name, frame in frames.items():
+            dupes = [c for c in frame.columns if c in seen and c not in key]
+            seen.update(frame.columns)
+            renamed.append(frame.rename(
+                columns={c: '{}_{}'.format(c, name) for c in dupes}))
+
+        visits = reduce(lambda df1, df2: pd.merge(df1, df2, on=key,
+                                                  how='outer'),
+                        renamed)
+
+        return cls(visits, participants)
+
+    @classmethod
+    def from_loaders(cls, path: str = None) -> 'ParticipantStore':
+        """
+        Loads behavioral, biospecimen, DaT scan, and demographic data
+
+        Parameters
+        ----------
+        path : str, optional
+            Filepath to directory containing PPMI data files. If not specified
+            this function will, in order, look (1) for an environmental
+            variable $PPMI_PATH and (2) in the current directory. Default: None
+
+        Returns
+        -------
+        store : ParticipantStore
+        """
+
+        frames = dict(behavior=load_behavior(path),
+                      biospecimen=load_biospecimen(path),
+                      datscan=load_datscan(path))
+
+        return cls.from_frames(frames, load_demographics(path))
+
+    def get(self, participant, visit: str = None) -> pd.DataFrame:
+        """
+        Returns longitudinal record of `participant`
+
+        Parameters
+        ----------
+        participant : int
+            Participant ID
+        visit : str, optional
+            Only return data for this visit. Default: None
+
+        Returns
+        -------
+        record : pd.DataFrame
+            Visit-level data of `participant` (indexed by visit) with
+            participant-level data broadcast across visits
+        """
+
+        if participant not in self:
+            raise KeyError('Participant {} is not present in store.'
+                           .format(participant))
+
+        start, stop = self._offsets.get(participant, (0, 0))
+        record = self.visits.iloc[start:stop].droplevel('participant')
+        if visit is not None:
+            record = record.loc[record.index == visit]
+        if participant in self.participants.index:
+            record = record.assign(**self.demographics(participant))
+
+        return record
+
+    def demographics(self, participant) -> pd.Series:
+        """
+        Returns participant-level data of `participant`
+
+        Parameters
+        ----------
+        participant : int
+            Participant ID
+
+        Returns
+        -------
+        info : pd.Series
+            Participant-level data
+        """
+
+        return self.participants.loc[participant]
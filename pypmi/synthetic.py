@@ -0,0 +1,568 @@
+# -*- coding: utf-8 -*-
+"""
+Functions for generating synthetic PPMI data for offline tests and benchmarks
+"""
+
+import functools
+import os
+import pathlib
+import struct
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from . import (_info, _info2021, _info2023, _thresholds, _thresholds2021,
+               genetics)
+
+# measure specifications (and matching thresholds) of every data release
+_RELEASES = [(_info, _thresholds), (_info2021, _thresholds2021),
+             (_info2023, _thresholds2021)]
+# visits generated for every participant (in order)
+_VISIT_SEQUENCE = ['SC', 'BL'] + ['V{:02d}'.format(n) for n in range(1, 21)]
+# participants are written to disk this many at a time
+_BLOCK = 10000
+
+# files loaded without a measure specification in `_info*.py`
+_EXTRA_FILES = {
+    'Current_Biospecimen_Analysis_Results.csv': [
+        'PATNO', 'CLINICAL_EVENT', 'TYPE', 'TESTNAME', 'TESTVALUE'
+    ],
+    'Current_Biospecimen_Analysis_Results_12Jul2023.csv': [
+        'PATNO', 'CLINICAL_EVENT', 'TYPE', 'TESTNAME', 'TESTVALUE'
+    ],
+    'SAA_Internal_20231102.csv': [
+        'PATNO', 'CLINICAL_EVENT', 'SAAMethod', 'FmaxRep1', 'FmaxRep2',
+        'FmaxRep3', 'QUALRep1'
+    ],
+    'Grey_Matter_Volume.csv': ['PATNO', 'CLINICAL_EVENT', 'greymatter'],
+    'DATScan_Analysis.csv': [
+        'PATNO', 'EVENT_ID', 'SCAN_DATE', 'CAUDATE_R', 'CAUDATE_L',
+        'PUTAMEN_R', 'PUTAMEN_L'
+    ],
+    'DaTScan_Analysis.csv': [
+        'PATNO', 'EVENT_ID', 'DATSCAN_DATE', 'CAUDATE_R', 'CAUDATE_L',
+        'PUTAMEN_R', 'PUTAMEN_L', 'ORIG_ENTRY', 'LAST_UPDATE', 'REC_ID'
+    ],
+    'DaTscan/inv_spect_sbr_sequestered_merge_20231026.csv': [
+        'PATNO', 'EVENT_ID', 'DATSCAN_DATE', 'CAUDATE_R', 'CAUDATE_L',
+        'PUTAMEN_R', 'PUTAMEN_L', 'ORIG_ENTRY', 'LAST_UPDATE', 'REC_ID'
+    ],
+    'DaTscan/inv_spect_vi_sequestered_merge_20231026.csv': [
+        'PATNO', 'EVENT_ID', 'DATSCAN_VISINTRP'
+    ],
+    'Inclusion_Exclusion.csv': ['PATNO', 'EVENT_ID', 'INFODT'],
+    'Signature_Form.csv': ['PATNO', 'EVENT_ID', 'INFODT'],
+    'Lumbar_Puncture.csv': ['PATNO', 'EVENT_ID', 'INFODT'],
+    'Lumbar_Puncture_Sample_Collection.csv': ['PATNO', 'EVENT_ID', 'INFODT'],
+}
+
+# columns that repeat the visit they belong to once for each of their values
+# (the first value is always present, the others only for some visits)
+_REPEATED = {
+    'PAG_NAME': ['NUPDRS3', 'NUPDRS3A', 'NUPDR3OF', 'NUPDR3ON'],
+    'TESTNAME': ['ABeta 1-42', 'CSF Alpha-synuclein', 'pTau', 'tTau', 'GFAP',
+                 'NfL'],
+}
+# columns with string values
+_CHOICES = {
+    'PDSTATE': ['OFF', 'ON'],
+    'TYPE': ['Cerebrospinal Fluid', 'Plasma'],
+    'SAAMethod': ['Amprion-Alpha-synuclein-SAA'],
+    'QUALRep1': ['Negative', 'Positive'],
+    'ENROLL_STATUS': ['Enrolled', 'Withdrew', 'Complete'],
+    'DIAG1': ['PD', 'DLB', 'MSA'],
+    'DIAG1VIS': ['V04', 'V06', 'V08', 'V10'],
+}
+# (low, high) bounds of numeric columns not covered by thresholds
+_RANGES = {
+    'EDUCYRS': (8, 20),
+    'CNO': (1, 150),
+    'GENDER': (0, 2),
+    'HANDED': (1, 3),
+    'DATSCAN_VISINTRP': (0, 1),
+    'PHENOCNV': (0, 1),
+    'PDTRTMNT': (0, 1),
+}
+# (low, high) bounds of continuous columns
+_CONTINUOUS = {
+    'TESTVALUE': (0.0, 2000.0),
+    'FmaxRep1': (0.0, 300.0),
+    'FmaxRep2': (0.0, 300.0),
+    'FmaxRep3': (0.0, 300.0),
+    'greymatter': (400.0, 800.0),
+    'CAUDATE_R': (0.5, 4.0),
+    'CAUDATE_L': (0.5, 4.0),
+    'PUTAMEN_R': (0.2, 3.0),
+    'PUTAMEN_L': (0.2, 3.0),
+}
+# date columns formatted differently from the usual MM/YYYY
+_DATE_FORMATS = {'SCAN_DATE': '%Y-%m-%d'}
+_VISIT_COLUMNS = ['EVENT_ID', 'CLINICAL_EVENT']
+_VISIT_DATES = ['INFODT', 'SCAN_DATE', 'DATSCAN_DATE', 'ORIG_ENTRY',
+                'LAST_UPDATE']
+
+
+def _flatten(items) -> List[str]:
+    """ Flattens (nested lists of) column names in `items`
+    """
+
+    if isinstance(items, str):
+        return [items]
+    return [i for item in items for i in _flatten(item)]
+
+
+@functools.lru_cache(maxsize=None)
+def _compile_schema() -> Tuple[dict, dict, dict, dict]:
+    """
+    Compiles the columns of every file referenced in `_info*.py`
+
+    Returns
+    -------
+    visits, participants : dict
+        Mapping of visit-level and participant-level files to their columns
+    bounds : dict
+        Mapping of item column name to (low, high) bounds
+    categories : dict
+        Mapping of column name to allowed (raw) values
+    """
+
+    visits, participants, bounds, categories = {}, {}, {}, {}
+    for info, thresh in _RELEASES:
+        for key, spec in info.BEHAVIORAL_INFO.items():
+            limits = thresh.BEHAVIORAL_INFO.get(key, {})
+            for fname, items in spec['files'].items():
+                items = _flatten(items)
+                cols = visits.setdefault(fname, [])
+                cols.extend(c for c in items if c not in cols)
+                # scale items so that summed measures stay within thresholds
+                high = int(max(limits.get('max', 4 * len(items))
+                               // max(len(items), 1), 1))
+                item_range = limits.get('item_range', {})
+                for item in items:
+                    if isinstance(item_range, dict):
+                        declared = item_range.get(item)
+                    else:
+                        declared = item_range
+                    if declared is not None:
+                        bounds[item] = tuple(declared)
+                    elif item not in bounds or bounds[item][1] > high:
+                        bounds[item] = (0, high)
+
+        for name in ('MEDICATION_INFO', 'DEMOGRAPHIC_INFO', 'PRODROMAL_INFO',
+                     'PRODROMAL_BERG2015', 'GENOTYPES_INFO'):
+            for spec in getattr(info, name, {}).values():
+                replace = spec.get('replace', {}).get('input', {})
+                for fname, items in spec['files'].items():
+                    items = _flatten(items)
+                    level = visits if fname in visits else participants
+                    cols = level.setdefault(fname, [])
+                    cols.extend(c for c in items if c not in cols)
+                    if len(replace) > 0 and len(items) == 1:
+                        categories[items[0]] = [k for k in replace
+                                                if not pd.isna(k)]
+
+    # participant-level files that are visit-level for other releases
+    for fname in [f for f in participants if f in visits]:
+        cols = participants.pop(fname)
+        visits[fname].extend(c for c in cols if c not in visits[fname])
+    for fname, cols in _EXTRA_FILES.items():
+        visits[fname] = cols + [c for c in visits.get(fname, [])
+                                if c not in cols]
+
+    return visits, participants, bounds, categories
+
+
+def _dates(rs: np.random.RandomState, n: int, start: str,
+           stop: str) -> pd.DatetimeIndex:
+    """ Returns `n` random month starts between `start` and `stop`
+    """
+
+    months = pd.period_range(start, stop, freq='M')
+    return months[rs.randint(0, len(months), size=n)].to_timestamp()
+
+
+def _strftime(dates: np.ndarray, fmt: str) -> np.ndarray:
+    """ Formats `dates`, formatting each unique date only once
+    """
+
+    unique, inverse = np.unique(dates, return_inverse=True)
+    return pd.DatetimeIndex(unique).strftime(fmt).values[inverse]
+
+
+def _make_column(col: str, rows: pd.DataFrame, rs: np.random.RandomState,
+                 missing: float = 0.0) -> np.ndarray:
+    """
+    Generates values of `col` for `rows`
+
+    Parameters
+    ----------
+    col : str
+        Column name (as in the PPMI data files)
+    rows : pandas.DataFrame
+        Rows of file being generated, with columns 'participant', 'visit',
+        'date', and 'occurrence' (i.e., the position of the row among rows of
+        the same visit)
+    rs : numpy.random.RandomState
+        Random state
+    missing : float, optional
+        Proportion of numeric values set to missing. Default: 0.0
+
+    Returns
+    -------
+    values : numpy.ndarray
+        Generated values
+    """
+
+    _, _, bounds, categories = _compile_schema()
+    n = len(rows)
+
+    if col.upper() == 'PATNO':
+        return rows['participant'].values
+    elif col in _VISIT_COLUMNS:
+        return rows['visit'].values
+    elif col in _VISIT_DATES:
+        fmt = _DATE_FORMATS.get(col, '%m/%Y')
+        return _strftime(rows['date'].values, fmt)
+    elif col == 'REC_ID':
+        return np.arange(n)
+    elif col in _REPEATED:
+        return np.asarray(_REPEATED[col])[rows['occurrence'].values]
+    elif col in _CHOICES or col in categories:
+        return rs.choice(_CHOICES.get(col, categories.get(col)), size=n)
+    elif (col.endswith('DT') or col.endswith('DATE')) and col not in bounds:
+        # scored items may be named like dates (e.g., MoCA's MCADATE)
+        years = ('1930', '1970') if col == 'BIRTHDT' else ('2010', '2023')
+        return _strftime(_dates(rs, n, *years).values, '%m/%Y')
+
+    if col in _CONTINUOUS:
+        low, high = _CONTINUOUS[col]
+        values = rs.uniform(low, high, size=n)
+    else:
+        low, high = _RANGES.get(col, bounds.get(col, (0, 1)))
+        values = rs.randint(low, high + 1, size=n).astype(float)
+    if missing > 0:
+        values[rs.rand(n) < missing] = np.nan
+
+    return values
+
+
+def _make_rows(participants: np.ndarray, counts: np.ndarray,
+               enroll: np.ndarray, rs: np.random.RandomState,
+               repeats: int = 1, repeat_rate: float = 0.3) -> pd.DataFrame:
+    """
+    Generates visit-level rows of `participants`
+
+    Participants have `counts` visits, every six months starting from their
+    `enroll` (datetime64[M]) date; with `repeats` > 1 some visits have up to
+    `repeats` rows
+
+    Returns
+    -------
+    rows : pandas.DataFrame
+        Data frame with columns 'participant', 'visit', 'date', and
+        'occurrence'
+    """
+
+    counts = np.broadcast_to(counts, len(participants))
+    participant = np.repeat(participants, counts)
+    number = np.arange(len(participant)) - np.repeat(np.cumsum(counts)
+                                                     - counts, counts)
+    date = np.repeat(enroll, counts) + 6 * number
+    rows = pd.DataFrame(dict(
+        participant=participant,
+        visit=np.asarray(_VISIT_SEQUENCE)[number],
+        date=date.astype('datetime64[ns]'),
+        occurrence=0
+    ))
+
+    if repeats > 1:
+        extra = [rows[rs.rand(len(rows)) < repeat_rate].assign(occurrence=n)
+                 for n in range(1, repeats)]
+        rows = pd.concat([rows] + extra, ignore_index=True)
+        rows = rows.sort_values(['participant', 'date', 'occurrence'],
+                                kind='mergesort').reset_index(drop=True)
+
+    return rows
+
+
+def make_studydata(path: str,
+                   n_participants: int = 1000,
+                   n_visits: int = 10,
+                   missing: float = 0.05,
+                   seed: int = None) -> List[str]:
+    """
+    Generates synthetic PPMI study data files in `path`
+
+    A CSV file with the expected columns is generated for every file
+    referenced by the measure specifications of all data releases (i.e.,
+    `pypmi._info*`), as well as the biospecimen, DaT scan, and visit date files
+    used by the loaders, so that all loaders can be run offline. Values are
+    random (but within the thresholds of their measures, where specified) and
+    carry no information.
+
+    Files are written in blocks of participants, so memory usage does not grow
+    with `n_participants`; generating data for many times the size of the real
+    PPMI cohort (about 4,000 participants) is only limited by disk space.
+
+    Parameters
+    ----------
+    path : str
+        Filepath to directory where data files should be written
+    n_participants : int, optional
+        Number of participants. Default: 1000
+    n_visits : int, optional
+        Maximum number of visits per participant; every participant has a
+        random number of visits between one and `n_visits`. Must be no more
+        than 22. Default: 10
+    missing : float, optional
+        Proportion of missing values in numeric columns. Default: 0.05
+    seed : int, optional
+        Random seed for reproducible data. Default: None
+
+    Returns
+    -------
+    fnames : list
+        Filepaths to generated data files
+    """
+
+    if n_visits < 1 or n_visits > len(_VISIT_SEQUENCE):
+        raise ValueError('Provided n_visits {} is not valid. Must be between '
+                         '1 and {}.'.format(n_visits, len(_VISIT_SEQUENCE)))
+
+    rs = np.random.RandomState(seed)
+    visits, participants, _, _ = _compile_schema()
+    ids = 3000 + np.arange(n_participants)
+    # visits and enrollment dates are shared by all files
+    counts = rs.randint(1, n_visits + 1, size=n_participants)
+    enroll = _dates(rs, n_participants, '2010', '2020').values \
+        .astype('datetime64[M]')
+
+    fnames = []
+    for fname, cols in list(visits.items()) + list(participants.items()):
+        repeats = max([len(_REPEATED[c]) for c in cols if c in _REPEATED],
+                      default=1)
+        # lower-case identifiers for files with lower-case columns
+        if fname in _EXTRA_FILES:
+            keys = []
+        elif all(c.islower() for c in cols):
+            keys = ['patno']
+        elif fname in participants:
+            keys = ['PATNO']
+        else:
+            keys = [c for c in ('PATNO', 'EVENT_ID', 'PAG_NAME', 'INFODT')
+                    if c not in cols]
+        cols = keys + [c for c in cols if c not in keys]
+        # page name of files without repeated visits
+        page = os.path.basename(fname).split('.')[0].replace('_', '')
+
+        out = os.path.join(path, fname)
+        os.makedirs(os.path.dirname(out), exist_ok=True)
+        for start in range(0, n_participants, _BLOCK):
+            block = slice(start, start + _BLOCK)
+            if fname in participants:
+                rows = _make_rows(ids[block], 1, enroll[block], rs)
+            else:
+                rows = _make_rows(ids[block], counts[block], enroll[block],
+                                  rs, repeats=repeats)
+            data = pd.DataFrame({c: _make_column(c, rows, rs, missing=missing)
+                                 for c in cols}, columns=cols)
+            if 'PAG_NAME' in keys:
+                data['PAG_NAME'] = page.upper()[:8]
+            data.to_csv(out, index=False, header=start == 0,
+                        mode='w' if start == 0 else 'a')
+        fnames.append(out)
+
+    return fnames
+
+
+def make_genetics(fname: str,
+                  n_participants: int = 1000,
+                  n_snps: int = 10000,
+                  n_risk: int = 90,
+                  missing: float = 0.01,
+                  seed: int = None) -> Tuple[str, str]:
+    """
+    Generates synthetic PPMI genotyping data as PLINK fileset `fname`
+
+    Participants are identified as in :func:`make_studydata`. SNPs are named
+    with their rs# (some with the prefixes / suffixes found in the PPMI data)
+    and a gene list with `n_risk` of them is generated alongside the fileset.
+
+    Parameters
+    ----------
+    fname : str
+        Filepath to genotyping PLINK files (without extension)
+    n_participants : int, optional
+        Number of participants. Default: 1000
+    n_snps : int, optional
+        Number of SNPs. Default: 10000
+    n_risk : int, optional
+        Number of SNPs in gene list. Default: 90
+    missing : float, optional
+        Proportion of missing genotypes. Default: 0.01
+    seed : int, optional
+        Random seed for reproducible data. Default: None
+
+    Returns
+    -------
+    fname : str
+        Filepath to genotyping PLINK files
+    gene_list : str
+        Filepath to gene list (`{fname}_genelist.csv`) with 'snp', 'target',
+        'odds_ratio', and 'study' columns, as expected by
+        :func:`pypmi.loaders.load_genetics`
+    """
+
+    rs = np.random.RandomState(seed)
+    participants = (3000 + np.arange(n_participants)).astype(str)
+    rsid = np.array(['rs{}'.format(n) for n in
+                     np.cumsum(rs.randint(1, 1000, size=n_snps))])
+    prefix = rs.choice(['', 'exm-', 'NeuroX_'], size=n_snps, p=[.8, .1, .1])
+    snps = np.char.add(prefix.astype(str), rsid)
+
+    # genotypes follow Hardy-Weinberg proportions of a random allele frequency
+    freq = rs.uniform(0.05, 0.5, size=n_snps)
+    geno = rs.binomial(2, freq, size=(n_participants, n_snps)).astype('int8')
+    geno[rs.rand(n_participants, n_snps) < missing] = -1
+
+    a0 = rs.randint(0, 4, size=n_snps)
+    a1 = (a0 + rs.randint(1, 4, size=n_snps)) % 4
+    alleles = np.array(list('ACGT'))[np.column_stack([a0, a1])]
+    variants = pd.DataFrame(dict(chrom=np.sort(rs.randint(1, 23, size=n_snps)),
+                                 cm=0.0,
+                                 pos=rs.randint(1, 250000000, size=n_snps),
+                                 a0=alleles[:, 0], a1=alleles[:, 1]))
+    genetics.GenotypeStore.from_array(geno, participants, snps,
+                                      variants).to_plink(fname)
+
+    risk = rs.choice(n_snps, size=min(n_risk, n_snps), replace=False)
+    gene_list = fname + '_genelist.csv'
+    pd.DataFrame(dict(snp=rsid[risk],
+                      target=alleles[risk, rs.randint(0, 2, size=len(risk))],
+                      odds_ratio=rs.uniform(0.8, 1.5, size=len(risk)),
+                      study='synthetic')).to_csv(gene_list, index=False)
+
+    return fname, gene_list
+
+
+def _dicom_element(group: int, element: int, vr: str, value: bytes) -> bytes:
+    """ Encodes data element as explicit VR little endian
+    """
+
+    if len(value) % 2:
+        value += b'\x00' if vr == 'UI' else b' '
+    if vr in ('OB', 'OW', 'UN', 'SQ', 'UT'):
+        return struct.pack('<HH2sHI', group, element, vr.encode(), 0,
+                           len(value)) + value
+    return struct.pack('<HH2sH', group, element, vr.encode(),
+                       len(value)) + value
+
+
+def _write_dicom(fname: pathlib.Path, tags: Dict[tuple, tuple]):
+    """
+    Writes minimal DICOM (part 10) file `fname` with data elements `tags`
+
+    Parameters
+    ----------
+    fname : pathlib.Path
+        Filepath to DICOM file
+    tags : dict
+        Mapping of (group, element) tag to (VR, value) of data elements. Must
+        include SOP class (0008,0016) and instance (0008,0018) UIDs
+    """
+
+    meta = b''.join([
+        _dicom_element(0x0002, 0x0001, 'OB', b'\x00\x01'),
+        _dicom_element(0x0002, 0x0002, 'UI', tags[(0x0008, 0x0016)][1]),
+        _dicom_element(0x0002, 0x0003, 'UI', tags[(0x0008, 0x0018)][1]),
+        _dicom_element(0x0002, 0x0010, 'UI', b'1.2.840.10008.1.2.1'),
+    ])
+    meta = _dicom_element(0x0002, 0x0000, 'UL',
+                          struct.pack('<I', len(meta))) + meta
+    data = b''.join(_dicom_element(*tag, *tags[tag]) for tag in sorted(tags))
+
+    fname.write_bytes(b'\x00' * 128 + b'DICM' + meta + data)
+
+
+def make_imaging(path: str,
+                 n_participants: int = 10,
+                 n_sessions: int = 2,
+                 n_images: int = 4,
+                 scans: List[str] = None,
+                 seed: int = None) -> List[str]:
+    """
+    Generates synthetic PPMI neuroimaging DICOM tree in `path`
+
+    The tree is structured as downloaded from ppmi-info.org (see
+    :func:`pypmi.bids.convert_ppmi`), with every scan of a session sharing the
+    same study instance UID. Images only have the headers used when preparing
+    data for conversion (i.e., no pixel data), so they are very small.
+
+    Parameters
+    ----------
+    path : str
+        Filepath to directory where DICOM tree should be written
+    n_participants : int, optional
+        Number of participants. Default: 10
+    n_sessions : int, optional
+        Number of sessions per participant. Default: 2
+    n_images : int, optional
+        Number of images per scan. Default: 4
+    scans : list, optional
+        Scan types acquired every session. Default: ['MPRAGE_GRAPPA',
+        'AX_FLAIR', 'DTI_gated']
+    seed : int, optional
+        Random seed for reproducible data. Default: None
+
+    Returns
+    -------
+    subjects : list
+        Filepaths to generated participant directories
+    """
+
+    if scans is None:
+        scans = ['MPRAGE_GRAPPA', 'AX_FLAIR', 'DTI_gated']
+
+    rs = np.random.RandomState(seed)
+    path = pathlib.Path(path)
+
+    def uid():
+        return '2.25.{}'.format(int(rs.randint(1, 2 ** 62)) << 20
+                                | int(rs.randint(0, 2 ** 20))).encode()
+
+    subjects, series = [], 100000
+    for participant in 3000 + np.arange(n_participants):
+        subj_dir = path / str(participant)
+        for date in _dates(rs, n_sessions, '2010', '2020').sort_values():
+            study = uid()
+            for scan in scans:
+                series += 1
+                stamp = (date + pd.Timedelta(hours=int(rs.randint(8, 18)),
+                                             minutes=int(rs.randint(0, 60))))
+                scan_dir = (subj_dir / scan
+                            / stamp.strftime('%Y-%m-%d_%H_%M_%S.0')
+                            / 'S{}'.format(series))
+                scan_dir.mkdir(parents=True, exist_ok=True)
+                series_uid = uid()
+                for image in range(1, n_images + 1):
+                    tags = {
+                        (0x0008, 0x0016): ('UI', b'1.2.840.10008.5.1.4.1.1.4'),
+                        (0x0008, 0x0018): ('UI', uid()),
+                        (0x0008, 0x0020): ('DA', stamp.strftime('%Y%m%d')
+                                                      .encode()),
+                        (0x0008, 0x0060): ('CS', b'MR'),
+                        (0x0008, 0x103e): ('LO', scan.encode()),
+                        (0x0010, 0x0020): ('LO', str(participant).encode()),
+                        (0x0020, 0x000d): ('UI', study),
+                        (0x0020, 0x000e): ('UI', series_uid),
+                        (0x0020, 0x0011): ('IS', str(series % 100).encode()),
+                        (0x0020, 0x0013): ('IS', str(image).encode()),
+                    }
+                    fname = 'PPMI_{}_MR_{}_br_raw_{}_{}_S{}_I{}.dcm'.format(
+                        participant, scan, stamp.strftime('%Y%m%d%H%M%S'),
+                        image, series, series * 10 + image)
+                    _write_dicom(scan_dir / fname, tags)
+        subjects.append(str(subj_dir))
+
+    return subjects
@@ -1,10 +1,12 @@
 # -*- coding: utf-8 -*-
 
+import importlib
 import json
 import os
 from pkg_resources import resource_filename
 import pytest
 import pypmi
+from pypmi import synthetic
 
 with open(resource_filename('pypmi', 'data/studydata.json'), 'r') as src:
     _STUDYDATA = json.load(src)
@@ -31,3 +33,18 @@ def studydata(datadir):
     assert all(os.path.exists(os.path.join(datadir, f)) for f in fns)
 
     return datadir
+
+
+@pytest.fixture(scope='session')
+def synthdata(tmp_path_factory):
+    # synthetic study data, for tests that don't need the real thing
+    path = str(tmp_path_factory.mktemp('synthdata'))
+    synthetic.make_studydata(path, n_participants=50, n_visits=4, seed=1234)
+    return path
+
+
+@pytest.fixture
+def fork(monkeypatch):
+    # the release-specific loaders import their siblings as top-level modules
+    monkeypatch.syspath_prepend(os.path.dirname(pypmi.__file__))
+    return importlib.import_module
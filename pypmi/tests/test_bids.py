@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+
+import pandas as pd
+import pytest
+
+pytest.importorskip('pydicom')
+pytest.importorskip('nibabel')
+
+from pypmi import bids, synthetic  # noqa
+
+
+def _write_dicominfo(out_dir, subject, session, info):
+    fn = (out_dir / '.heudiconv' / subject / 'ses-{}'.format(session) / 'info'
+          / 'dicominfo_ses-{}.tsv'.format(session))
+    fn.parent.mkdir(parents=True, exist_ok=True)
+    pd.DataFrame(info, columns=['date', 'series_uid']) \
+      .to_csv(fn, sep='\t', index=False)
+
+
+def _write_session(bids_dir, files, scans):
+    ses_dir = bids_dir / 'sub-3000' / 'ses-1'
+    for fn, content in files.items():
+        (ses_dir / fn).parent.mkdir(parents=True, exist_ok=True)
+        (ses_dir / fn).write_text(content)
+    pd.DataFrame(dict(filename=scans, acq_time='2012-01-01T10:00:00')) \
+      .to_csv(ses_dir / 'sub-3000_ses-1_scans.tsv', sep='\t', index=False)
+    return ses_dir
+
+
+def test_converted_series(tmp_path):
+    assert len(bids._converted_series(tmp_path)) == 0
+
+    _write_dicominfo(tmp_path, '3000', 1, [('20120102', '1.1'),
+                                           ('20120102', '1.2')])
+    converted = bids._update_ledger(tmp_path)
+    assert (tmp_path / bids.LEDGER).exists()
+    assert list(converted['series_uid']) == ['1.1', '1.2']
+    assert set(converted['date']) == {'2012-01'}
+
+    # heudiconv rewrites the session records with only the latest batch, but
+    # the ledger remembers what was converted before
+    _write_dicominfo(tmp_path, '3000', 1, [('20120102', '1.3')])
+    converted = bids._converted_series(tmp_path)
+    assert list(converted['series_uid']) == ['1.1', '1.2', '1.3']
+    assert list(converted['session']) == [1, 1, 1]
+
+    # series converted into a separate dataset are added to the ledger
+    other = tmp_path / 'other'
+    _write_dicominfo(other, '3001', 2, [('2013-05-06', '2.1')])
+    converted = bids._update_ledger(tmp_path, other)
+    assert list(converted['series_uid']) == ['1.1', '1.2', '1.3', '2.1']
+    assert bids._converted_series(tmp_path).equals(converted)
+
+
+def test_prepare_directory_incremental(tmp_path):
+    subj, = synthetic.make_imaging(str(tmp_path), n_participants=1,
+                                   n_sessions=2, seed=1234)
+    dates = sorted({d.name[:7] for d in tmp_path.glob('3000/*/*')})
+    first = sorted(tmp_path.glob('3000/*/{}*/*'.format(dates[0])))
+    seen = first[:2]
+    converted = pd.DataFrame(dict(subject='3000', session=1, date=dates[0],
+                                  series_uid=[bids._get_series_uid(d)
+                                              for d in seen]))
+
+    subjects, coerce = bids._prepare_directory(tmp_path, ignore_bad=False,
+                                               confirm_uids=False,
+                                               converted=converted)
+    assert subjects == ['3000']
+    # converted series stay put; the rest are staged by (known) session
+    assert {d.name for d in tmp_path.glob('3000/1/*')} == {d.name
+                                                           for d in seen}
+    staged = tmp_path / 'incremental' / '3000'
+    assert {d.name for d in staged.glob('1/*')} == {first[2].name}
+    assert len(list(staged.glob('2/*'))) == 3
+
+
+def test_merge_converted(tmp_path):
+    out_dir, bids_dir = tmp_path / 'out', tmp_path / 'new'
+    old = ['anat/sub-3000_ses-1_run-01_T1w.nii.gz',
+           'anat/sub-3000_ses-1_run-01_echo-1_T2w.nii.gz',
+           'anat/sub-3000_ses-1_run-01_echo-2_T2w.nii.gz']
+    _write_session(out_dir, {fn: 'old' for fn in old}, old)
+    (out_dir / 'sub-3000/ses-1/anat/sub-3000_ses-1_run-01_T1w.json') \
+        .write_text('old')
+    pd.DataFrame(dict(participant_id=['sub-3000'])) \
+      .to_csv(out_dir / 'participants.tsv', sep='\t', index=False)
+
+    new = old + ['anat/sub-3000_ses-1_run-02_T1w.nii.gz',
+                 'dwi/sub-3000_ses-1_run-01_dwi.nii.gz']
+    files = {fn: 'new' for fn in new}
+    files['anat/sub-3000_ses-1_run-01_T1w.json'] = 'new'
+    _write_session(bids_dir, files, new)
+    pd.DataFrame(dict(participant_id=['sub-3000', 'sub-3001'])) \
+      .to_csv(bids_dir / 'participants.tsv', sep='\t', index=False)
+    (bids_dir / 'dataset_description.json').write_text('{}')
+
+    moved = bids._merge_converted(bids_dir, out_dir)
+    assert len(moved) == len(files)
+    anat = out_dir / 'sub-3000' / 'ses-1' / 'anat'
+    # existing images are untouched and new runs follow them
+    for fn in old:
+        assert (anat.parent / fn).read_text() == 'old'
+    for run, ext in [(2, 'nii.gz'), (2, 'json'), (3, 'nii.gz')]:
+        fn = anat / 'sub-3000_ses-1_run-0{}_T1w.{}'.format(run, ext)
+        assert fn.read_text() == 'new'
+    for echo in (1, 2):
+        fn = anat / 'sub-3000_ses-1_run-02_echo-{}_T2w.nii.gz'.format(echo)
+        assert fn.read_text() == 'new'
+    assert (anat.parent / 'dwi' / 'sub-3000_ses-1_run-01_dwi.nii.gz').exists()
+
+    scans = pd.read_csv(anat.parent / 'sub-3000_ses-1_scans.tsv', sep='\t')
+    assert list(scans['filename']) == old + [
+        'anat/sub-3000_ses-1_run-02_T1w.nii.gz',
+        'anat/sub-3000_ses-1_run-02_echo-1_T2w.nii.gz',
+        'anat/sub-3000_ses-1_run-02_echo-2_T2w.nii.gz',
+        'anat/sub-3000_ses-1_run-03_T1w.nii.gz',
+        'dwi/sub-3000_ses-1_run-01_dwi.nii.gz'
+    ]
+    participants = pd.read_csv(out_dir / 'participants.tsv', sep='\t')
+    assert list(participants['participant_id']) == ['sub-3000', 'sub-3001']
+    assert (out_dir / 'dataset_description.json').exists()
+
+
+def _make_dataset(out_dir):
+    import nibabel as nib
+    import numpy as np
+
+    anat = out_dir / 'sub-3000' / 'ses-1' / 'anat'
+    anat.mkdir(parents=True)
+    images = {
+        'sub-3000_ses-1_run-01_T1w': (4, 4, 3),
+        'sub-3000_ses-1_run-02_T1w': (4, 4, 3, 2),
+        'sub-3000_ses-1_run-01_echo-1_T2w': (4, 4, 1),
+        'sub-3000_ses-1_run-01_heudiconv123_e2': (4, 4, 3),
+    }
+    for stem, shape in images.items():
+        data = np.arange(np.prod(shape), dtype='int16').reshape(shape)
+        nib.save(nib.Nifti1Image(data, np.eye(4)),
+                 str(anat / (stem + '.nii.gz')))
+        (anat / (stem + '.json')).write_text('{}')
+    (anat / '.tmp_sub-3000_ses-1_run-01_T1w.nii.gz').write_text('')
+    pd.DataFrame(dict(filename=['anat/{}.nii.gz'.format(stem)
+                                for stem in images],
+                      acq_time='2012-01-01T10:00:00')) \
+      .to_csv(anat.parent / 'sub-3000_ses-1_scans.tsv', sep='\t', index=False)
+    return anat
+
+
+def test_find_cleanup(tmp_path):
+    anat = _make_dataset(tmp_path)
+    hidden = tmp_path / '.heudiconv' / 'sub-3000_heudiconv1.nii.gz'
+    hidden.parent.mkdir()
+    hidden.write_text('')
+
+    report = bids._find_cleanup(tmp_path)
+    actions = dict(zip([fn.name for fn in report['filename']],
+                       report['action']))
+    # sidecars of removed images aren't candidates of their own
+    assert actions == {
+        '.tmp_sub-3000_ses-1_run-01_T1w.nii.gz': 'remove',
+        'sub-3000_ses-1_run-01_echo-1_T2w.nii.gz': 'remove',
+        'sub-3000_ses-1_run-01_heudiconv123_e2.nii.gz': 'remove',
+        'sub-3000_ses-1_run-02_T1w.nii.gz': 'merge',
+    }
+    assert all(fn.parent == anat for fn in report['filename'])
+
+
+def test_clean_directory(tmp_path):
+    import nibabel as nib
+
+    anat = _make_dataset(tmp_path)
+    before = sorted(fn.name for fn in anat.glob('*'))
+
+    report = bids._clean_directory(tmp_path, dry_run=True)
+    assert len(report) == 4
+    assert sorted(fn.name for fn in anat.glob('*')) == before
+    assert nib.load(str(anat / 'sub-3000_ses-1_run-02_T1w.nii.gz')).shape \
+        == (4, 4, 3, 2)
+
+    assert bids._clean_directory(tmp_path, n_jobs=4).equals(report)
+    assert sorted(fn.name for fn in anat.glob('*')) == [
+        'sub-3000_ses-1_run-01_T1w.json',
+        'sub-3000_ses-1_run-01_T1w.nii.gz',
+        'sub-3000_ses-1_run-02_T1w.json',
+        'sub-3000_ses-1_run-02_T1w.nii.gz',
+    ]
+    assert nib.load(str(anat / 'sub-3000_ses-1_run-02_T1w.nii.gz')).shape \
+        == (4, 4, 6)
+    scans = pd.read_csv(anat.parent / 'sub-3000_ses-1_scans.tsv', sep='\t')
+    assert list(scans['filename']) == ['anat/sub-3000_ses-1_run-01_T1w.nii.gz',
+                                       'anat/sub-3000_ses-1_run-02_T1w.nii.gz']
+
+    # removing files that are already gone is fine
+    bids._remove_file(anat / 'sub-3000_ses-1_run-01_echo-1_T2w.nii.gz')
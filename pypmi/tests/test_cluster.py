@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import pypmi
+from pypmi import cluster
+
+
+@pytest.fixture(scope='module')
+def behavior():
+    rng = np.random.RandomState(1234)
+    data = pd.DataFrame(rng.randn(60, len(cluster.FERESHTEHNEJAD_MEASURES)),
+                        columns=cluster.FERESHTEHNEJAD_MEASURES)
+    data['visit'] = np.repeat(['BL', 'V04', 'V06'], 20)
+    return data
+
+
+def test_cluster_fereshtehnejad2017(behavior):
+    labels = cluster.cluster_fereshtehnejad2017(behavior)
+    assert labels.shape == (60,) and set(labels) <= {1, 2, 3}
+
+    # grouped frames are equivalent to labelling each group separately
+    grouped = cluster.cluster_fereshtehnejad2017(behavior, groupby='visit')
+    for n, (_, sub) in enumerate(behavior.groupby('visit')):
+        expected = cluster.cluster_fereshtehnejad2017(sub)
+        assert np.array_equal(grouped[n * 20:(n + 1) * 20], expected)
+
+    # as are stacked arrays
+    values = behavior[cluster.FERESHTEHNEJAD_MEASURES].values
+    stacked = cluster.cluster_fereshtehnejad2017(values.reshape(3, 20, -1))
+    assert np.array_equal(stacked.ravel(), grouped)
+
+
+def test_fereshtehnejadsubtyper(behavior):
+    subtyper = cluster.FereshtehnejadSubtyper()
+    with pytest.raises(ValueError):
+        subtyper.transform(behavior)
+
+    # fitting on the cohort itself matches the per-cohort labels
+    labels = subtyper.fit_transform(behavior)
+    assert np.array_equal(labels,
+                          cluster.cluster_fereshtehnejad2017(behavior))
+
+    # new batches are labelled independently of one another
+    batches = [subtyper.transform(behavior.iloc[n:n + 7])
+               for n in range(0, 60, 7)]
+    assert np.array_equal(np.hstack(batches), labels)
+
+
+def test_faghri_cluster():
+    rng = np.random.RandomState(1234)
+    features = np.vstack([rng.randn(100, 8) + n * 5 for n in range(3)])
+    features[rng.rand(*features.shape) < 0.05] = np.nan
+
+    # well-separated clusters are recovered, ordered, and reproducible
+    labels = cluster._faghri_cluster(features, batch_size=64, seed=1)
+    assert np.array_equal(labels, np.repeat([1, 2, 3], 100))
+    assert np.array_equal(
+        cluster._faghri_cluster(features, batch_size=64, seed=1), labels)
+
+
+def test_cluster_faghri2018(monkeypatch):
+    rng = np.random.RandomState(1234)
+    participants = np.repeat(3000 + np.arange(60), 2)
+    group = (participants - 3000) // 20
+    visits = dict(participant=participants,
+                  visit=np.tile(['BL', 'V04'], 60),
+                  date=pd.to_datetime('2012-01-01'))
+
+    def frame(*measures):
+        data = pd.DataFrame(visits)
+        for measure in measures:
+            data[measure] = group * 5 + rng.randn(len(data))
+        return data
+
+    behavior = frame('moca', 'updrs_iii', 'upsit')
+    # repeat assessments within a visit are averaged
+    behavior = pd.concat([behavior, behavior.iloc[[0]].assign(moca=np.nan)],
+                         ignore_index=True)
+    demographics = pd.DataFrame(dict(
+        participant=3000 + np.arange(60),
+        diagnosis=['pd'] * 59 + ['hc'],
+        gender=pd.Categorical(rng.choice(['f', 'm'], size=60)),
+        age=55 + rng.randn(60),
+        date_birth=pd.to_datetime('1950-01-01')
+    ))
+    for name, data in [('behavior', behavior),
+                       ('biospecimen', frame('abeta_1-42', 'ttau')),
+                       ('datscan', frame('putamen_l', 'putamen_r')),
+                       ('demographics', demographics)]:
+        monkeypatch.setattr(cluster, 'load_' + name,
+                            lambda path, data=data: data.copy())
+
+    features = cluster._faghri_features()
+    assert features.index.names == ['participant', 'visit']
+    assert len(features) == 118 and features.index.is_unique
+    assert (features.dtypes == 'float32').all()
+    assert {'moca', 'ttau', 'putamen_l', 'age', 'gender_f'} \
+        <= set(features.columns)
+
+    # groups are recovered and ordered along the first principal component
+    labels = cluster.cluster_faghri2018(n_components=3, batch_size=32)
+    assert list(labels.columns) == ['participant', 'visit', 'cluster']
+    assert np.array_equal(labels['cluster'], group[:118] + 1)
+    assert labels.equals(cluster.cluster_faghri2018(n_components=3,
+                                                    batch_size=32))
+
+
+def test_cluster_faghri2018_synthetic(synthdata):
+    demo = pypmi.load_demographics(synthdata)
+    labels = cluster.cluster_faghri2018(synthdata)
+    assert len(labels) > 0
+    assert set(labels['cluster']) <= {1, 2, 3}
+    pd_subjects = demo.query('diagnosis == "pd"')['participant']
+    assert labels['participant'].isin(pd_subjects).all()
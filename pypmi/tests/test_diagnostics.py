@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+
+import logging
+
+from pypmi import _diagnostics
+
+
+def test_counters():
+    _diagnostics.reset_counters()
+    _diagnostics.count('load_prodromal', rows_out=10, nas_filled=2)
+    _diagnostics.count('load_prodromal', rows_out=5)
+    assert _diagnostics.counters == {'load_prodromal.rows_out': 15,
+                                     'load_prodromal.nas_filled': 2}
+    _diagnostics.reset_counters()
+    assert len(_diagnostics.counters) == 0
+
+
+def test_get_logger(caplog):
+    logger = _diagnostics.get_logger('pypmi.test')
+    assert logger is _diagnostics.get_logger('pypmi.test')
+    assert len(logger.handlers) == 1
+
+    with caplog.at_level(logging.DEBUG, logger='pypmi.test'):
+        logger.debug('Read %d rows', 10)
+    assert caplog.messages == ['Read 10 rows']
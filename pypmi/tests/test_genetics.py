@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pypmi import genetics
+
+
+@pytest.fixture(scope='module')
+def geno():
+    rng = np.random.RandomState(1234)
+    geno = rng.randint(-1, 3, size=(11, 7)).astype('int8')
+    participants = [str(3000 + n) for n in range(11)]
+    snps = ['rs{}'.format(n) for n in range(7)]
+    return geno, participants, snps
+
+
+def test_genotypestore_packing(geno, tmp_path):
+    geno, participants, snps = geno
+    store = genetics.GenotypeStore.from_array(geno, participants, snps)
+    # four genotypes per byte (participants padded to a multiple of four)
+    assert store.shape == (11, 7) and store.nbytes == 7 * 3
+    assert np.array_equal(store.to_numpy(), geno)
+    # NaN and -1 are both missing
+    nan = np.where(geno < 0, np.nan, geno)
+    assert np.array_equal(genetics.GenotypeStore.from_array(
+        nan, participants, snps).packed, store.packed)
+
+    # round trip via PLINK files is memory-mapped
+    fname = str(tmp_path / 'geno')
+    store.to_plink(fname)
+    loaded = genetics.GenotypeStore.from_plink(fname)
+    assert isinstance(loaded.packed, np.memmap)
+    assert np.array_equal(loaded.to_numpy(), geno)
+    assert list(loaded.participants) == participants
+    assert list(loaded.snps) == snps
+    # without variant information PLINK's missing value codes are used
+    assert (loaded.variants['a1'] == '0').all()
+    assert (loaded.variants['pos'] == 0).all()
+
+
+def test_genotypestore_variants(geno, tmp_path):
+    geno, participants, snps = geno
+    variants = pd.DataFrame(dict(chrom=['1'] * 4 + ['X'] * 3, cm=0.0,
+                                 pos=np.arange(7) * 1000 + 1,
+                                 a0=list('ACGTACG'), a1=list('GTACGTA')))
+    store = genetics.GenotypeStore.from_array(geno, participants, snps,
+                                              variants)
+    assert list(store.variants.index) == snps
+
+    # variant information survives round trips via PLINK files and subsets
+    fname = str(tmp_path / 'geno')
+    store.to_plink(fname)
+    loaded = genetics.GenotypeStore.from_plink(fname)
+    pd.testing.assert_frame_equal(loaded.variants, store.variants)
+    sub = loaded.subset(participants=['3002'], snps=['rs6', 'rs1'])
+    assert list(sub.variants['a1']) == ['A', 'T']
+    assert list(sub.variants['pos']) == [6001, 1001]
+
+    with pytest.raises(ValueError):
+        genetics.GenotypeStore.from_array(geno, participants, snps,
+                                          variants.iloc[:3])
+
+
+def test_genotypestore_invalid(geno):
+    geno, participants, snps = geno
+    for value in (3, -2, 0.5):
+        invalid = geno.astype(float)
+        invalid[0, 0] = value
+        with pytest.raises(ValueError):
+            genetics.GenotypeStore.from_array(invalid, participants, snps)
+
+
+def test_genotypestore_subset(geno):
+    geno, participants, snps = geno
+    store = genetics.GenotypeStore.from_array(geno, participants, snps)
+
+    sub = store.subset(participants=['3004', '3001'], snps=['rs5', 'rs0'])
+    assert np.array_equal(sub.to_numpy(), geno[np.ix_([4, 1], [5, 0])])
+    data = store.to_pandas(snps=slice(2, 4))
+    assert list(data.columns) == ['rs2', 'rs3']
+    assert np.array_equal(np.isnan(data.values), geno[:, 2:4] < 0)
+
+    with pytest.raises(KeyError):
+        store.subset(snps=['notasnp'])
+    with pytest.raises(KeyError):
+        store.subset(participants=['notaparticipant'])
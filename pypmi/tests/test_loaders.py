@@ -1,9 +1,10 @@
 # -*- coding: utf-8 -*-
 
 import numpy as np
+import pandas as pd
 import pytest
 
-from pypmi import loaders
+from pypmi import genetics, loaders
 
 
 @pytest.mark.parametrize(('loader', 'expected'), [
@@ -54,3 +55,111 @@ def test_load_demographics(studydata, measures, expected):
         expected = expected(studydata)
     assert all(out.columns[:1] == ['participant'])
     assert all(out.columns[1:] == expected)
+
+
+def test_load_all(synthdata):
+    out = loaders.load_all(synthdata)
+    assert all(out.columns[:3] == ['participant', 'visit', 'date'])
+    assert not out.duplicated(subset=['participant', 'visit']).any()
+    # should match loading data types individually
+    behavior = loaders.load_behavior(synthdata)
+    datscan = loaders.load_datscan(synthdata)
+    demographics = loaders.load_demographics(synthdata)
+    assert all(c in out.columns for c in loaders.available_datscan(synthdata))
+    assert all(c in out.columns for c in demographics.columns)
+    assert 'date_datscan' in out.columns
+    assert len(out) >= len(datscan.drop_duplicates(['participant', 'visit']))
+    merged = out.merge(behavior, on=['participant', 'visit'],
+                       suffixes=('', '_behavior'))
+    assert len(merged) == len(behavior)
+    assert np.allclose(merged['moca'], merged['moca_behavior'],
+                       equal_nan=True)
+    age = out.drop_duplicates('participant').set_index('participant')['age']
+    assert np.allclose(age, demographics.set_index('participant')['age']
+                                        .loc[age.index])
+
+    out = loaders.load_all(synthdata, measures=dict(datscan=['caudate_l']))
+    assert list(out.columns) == ['participant', 'visit', 'date', 'caudate_l']
+    with pytest.raises(ValueError):
+        loaders.load_all(synthdata, measures=dict(notadtype=None))
+
+
+def test_stream_genotypes():
+    da = pytest.importorskip('dask.array')
+    # variants x participants, as stored in PLINK files
+    gen = np.array([[0, 1, np.nan], [2, np.nan, 1], [1, 0, 2]])
+    flip = np.array([False, True, False])
+    for chunksize in (None, 2):
+        geno = loaders._stream_genotypes(da.from_array(gen, chunks=(1, 3)),
+                                         chunksize=chunksize, flip=flip)
+        assert geno.dtype == np.int8
+        assert np.array_equal(geno, [[0, 0, 1], [1, -1, 0], [-1, 1, 2]])
+
+
+def test_collapse_duplicates():
+    geno = np.array([[0, 2, 0, -1],
+                     [1, 1, 2, 2],
+                     [-1, 0, -1, -1]], dtype='int8')
+    snps = ['rs1', 'rs2', 'rs1', 'rs1']
+    out, snps = loaders._collapse_duplicates(geno, snps)
+    assert list(snps) == ['rs1', 'rs2']
+    # discordant duplicates are averaged (and rounded) over non-missing calls
+    assert np.array_equal(out, [[0, 2], [2, 1], [-1, 0]])
+
+    snps = ['rs1', 'rs2', 'rs3', 'rs4']
+    out, snps = loaders._collapse_duplicates(geno, snps)
+    assert out is geno and list(snps) == ['rs1', 'rs2', 'rs3', 'rs4']
+
+
+def test_load_genetics(tmp_path):
+    pytest.importorskip('pandas_plink')
+    # rs2 is missing for all participants and 3003 is missing for all SNPs
+    geno = np.array([[0, -1, 2, 1],
+                     [1, -1, 0, 2],
+                     [-1, -1, -1, -1],
+                     [2, -1, 1, -1]], dtype='int8')
+    participants = ['3002', '3000', '3003', '3001']
+    fname = str(tmp_path / 'geno')
+    genetics.GenotypeStore.from_array(
+        geno, participants, ['rs1', 'rs2', 'rs3', 'rs4']).to_plink(fname)
+
+    data, info = loaders.load_genetics(fname)
+    assert list(data.index) == ['3000', '3001', '3002']
+    assert list(data.columns) == list(info.snp) == ['rs1', 'rs3', 'rs4']
+    expected = np.array([[1, 0, 2], [2, 1, np.nan], [0, 2, 1]])
+    assert np.array_equal(data.values, expected, equal_nan=True)
+
+    data, info = loaders.load_genetics(fname, compact=True)
+    assert data.dtypes.eq(np.int8).all()
+    assert np.array_equal(data.values, np.nan_to_num(expected, nan=-1))
+
+
+def test_compute_grs(tmp_path):
+    pytest.importorskip('pandas_plink')
+    geno = np.array([[2, 0, 1],
+                     [-1, 1, 2],
+                     [1, -1, 0]], dtype='int8')
+    variants = pd.DataFrame(dict(chrom='1', cm=0.0, pos=[1, 2, 3],
+                                 a0=['A', 'C', 'G'], a1=['G', 'T', 'A']))
+    fname = str(tmp_path / 'geno')
+    genetics.GenotypeStore.from_array(
+        geno, ['3000', '3001', '3002'], ['rs1', 'rs2', 'rs3'], variants
+    ).to_plink(fname)
+    # rs2 is reverse-coded, rs3 doesn't match its target and rs4 isn't there
+    gene_list = str(tmp_path / 'genelist.csv')
+    pd.DataFrame(dict(snp=['rs1', 'rs2', 'rs3', 'rs4'],
+                      target=['G', 'C', 'T', 'A'],
+                      odds_ratio=np.exp([1, 2, 3, 4]))) \
+      .to_csv(gene_list, index=False)
+
+    # target allele dosages are [[2, 2], [NaN, 1], [1, NaN]], with means of
+    # the non-missing dosages of 1.5 for both SNPs
+    expected = dict(mean=[1 * 2 + 2 * 2, 1 * 1.5 + 2 * 1, 1 * 1 + 2 * 1.5],
+                    zero=[6, 2, 1],
+                    rescale=[6, 2 * 2, 1 * 2])
+    for missing, scores in expected.items():
+        for chunksize in (1, 1024):
+            grs = loaders.compute_grs(fname, gene_list, missing=missing,
+                                      chunksize=chunksize)
+            assert list(grs.index) == ['3000', '3001', '3002']
+            assert np.allclose(grs.values, scores)
@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import pandas as pd
+import pytest
+
+
+@pytest.mark.parametrize('func', [
+    np.sum, np.nansum, np.mean, np.nanmean, np.max, np.nanmax, np.min,
+    np.nanmin
+])
+def test_apply_step_reductions(fork, func):
+    loaders = fork('_loaders')
+    data = pd.DataFrame(dict(a=[1, 2, np.nan], b=[np.nan, 3, np.nan]))
+    # vectorized reductions skip NaN, as when applied row by row
+    expected = data.apply(func, axis=1)
+    out = loaders._apply_step(data, 'apply', func, dict(axis=1))
+    pd.testing.assert_series_equal(out, expected, check_dtype=False)
+    assert not np.isnan(out[0])
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+
+BENTON = 'Benton_Judgement_of_Line_Orientation.csv'
+
+
+@pytest.fixture
+def subitems(fork):
+    return fork('_loadersSubitems')
+
+
+def test_load_behavior_recode(subitems, synthdata, tmp_path):
+    measures = ['benton', 'moca']
+    raw = subitems.load_behavior(synthdata, measures=measures)
+    recoded = subitems.load_behavior(synthdata, measures=measures,
+                                     recode=True)
+    # items are reflected within their declared range
+    assert np.array_equal(recoded['BJLOT1'], 1 - raw['BJLOT1'],
+                          equal_nan=True)
+    assert np.array_equal(recoded['MCASER7'], 3 - raw['MCASER7'],
+                          equal_nan=True)
+
+    # ... so recoded values don't depend on which rows are loaded
+    for fname in os.listdir(synthdata):
+        if fname.endswith('.csv'):
+            shutil.copy(os.path.join(synthdata, fname), str(tmp_path))
+    benton = pd.read_csv(os.path.join(synthdata, BENTON))
+    benton[benton['BJLOT1'] == 1].to_csv(tmp_path / BENTON, index=False)
+    subset = subitems.load_behavior(str(tmp_path), measures=['benton'],
+                                    recode=True)
+    assert (subset['BJLOT1'].dropna() == 0).all()
+    keys = ['participant', 'visit', 'date']
+    merged = subset.merge(recoded, on=keys, suffixes=('', '_all'))
+    assert len(merged) > 0
+    for col in ('BJLOT1', 'BJLOT2'):
+        assert np.array_equal(merged[col], merged[col + '_all'],
+                              equal_nan=True)
+
+
+def test_load_behavior_recode_undeclared(subitems, synthdata, monkeypatch):
+    spec = {k: v for k, v in subitems.RECODE['benton'].items()
+            if k != 'item_range'}
+    monkeypatch.setitem(subitems.RECODE, 'benton', spec)
+    with pytest.raises(ValueError, match='benton'):
+        subitems.load_behavior(synthdata, measures=['benton'], recode=True)
+    subitems.load_behavior(synthdata, measures=['benton'])
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+
+import json
+
+import numpy as np
+import pytest
+
+from pypmi import loaders, profiling, synthetic
+
+
+def test_stage_disabled():
+    assert profiling._ACTIVE is None
+    with profiling.stage('noop', measure='moca') as st:
+        st.record(np.zeros(10))
+    assert st is profiling._DISABLED
+
+
+def test_profile(tmp_path):
+    events = []
+    with profiling.profile(memory=True, callback=events.append) as prof:
+        with profiling.stage('outer', measure='moca') as st:
+            with profiling.stage('inner') as inner:
+                data = np.ones((1000, 100))
+                inner.record(data)
+            st.update(extra='info')
+    assert profiling._ACTIVE is None
+    assert events == prof.events
+
+    inner, outer = prof.events
+    assert (inner['name'], outer['name']) == ('inner', 'outer')
+    assert (inner['depth'], outer['depth']) == (1, 0)
+    assert inner['args']['rows'] == 1000
+    assert inner['args']['bytes'] == data.nbytes
+    # peak memory of nested stages count towards their parents
+    assert inner['args']['peak_mib'] >= data.nbytes / 2 ** 20
+    assert outer['args']['peak_mib'] >= inner['args']['peak_mib']
+    assert outer['args']['measure'] == 'moca'
+    assert outer['start'] <= inner['start']
+    assert outer['duration'] >= inner['duration']
+
+    frame = prof.to_frame()
+    assert list(frame['name']) == ['outer', 'inner']
+    assert {'rows', 'bytes', 'peak_mib', 'measure', 'extra'} <= \
+        set(frame.columns)
+
+    trace = prof.to_chrome_trace(str(tmp_path / 'trace.json'))
+    with open(str(tmp_path / 'trace.json')) as src:
+        assert json.load(src) == trace
+    assert [ev['ph'] for ev in trace['traceEvents']] == ['X', 'X']
+
+
+def test_profile_loaders(tmp_path):
+    synthetic.make_studydata(str(tmp_path), n_participants=10, n_visits=3,
+                             seed=1234)
+    with profiling.profile() as prof:
+        loaders.load_datscan(str(tmp_path))
+        loaders.load_biospecimen(str(tmp_path))
+    frame = prof.to_frame()
+
+    reads = frame.query('name == "read_csv"')
+    assert 'DATScan_Analysis.csv' in set(reads['file'])
+    assert (reads['file_bytes'] > 0).all() and (reads['rows'] > 0).all()
+    for name in ('load_datscan', 'load_biospecimen', 'unstack', '_load_dates',
+                 'merge_dates'):
+        assert name in set(frame['name'])
+    # loaders are the outermost stages
+    outermost = set(frame.query('depth == 0')['name'])
+    assert outermost == {'load_datscan', 'load_biospecimen'}
+
+    with pytest.raises(AttributeError):
+        profiling._DISABLED.rows = 1
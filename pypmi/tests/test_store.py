@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pypmi.store import ParticipantStore
+
+
+@pytest.fixture(scope='module')
+def store():
+    behavior = pd.DataFrame(dict(participant=[3002, 3001, 3001, 3003],
+                                 visit=['BL', 'V04', 'BL', 'BL'],
+                                 date=pd.to_datetime(['2012-01-01'] * 4),
+                                 moca=[30, 24, 26, 28]))
+    datscan = pd.DataFrame(dict(participant=[3001, 3004],
+                                visit=['BL', 'BL'],
+                                date=pd.to_datetime(['2012-02-01'] * 2),
+                                putamen=[1.5, 0.9]))
+    demographics = pd.DataFrame(dict(participant=[3001, 3002],
+                                     gender=['f', 'm']))
+    return ParticipantStore.from_frames(
+        dict(behavior=behavior, datscan=datscan), demographics)
+
+
+def test_participantstore(store):
+    assert len(store) == 4 and 3004 in store and 9999 not in store
+    assert list(store.visits.columns) == ['date', 'moca', 'date_datscan',
+                                          'putamen']
+
+    record = store[3001]
+    assert list(record.index) == ['BL', 'V04']
+    assert np.array_equal(record['moca'], [26, 24])
+    assert list(record['gender']) == ['f', 'f']
+    assert record.loc['BL', 'putamen'] == 1.5
+
+    assert len(store.get(3001, visit='V04')) == 1
+    assert store.get(3004)['putamen'].item() == 0.9
+    assert store.demographics(3002)['gender'] == 'm'
+    with pytest.raises(KeyError):
+        store.get(9999)
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pypmi import genetics, loaders, synthetic
+
+
+def test_make_studydata(tmp_path):
+    fnames = synthetic.make_studydata(str(tmp_path), n_participants=25,
+                                      n_visits=4, seed=1234)
+    visits, participants, _, _ = synthetic._compile_schema()
+    assert len(fnames) == len(visits) + len(participants)
+
+    # every column referenced by the measure specifications is present
+    for fname, cols in list(visits.items()) + list(participants.items()):
+        header = pd.read_csv(os.path.join(str(tmp_path), fname), nrows=0)
+        assert set(cols) <= set(header.columns)
+
+    # data are reproducible and can be loaded
+    out = loaders.load_datscan(str(tmp_path), measures='all')
+    assert list(out.columns[:3]) == ['participant', 'visit', 'date']
+    assert out['participant'].nunique() == 25
+    assert out['date'].notna().all()
+    dem = loaders.load_demographics(str(tmp_path), measures=['diagnosis'])
+    assert set(dem['diagnosis'].dropna()) <= {'pd', 'hc', 'swedd', 'prod',
+                                              'genpd', 'genun', 'regpd',
+                                              'regun'}
+    again = tmp_path / 'again'
+    synthetic.make_studydata(str(again), n_participants=25, n_visits=4,
+                             seed=1234)
+    pd.testing.assert_frame_equal(
+        out, loaders.load_datscan(str(again), measures='all'))
+
+    with pytest.raises(ValueError):
+        synthetic.make_studydata(str(tmp_path), n_visits=100)
+
+
+def test_make_genetics(tmp_path):
+    fname, gene_list = synthetic.make_genetics(str(tmp_path / 'geno'),
+                                               n_participants=30, n_snps=50,
+                                               n_risk=10, seed=1234)
+    store = genetics.GenotypeStore.from_plink(fname)
+    assert store.shape == (30, 50)
+    assert store.to_numpy().min() >= -1 and store.to_numpy().max() <= 2
+
+    genes = pd.read_csv(gene_list)
+    assert list(genes.columns) == ['snp', 'target', 'odds_ratio', 'study']
+    assert len(genes) == 10 and genes['snp'].isin(
+        store.snps.str.extract(r'(rs[0-9]+)', expand=False)).all()
+
+
+def test_make_imaging(tmp_path):
+    dcm = pytest.importorskip('pydicom')
+    subjects = synthetic.make_imaging(str(tmp_path), n_participants=2,
+                                      n_sessions=2, n_images=3,
+                                      scans=['MPRAGE_GRAPPA'], seed=1234)
+    assert [os.path.basename(s) for s in subjects] == ['3000', '3001']
+
+    images = sorted(tmp_path.glob('3000/MPRAGE_GRAPPA/*/S*/*dcm'))
+    assert len(images) == 6
+    headers = [dcm.dcmread(str(img)) for img in images]
+    # one series (and study) per session
+    assert len({h.SeriesInstanceUID for h in headers}) == 2
+    assert len({h.StudyInstanceUID for h in headers}) == 2
+    assert np.all([h.PatientID == '3000' for h in headers])
@@ -43,3 +43,33 @@ def test_get_data_dir(studydata):
 
     if ppmi_path is not None:
         os.environ['PPMI_PATH'] = ppmi_path
+
+
+def test_get_data_files(tmp_path):
+    (tmp_path / 'Vital_Signs.csv').write_text('')
+    (tmp_path / '2023').mkdir()
+    (tmp_path / '2023' / 'Vital_Signs.csv').write_text('')
+    (tmp_path / 'other').mkdir()
+    (tmp_path / 'other' / 'SAA_20231102.csv').write_text('')
+    root, other = str(tmp_path), str(tmp_path / 'other')
+
+    try:
+        # release subfolders take precedence; aliases are used as fallback
+        utils.configure_data_sources(paths=[root, other], releases=['2023'],
+                                     aliases={'SAA.csv': ['SAA_20231102.csv']})
+        files = utils._get_data_files(['Vital_Signs.csv', 'SAA.csv'])
+        assert files == {
+            'Vital_Signs.csv': os.path.join(root, '2023', 'Vital_Signs.csv'),
+            'SAA.csv': os.path.join(other, 'SAA_20231102.csv')
+        }
+        assert utils._get_data_dir(fnames=['SAA.csv']) == root
+        # explicitly provided path is the only one searched
+        with pytest.raises(FileNotFoundError):
+            utils._get_data_file('SAA.csv', path=root)
+
+        # files added after indexing are found
+        (tmp_path / 'Signature_Form.csv').write_text('')
+        assert utils._get_data_file('Signature_Form.csv') == \
+            os.path.join(root, 'Signature_Form.csv')
+    finally:
+        utils.configure_data_sources()
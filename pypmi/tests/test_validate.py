@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pypmi.validate import validate
+
+
+@pytest.fixture(scope='module')
+def data():
+    return pd.DataFrame(dict(
+        participant=[3001, 3002, 3003],
+        benton=[-1, 5, 20],
+        moca=[np.nan, 31, 30],
+        gender=['f', 'x', np.nan],
+        date=pd.to_datetime(['2009-01-01', '2015-06-01', None])
+    ), index=['a', 'b', 'c'])
+
+
+def test_validate(data):
+    out, report = validate(data)
+    assert out is data
+    assert list(report.columns) == ['index', 'column', 'value', 'reason']
+    assert sorted(zip(report['index'], report['column'], report['reason'])) \
+        == [('a', 'benton', 'min'), ('a', 'date', 'min'),
+            ('b', 'gender', 'category'), ('b', 'moca', 'max'),
+            ('c', 'benton', 'max')]
+
+    out, _ = validate(data, action='clip')
+    assert list(out['benton']) == [0, 5, 12]
+    # clipped integers stay integers; untouched columns are left as is
+    assert out['benton'].dtype == data['benton'].dtype
+    assert out['participant'].dtype == data['participant'].dtype
+    assert out.loc['a', 'date'] == pd.Timestamp('2010-01-01')
+    assert out['gender'].isna().tolist() == [False, True, True]
+
+    out, _ = validate(data, release='2021', action='mask')
+    assert out['benton'].isna().tolist() == [True, False, True]
+    assert data['benton'].notna().all()
+
+    with pytest.raises(ValueError):
+        validate(data, release='notarelease')
+    with pytest.raises(ValueError):
+        validate(data, action='notanaction')
+
+
+def test_validate_coerced(data):
+    data = data.assign(benton=['x', 5, 20], moca=[np.nan, '31', '30'])
+    out, report = validate(data, action='clip')
+    assert sorted(zip(report['index'], report['column'], report['value'],
+                      report['reason'])) \
+        == [('a', 'benton', 'x', 'type'), ('a', 'date',
+                                           pd.Timestamp('2009-01-01'), 'min'),
+            ('b', 'gender', 'x', 'category'), ('b', 'moca', '31', 'max'),
+            ('c', 'benton', 20, 'max')]
+    assert out['benton'].isna().tolist() == [True, False, False]
+    assert list(out['benton'][1:]) == [5, 12]
+
+
+def test_validate_empty_report(data):
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        out, report = validate(data[['participant']], action='mask')
+    assert len(report) == 0
+    assert list(report.columns) == ['index', 'column', 'value', 'reason']
+    assert out.equals(data[['participant']])
@@ -1,7 +1,14 @@
 # -*- coding: utf-8 -*-
 
 import os
-from typing import List, Tuple
+from typing import Dict, List, Tuple
+
+# configuration of where PPMI data files are searched for, as set with
+# `configure_data_sources()`; unset values fall back to the environment
+_DATA_SOURCES = dict(paths=None, releases=None, aliases={})
+
+# in-memory index of searched directories, as {directory: {name: filepath}}
+_FILE_INDEX = {}
 
 
 def _get_authentication(user: str = None,
@@ -50,6 +57,183 @@ def _get_authentication(user: str = None,
     return user, password
 
 
+def configure_data_sources(paths: List[str] = None,
+                           releases: List[str] = None,
+                           aliases: Dict[str, List[str]] = None):
+    """
+    Configures where PPMI data files are searched for
+
+    Files are looked up in an in-memory index of the searched directories
+    that is built with one listing per directory; directories are only
+    listed again if a file cannot be found in them (e.g., after new files
+    were downloaded). Configuring data sources resets the index.
+
+    Parameters
+    ----------
+    paths : list, optional
+        Directories to search for PPMI data files, in order. If not specified
+        the environmental variable $PPMI_PATH (a list of directories separated
+        by `os.pathsep`) or else the current directory is used. Default: None
+    releases : list, optional
+        Subfolders of each directory in `paths` holding (e.g., dated) data
+        releases, in order of preference. Files in release subfolders take
+        precedence over files in the directory itself. If not specified the
+        environmental variable $PPMI_RELEASES (separated by `os.pathsep`) is
+        used, if set. Default: None
+    aliases : dict, optional
+        Alternative filenames by which files are searched for if the
+        expected filename does not exist (e.g., `{'Vital_Signs.csv':
+        ['Vital_Signs_18Jan2023.csv']}`). Default: None
+    """
+
+    if isinstance(paths, str):
+        paths = [paths]
+    if isinstance(releases, str):
+        releases = [releases]
+    _DATA_SOURCES.update(paths=paths, releases=releases,
+                         aliases=dict(aliases or {}))
+    _FILE_INDEX.clear()
+
+
+def _from_environ(var: str) -> List[str]:
+    """ Splits environmental variable `var` into list of paths
+    """
+    return [p for p in os.environ.get(var, '').split(os.pathsep) if p]
+
+
+def _search_paths(path: str = None) -> List[str]:
+    """
+    Gets directories to search for PPMI data files
+
+    Parameters
+    ----------
+    path : str, optional
+        Filepath to directory containing PPMI data files. If specified only
+        this directory is searched. Default: None
+
+    Returns
+    -------
+    paths : list
+        Directories to search, in order
+    """
+
+    if path is not None:
+        return [path]
+    if _DATA_SOURCES['paths'] is not None:
+        return list(_DATA_SOURCES['paths'])
+
+    return _from_environ('PPMI_PATH') or [os.getcwd()]
+
+
+def _index_directory(directory: str, refresh: bool = False) -> Dict[str, str]:
+    """
+    Gets index of files in `directory`, listing it if not yet indexed
+
+    Parameters
+    ----------
+    directory : str
+        Directory to index
+    refresh : bool, optional
+        Whether to list `directory` again even if it is indexed. Default: False
+
+    Returns
+    -------
+    index : dict
+        Mapping of filename to filepath of files in `directory`. Empty if
+        `directory` does not exist
+    """
+
+    key = os.path.abspath(directory)
+    if refresh or key not in _FILE_INDEX:
+        try:
+            with os.scandir(key) as entries:
+                index = {e.name: e.path for e in entries if e.is_file()}
+        except (FileNotFoundError, NotADirectoryError):
+            index = {}
+        _FILE_INDEX[key] = index
+
+    return _FILE_INDEX[key]
+
+
+def _find_data_file(fname: str,
+                    path: str = None,
+                    refresh: bool = False) -> str:
+    """
+    Looks up `fname` in the data sources, returning None if it is not found
+    """
+
+    releases = _DATA_SOURCES['releases']
+    if releases is None:
+        releases = _from_environ('PPMI_RELEASES')
+    names = [fname] + list(_DATA_SOURCES['aliases'].get(fname, []))
+
+    for root in _search_paths(path):
+        for release in list(releases) + ['']:
+            for name in names:
+                head, tail = os.path.split(os.path.join(release, name))
+                index = _index_directory(os.path.join(root, head), refresh)
+                if tail in index:
+                    return index[tail]
+
+    return None
+
+
+def _get_data_files(fnames: List[str],
+                    path: str = None) -> Dict[str, str]:
+    """
+    Gets filepaths of PPMI data files `fnames`
+
+    Parameters
+    ----------
+    fnames : list
+        Filenames (relative to the data directory) to look for
+    path : str, optional
+        Filepath to directory containing PPMI data files. If not specified
+        this function will search the configured data sources (see
+        :func:`configure_data_sources`), which default to (1) the directories
+        in the environmental variable $PPMI_PATH or (2) the current directory.
+        Default: None
+
+    Returns
+    -------
+    files : dict
+        Mapping of provided filenames to filepaths, in order of `fnames`
+
+    Raises
+    ------
+    FileNotFoundError
+    """
+
+    files = {}
+    for fn in fnames:
+        found = _find_data_file(fn, path=path)
+        if found is None:
+            # files may have been added since directories were indexed
+            found = _find_data_file(fn, path=path, refresh=True)
+        if found is None:
+            raise FileNotFoundError('{} does not exist in {}. Please make '
+                                    'sure you have downloaded the '
+                                    'appropriate files from the PPMI '
+                                    'database and try again. You can use '
+                                    '`pypmi.datasets.fetch_studydata(\'all'
+                                    '\')` to automatically download all '
+                                    'required data files.'
+                                    .format(fn,
+                                            ', '.join(_search_paths(path))))
+        files[fn] = found
+
+    return files
+
+
+def _get_data_file(fname: str, path: str = None) -> str:
+    """
+    Gets filepath of PPMI data file `fname`
+
+    See :func:`_get_data_files` for details
+    """
+    return _get_data_files([fname], path=path)[fname]
+
+
 def _get_data_dir(path: str = None,
                   fnames: List[str] = None) -> str:
     """
@@ -61,12 +245,15 @@ def _get_data_dir(path: str = None,
     ----------
     path : str, optional
         Filepath to directory containing PPMI data files. If not specified this
-        function will, in order, look (1) for an environmental variable
-        $PPMI_PATH and (2) in the current directory. Default: None
+        function will, in order, use (1) the first directory configured with
+        :func:`configure_data_sources`, (2) the first directory in the
+        environmental variable $PPMI_PATH, and (3) the current directory.
+        Default: None
     fnames : list, optional
-        Filenames to check for at `path` (once `path` has been determined). If
-        any of the files listed in `fnames` do not exist a FileNotFoundError
-        will be raised.
+        Filenames to check for (once `path` has been determined). If `path`
+        is not specified they are looked up in all configured data sources.
+        If any of the files listed in `fnames` do not exist a
+        FileNotFoundError will be raised.
 
     Returns
     -------
@@ -78,23 +265,9 @@ def _get_data_dir(path: str = None,
     FileNotFoundError
     """
 
-    # try and find directory in environmental variable "$PPMI_PATH"
-    if path is None:
-        try:
-            path = os.environ['PPMI_PATH']
-        except KeyError:
-            path = os.getcwd()
-
+    # `fnames` may be found in any data source, but only the first source
+    # is returned (e.g., as the directory to download data to)
     if fnames is not None:
-        for fn in fnames:
-            if not os.path.isfile(os.path.join(path, fn)):
-                raise FileNotFoundError('{} does not exist in {}. Please make '
-                                        'sure you have downloaded the '
-                                        'appropriate files from the PPMI '
-                                        'database and try again. You can use '
-                                        '`pypmi.datasets.fetch_studydata(\'all'
-                                        '\')` to automatically download all '
-                                        'required data files.'
-                                        .format(fn, path))
-
-    return path
+        _get_data_files(fnames, path=path)
+
+    return _search_paths(path)[0]
@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+"""
+Functions for detecting out-of-range values in loaded PPMI data
+"""
+
+import functools
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+from . import _thresholds, _thresholds2021
+
+RELEASES = {
+    None: _thresholds,
+    '2021': _thresholds2021
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _compile_thresholds(release: str = None) -> Tuple[dict, dict, dict]:
+    """
+    Compiles threshold specifications of `release` by type of check
+
+    Parameters
+    ----------
+    release : {None, '2021'}, optional
+        Which thresholds to use. Default: None
+
+    Returns
+    -------
+    numeric, dates, categories : dict
+        Mapping of column name to (min, max) bounds for numeric and date
+        columns, and to list of allowed values for categorical columns
+    """
+
+    try:
+        module = RELEASES[release]
+    except KeyError:
+        raise ValueError('Provided release {} is not valid. Must be one of {}.'
+                         .format(release, list(RELEASES))) from None
+
+    numeric, dates, categories = {}, {}, {}
+    # behavioral thresholds take precedence for measures in multiple specs
+    for spec in (module.GENOTYPES_INFO, module.DEMOGRAPHIC_INFO,
+                 module.BEHAVIORAL_INFO):
+        for col, info in spec.items():
+            for check in (numeric, dates, categories):
+                check.pop(col, None)
+            if 'categories' in info:
+                categories[col] = info['categories']
+            elif info.get('scale_level') == 'date':
+                dates[col] = (np.datetime64(info['min'], 'ns'),
+                              np.datetime64(info['max'], 'ns'))
+            elif 'min' in info and 'max' in info:
+                numeric[col] = (info['min'], info['max'])
+
+    return numeric, dates, categories
+
+
+def _check_bounds(values: np.ndarray,
+                  lower: np.ndarray,
+                  upper: np.ndarray,
+                  clip: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Checks (N, C) `values` against (C,) `lower` and `upper` bounds
+
+    Missing values (NaN / NaT) are never out of bounds
+
+    Returns
+    -------
+    values : (N, C) numpy.ndarray
+        Input `values`, clipped to bounds if `clip` is set
+    violations : (N, C) numpy.ndarray
+        Violation codes, where 0 is valid, 1 is below `lower`, and 2 is above
+        `upper`
+    """
+
+    below, above = values < lower, values > upper
+    violations = below + 2 * above.astype('int8')
+    if clip:
+        values = np.where(below, lower, np.where(above, upper, values))
+
+    return values, violations
+
+
+def _to_float(col: pd.Series) -> np.ndarray:
+    """ Converts `col` to float array, with unparseable values as NaN
+    """
+    return np.asarray(pd.to_numeric(col, errors='coerce'), dtype='float64')
+
+
+def _to_datetime(col: pd.Series) -> np.ndarray:
+    """ Converts `col` to datetime array, with unparseable values as NaT
+    """
+    return np.asarray(pd.to_datetime(col, errors='coerce'),
+                      dtype='datetime64[ns]')
+
+
+def _restore_dtype(values: np.ndarray, col: pd.Series) -> pd.Series:
+    """
+    Returns `values` as series like `col`, with the (numeric or datetime)
+    dtype of `col` if `values` can be represented in it without loss
+    """
+
+    new = pd.Series(values, index=col.index, name=col.name)
+    if not (pd.api.types.is_numeric_dtype(col)
+            or pd.api.types.is_datetime64_any_dtype(col)):
+        return new
+    try:
+        cast = new.astype(col.dtype)
+    except (TypeError, ValueError):
+        return new
+    if not cast.astype(new.dtype).equals(new):
+        return new
+
+    return cast
+
+
+def validate(data: pd.DataFrame,
+             release: str = None,
+             action: str = 'flag') -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Checks `data` against thresholds specified for PPMI measures
+
+    All numeric measures are checked against their minimum and maximum values
+    at once (and likewise for dates); categorical measures are checked
+    against their allowed categories. Columns without thresholds are ignored,
+    as are missing values.
+
+    Parameters
+    ----------
+    data : pd.DataFrame
+        Data for PPMI subjects as obtained from e.g.,
+        :func:`pypmi.load_behavior()` or :func:`pypmi.load_demographics()`
+    release : {None, '2021'}, optional
+        Which thresholds to use. Default: None
+    action : {'flag', 'clip', 'mask'}, optional
+        What to do with invalid values. If 'flag' they are only reported; if
+        'clip' out-of-range values are set to the nearest bound (and
+        miscategorized or unparseable values are set to missing); if 'mask'
+        all invalid values are set to missing. Modified columns keep their
+        dtype unless it can't hold the new values (e.g., missing values in
+        integer columns). Default: 'flag'
+
+    Returns
+    -------
+    data : pd.DataFrame
+        Input `data`, modified (in a copy) according to `action`
+    violations : pd.DataFrame
+        Report of invalid values with columns ['index', 'column', 'value',
+        'reason'], where 'index' is the row label in `data` and 'reason' is
+        one of 'min', 'max', 'category', or 'type' (values of numeric or date
+        measures that can't be converted to numbers or dates)
+    """
+
+    if action not in ('flag', 'clip', 'mask'):
+        raise ValueError('Provided action {} is not valid. Must be one of '
+                         '[\'flag\', \'clip\', \'mask\'].'.format(action))
+
+    numeric, dates, categories = _compile_thresholds(release)
+    reasons = np.array(['', 'min', 'max', 'category', 'type'])
+    out = data.copy() if action != 'flag' else data
+
+    checks = ((numeric, _to_float, np.nan),
+              (dates, _to_datetime, np.datetime64('NaT')))
+
+    report = []
+    for bounds, convert, missing in checks:
+        cols = [c for c in data.columns if c in bounds]
+        if len(cols) == 0:
+            continue
+        values = np.column_stack([convert(data[c]) for c in cols])
+        lower, upper = (np.array(b) for b in zip(*[bounds[c] for c in cols]))
+        values, violations = _check_bounds(values, lower, upper,
+                                           clip=action == 'clip')
+        # values that were present but couldn't be converted
+        coerced = pd.isna(values) & data[cols].notna().values
+        violations = np.where(coerced, 4, violations).astype('int8')
+        if action == 'mask':
+            values = np.where(violations > 0, missing, values)
+        if action != 'flag':
+            for n in np.flatnonzero(violations.any(axis=0)):
+                out[cols[n]] = _restore_dtype(values[:, n], data[cols[n]])
+        report.append((cols, violations))
+
+    cols = [c for c in data.columns if c in categories]
+    if len(cols) > 0:
+        violations = np.column_stack([
+            ~(data[c].isin(categories[c]) | data[c].isna()) for c in cols
+        ]).astype('int8') * 3
+        if action != 'flag':
+            out[cols] = out[cols].mask(violations > 0)
+        report.append((cols, violations))
+
+    # only ever materialize the (sparse) set of violations
+    frames = []
+    for cols, violations in report:
+        for n in np.flatnonzero(violations.any(axis=0)):
+            rows = np.flatnonzero(violations[:, n])
+            frames.append(pd.DataFrame({
+                'index': data.index[rows],
+                'column': cols[n],
+                'value': data[cols[n]].values[rows],
+                'reason': reasons[violations[rows, n]]
+            }))
+    if len(frames) > 0:
+        violations = pd.concat(frames, ignore_index=True)
+    else:
+        violations = pd.DataFrame(columns=['index', 'column', 'value',
+                                           'reason'])
+
+    return out, violations